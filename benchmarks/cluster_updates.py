@@ -0,0 +1,59 @@
+"""
+Microbenchmark for CapClusterCollection upkeep. Replays a fixed set of random games with and without cluster tracking
+and reports the average cost per move. Run from the repository root: python -m benchmarks.cluster_updates
+"""
+import random
+import time
+
+from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+
+NUM_GAMES = 200
+MAX_MOVES = 80
+SEED = 2023
+REPEATS = 5
+
+
+def record_games(num_games: int, max_moves: int, seed: int) -> list[list[tuple[int, int]]]:
+    """Plays random games without clusters and returns their move lists."""
+    rng = random.Random(seed)
+    games = []
+    for _ in range(num_games):
+        game = HasamiShogiGame()
+        moves = []
+        while game.get_game_state() == "UNFINISHED" and len(moves) < max_moves:
+            piece = rng.choice(sorted(game.get_game_board().get_squares_by_color(game.get_active_player())))
+            destinations = game.get_reachable_squares(piece)
+            if not destinations:
+                continue
+            move = (piece, rng.choice(destinations))
+            game.make_move_by_index(*move)
+            moves.append(move)
+        games.append(moves)
+    return games
+
+
+def replay(games: list[list[tuple[int, int]]], track_clusters: bool) -> float:
+    """Replays every game and returns the total seconds spent in make_move_by_index."""
+    total = 0.0
+    for moves in games:
+        game = HasamiShogiGame(track_clusters=track_clusters)
+        start = time.perf_counter()
+        for move in moves:
+            game.make_move_by_index(*move)
+        total += time.perf_counter() - start
+    return total
+
+
+def main():
+    games = record_games(NUM_GAMES, MAX_MOVES, SEED)
+    num_moves = sum(len(moves) for moves in games)
+    without_clusters = min(replay(games, False) for _ in range(REPEATS)) / num_moves
+    with_clusters = min(replay(games, True) for _ in range(REPEATS)) / num_moves
+    print(f"{NUM_GAMES} games, {num_moves} moves")
+    print(f"make_move without clusters: {without_clusters * 1e6:8.2f} us/move")
+    print(f"make_move with clusters:    {with_clusters * 1e6:8.2f} us/move")
+    print(f"cluster upkeep:             {(with_clusters - without_clusters) * 1e6:8.2f} us/move")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Parallel search scaling benchmark on the positions of search_positions. Reports time, nodes and speedup over the
+single-process search of an iterative deepening search with 1, 2, 4 and 8 workers, splitting the root moves and with
+Lazy SMP. Worker start-up is left out of the timings; Lazy SMP nodes are the main process's plus the helpers'. Run
+from the repository root: python -m benchmarks.parallel_scaling [depth]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+from benchmarks.search_positions import POSITIONS, new_black_ai
+
+DEPTH = 5
+WORKER_COUNTS = (1, 2, 4, 8)
+
+
+def search_positions(workers: int, depth: int, lazy_smp: bool) -> tuple[float, int]:
+    """Returns the total (seconds, nodes) of searching every position to the given depth with the given workers."""
+    total_seconds = total_nodes = 0
+    for moves in POSITIONS.values():
+        ai_black = new_black_ai(moves)
+        ai_black.workers = workers
+        ai_black.lazy_smp = lazy_smp
+        with contextlib.redirect_stdout(io.StringIO()):
+            ai_black.search(max_depth=1)        # Starts the workers
+            start = time.perf_counter()
+            ai_black.search(max_depth=depth)
+        total_seconds += time.perf_counter() - start
+        total_nodes += ai_black.limits.nodes + ai_black.helper_nodes
+        ai_black.close()
+    return total_seconds, total_nodes
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else DEPTH
+    print(f"depth {depth}, {os.cpu_count()} cpus")
+    print(f"{'mode':9} {'workers':>8} {'seconds':>8} {'nodes':>8} {'speedup':>8}")
+    base_seconds = None
+    for mode, lazy_smp in (("root", False), ("lazy smp", True)):
+        for workers in WORKER_COUNTS:
+            seconds, nodes = search_positions(workers, depth, lazy_smp)
+            base_seconds = base_seconds or seconds
+            print(f"{mode:9} {workers:8} {seconds:8.2f} {nodes:8} {base_seconds / seconds:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Search benchmark on a fixed suite of positions, all with BLACK to move. Reports best move, score, nodes (of which
+quiescence nodes) and time of a fixed-depth search per position, and the nodes of an iterative deepening search to the
+same depth. Run from the
+repository root: python -m benchmarks.search_positions [depth]
+"""
+import contextlib
+import io
+import sys
+import time
+
+from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+from hasami_shogi.src.model.ai_player import AIPlayer
+from hasami_shogi.src.model.hasami_shogi_utilities import move_to_string
+
+# Prefixes of one self-play game, plus a short capture sequence.
+GAME_MOVES = "i5e5 a5d5 i4e4 a6f6 e5f5 a7g7 i6g6 a1h1 e4e6 h1h8 i7h7 a4e4 f5f7 h8e8 i3d3 a3c3 d3f3 a2e2 f3e3 d5e5 " \
+             "i1e1 a8d8 f7d7 a9d9 i8f8 c3c7 h7e7 c7c5 f8f5 c5d5 d7c7 d5d1".split()
+POSITIONS = {
+    "opening": [],
+    "centre": GAME_MOVES[:2],
+    "early": GAME_MOVES[:8],
+    "middle": GAME_MOVES[:14],
+    "trades": GAME_MOVES[:20],
+    "late": GAME_MOVES[:26],
+    "endgame": GAME_MOVES[:32],
+    "captures": "i5e5 a4e4 i8e8 a6e6 i1e1 a2b2".split(),
+}
+DEPTH = 4
+
+
+def new_black_ai(moves: list[str]) -> AIPlayer:
+    """Returns a fresh BLACK AIPlayer for a game after the given moves."""
+    game = HasamiShogiGame()
+    ai_black, ai_red = AIPlayer(game, "BLACK"), AIPlayer(game, "RED")
+    ai_black.set_opposing_player(ai_red)
+    for move in moves:
+        game.make_move(move[:2], move[2:])
+    return ai_black
+
+
+def search_position(moves: list[str], depth: int):
+    """
+    Returns (best move, score, nodes, quiescence nodes, seconds, iterative deepening nodes) for the position after the
+    given moves.
+    """
+    ai_black = new_black_ai(moves)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        best_move, score = ai_black.minimax(depth)
+    seconds = time.perf_counter() - start
+    ai_deepening = new_black_ai(moves)
+    with contextlib.redirect_stdout(io.StringIO()):
+        ai_deepening.search(max_depth=depth)
+    return best_move, score, ai_black.limits.nodes, ai_black.limits.q_nodes, seconds, ai_deepening.limits.nodes
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else DEPTH
+    print(f"depth {depth}")
+    print(f"{'position':10} {'move':>6} {'score':>9} {'nodes':>8} {'q nodes':>8} {'seconds':>8} {'id nodes':>9}")
+    total_nodes = total_q_nodes = total_seconds = total_id_nodes = 0
+    for name, moves in POSITIONS.items():
+        best_move, score, nodes, q_nodes, seconds, id_nodes = search_position(moves, depth)
+        total_nodes += nodes
+        total_q_nodes += q_nodes
+        total_seconds += seconds
+        total_id_nodes += id_nodes
+        print(f"{name:10} {move_to_string(best_move):>6} {score:9.4f} {nodes:8} {q_nodes:8} {seconds:8.2f} {id_nodes:9}")
+    print(f"{'total':10} {'':>6} {'':>9} {total_nodes:8} {total_q_nodes:8} {total_seconds:8.2f} {total_id_nodes:9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Selective search benchmark on the positions of search_positions. Reports total nodes and time of an iterative deepening
+search with each selective search feature on its own, then the time per position of a full-width search against the
+selective search two and three plies deeper. Run from the repository root: python -m benchmarks.selective_search [depth]
+"""
+import contextlib
+import io
+import sys
+import time
+
+from hasami_shogi.src.model.ai_player import SearchOptions
+from benchmarks.search_positions import POSITIONS, new_black_ai
+
+DEPTH = 4
+CONFIGS = {
+    "none": SearchOptions.none(),
+    "lmr": SearchOptions(null_move_pruning=False, futility_pruning=False, see_pruning=False),
+    "null move": SearchOptions(late_move_reductions=False, futility_pruning=False, see_pruning=False),
+    "futility": SearchOptions(late_move_reductions=False, null_move_pruning=False, see_pruning=False),
+    "see": SearchOptions(late_move_reductions=False, null_move_pruning=False, futility_pruning=False),
+    "all": SearchOptions(),
+}
+
+
+def search_position(moves: list[str], depth: int, options: SearchOptions):
+    """Returns (best move, score, nodes, seconds) of a search to the given depth of the position after the moves."""
+    ai_black = new_black_ai(moves)
+    ai_black.options = options
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        best_move, score = ai_black.search(max_depth=depth)
+    return best_move, score, ai_black.limits.nodes, time.perf_counter() - start
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else DEPTH
+    print(f"depth {depth}, all positions")
+    print(f"{'features':10} {'nodes':>8} {'seconds':>8}")
+    for name, options in CONFIGS.items():
+        results = [search_position(moves, depth, options) for moves in POSITIONS.values()]
+        print(f"{name:10} {sum(result[2] for result in results):8} {sum(result[3] for result in results):8.2f}")
+
+    print()
+    full_depth = depth - 1
+    print(f"seconds, full width to depth {full_depth} vs all features to depths {full_depth + 2} and {full_depth + 3}")
+    print(f"{'position':10} {'full':>8} {'+2':>8} {'+3':>8}")
+    for name, moves in POSITIONS.items():
+        seconds = [search_position(moves, full_depth, CONFIGS["none"])[3],
+                   search_position(moves, full_depth + 2, CONFIGS["all"])[3],
+                   search_position(moves, full_depth + 3, CONFIGS["all"])[3]]
+        print(f"{name:10} " + " ".join(f"{value:8.2f}" for value in seconds))
+
+
+if __name__ == "__main__":
+    main()
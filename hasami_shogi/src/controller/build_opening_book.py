@@ -0,0 +1,86 @@
+"""
+Builds the opening book from parallel self-play. Each game searches every position of its first PLIES plies to DEPTH
+and records the move found; over the first RANDOM_PLIES plies it then plays one of the BRANCHING best ordered moves at
+random instead, so the games spread over the likely openings. A move's weight is the number of games that chose it.
+Positions are recorded under their symmetric key with the moves of their canonical image, so mirrored and color-swapped
+openings add up in one entry, and mirrored moves of a symmetric position count once among the BRANCHING choices.
+Run from the repository root: python -m hasami_shogi.src.controller.build_opening_book [games] [workers] [depth]
+"""
+import contextlib
+import io
+import itertools
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+from hasami_shogi.src.model.ai_player import AIPlayer
+from hasami_shogi.src.model.opening_book import write_book, DEFAULT_PATH
+import hasami_shogi.src.model.symmetry as symmetry
+
+GAMES = 96
+PLIES = 10
+RANDOM_PLIES = 3
+BRANCHING = 4
+DEPTH = 6
+SEED = 0x0B00C
+
+_searched: dict[int, tuple[tuple[int, int], float]] = {}     # Per worker process: key -> canonical (move, score)
+
+
+def play_game(seed: int, depth: int) -> list[tuple[int, tuple[int, int], float]]:
+    """
+    Plays the opening of one self-play game. Returns (symmetric key, searched move in the canonical image, score) for
+    every position reached.
+    """
+    game = HasamiShogiGame()
+    ais = {color: AIPlayer(game, color) for color in ("BLACK", "RED")}
+    rng = random.Random(seed)
+    records = []
+    for ply in range(PLIES):
+        if game.get_game_state() != "UNFINISHED":
+            break
+        ai = ais[game.get_active_player()]
+        key, transform = game.get_symmetric_key()
+        if key not in _searched:
+            with contextlib.redirect_stdout(io.StringIO()):
+                move, score = ai.search(max_depth=depth)
+            _searched[key] = symmetry.transform_move(move, transform), score
+        canonical_move, score = _searched[key]
+        records.append((key, canonical_move, score))
+        move = symmetry.transform_move(canonical_move, transform)
+        if ply < RANDOM_PLIES:
+            moves = ai.generate_moves(ai.get_color(), None, move)
+            if game.is_mirror_symmetric():
+                moves = symmetry.drop_mirrored_moves(moves)
+            move = rng.choice(list(itertools.islice(moves, BRANCHING)))
+        game.make_move_by_index(*move)
+    return records
+
+
+def build_book(path: str = DEFAULT_PATH, games: int = GAMES, workers: int = None, depth: int = DEPTH) -> int:
+    """Plays the given number of self-play games across worker processes and writes their moves as a book."""
+    seeds = [SEED + game_index for game_index in range(games)]
+    entries: dict[int, dict[tuple[int, int], tuple[int, float]]] = {}
+    with ProcessPoolExecutor(workers) as executor:
+        for records in executor.map(play_game, seeds, [depth] * games):
+            for key, move, score in records:
+                weight, _ = entries.setdefault(key, {}).get(move, (0, score))
+                entries[key][move] = (weight + 1, score)
+    return write_book(path, entries)
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else GAMES
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    depth = int(sys.argv[3]) if len(sys.argv) > 3 else DEPTH
+    start = time.perf_counter()
+    num_records = build_book(DEFAULT_PATH, games, workers, depth)
+    print(f"{num_records} records from {games} games at depth {depth} with {workers} workers in "
+          f"{time.perf_counter() - start:.1f} s, written to {DEFAULT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+Builds the endgame tablebase by retrograde analysis: every material class with 2 or more pieces a side, at most
+max_pieces in all and no fewer BLACK pieces than RED (the others are probed through their flipped images), smallest
+first, into the directory the game loads it from. Classes already built are kept, so a larger limit can be added
+later. A class holds C(81, BLACK) * C(81 - BLACK, RED) * 2 positions of one byte each, 20 MB for 2v2, and the solver
+is pure Python, so expect hours per class beyond that.
+Run from the repository root: python -m hasami_shogi.src.controller.build_tablebase [max_pieces]
+"""
+import sys
+import time
+
+from hasami_shogi.src.model.tablebase import DEFAULT_DIRECTORY, material_classes, num_positions
+from hasami_shogi.src.model.tablebase_generator import build_tables
+
+MAX_PIECES = 4
+
+
+def main():
+    max_pieces = int(sys.argv[1]) if len(sys.argv) > 1 else MAX_PIECES
+    total = sum(num_positions(*material) for material in material_classes(max_pieces))
+    print(f"Solving {material_classes(max_pieces)}: {total} positions")
+    start = time.perf_counter()
+    for path in build_tables(max_pieces, DEFAULT_DIRECTORY):
+        print(f"{path} written after {time.perf_counter() - start:.0f} s")
+
+
+if __name__ == "__main__":
+    main()
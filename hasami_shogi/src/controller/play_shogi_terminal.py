@@ -1,22 +1,29 @@
 from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
 from hasami_shogi.src.model.ai_player import AIPlayer
 from hasami_shogi.src.model.player import Player
+from hasami_shogi.src.model.ponderer import Ponderer
+from hasami_shogi.src.model.opening_book import OpeningBook
+from hasami_shogi.src.model.tablebase import Tablebase
+from hasami_shogi.src.model.hasami_shogi_utilities import square_name, move_to_string
 
 
 def terminal_ai():
     new_game = HasamiShogiGame()
-    player_black = AIPlayer(new_game, "BLACK")
+    player_black = AIPlayer(new_game, "BLACK", book=OpeningBook.open_default(),
+                            tablebase=Tablebase.open_default())
     player_red = Player(new_game, "RED")
     player_red.set_opposing_player(player_black)
+    ponderer = Ponderer(player_black)               # Thinks on RED's time
     while new_game.get_game_state() == "UNFINISHED":
         print(new_game.get_active_player(), "'s turn.")
-        print("BLACK's pieces:", player_black.get_pieces())
-        print("RED's, pieces:", player_red.get_pieces())
+        print("BLACK's pieces:", {square_name(piece) for piece in player_black.get_pieces()})
+        print("RED's, pieces:", {square_name(piece) for piece in player_red.get_pieces()})
         new_game.get_game_board().print_board()
         if new_game.get_active_player() == "BLACK":
             print("AI is thinking.")
-            ai_move = player_black.minimax(3)[0]
+            ai_move = move_to_string(ponderer.search(500)[0])
             player_black.make_move(ai_move[:2], ai_move[2:])
+            ponderer.start()
         else:
             player_move = input("Enter a 4-char move.\n")
             player_red.make_move(player_move[:2], player_move[2:])
@@ -1,27 +1,154 @@
+import time
+
 from hasami_shogi.src.model.hasami_shogi_utilities import *
 from hasami_shogi.src.model.player import Player
+from hasami_shogi.src.model.opening_book import OpeningBook
+from hasami_shogi.src.model.tablebase import Tablebase
+from hasami_shogi.src.model.eval_cache import EvaluationCache
+from hasami_shogi.src.model.transposition_table import TranspositionTable, SharedTranspositionTable, EXACT, LOWER, \
+    UPPER
+import hasami_shogi.src.model.board_geometry as geometry
+import hasami_shogi.src.model.symmetry as symmetry
+import hasami_shogi.src.model.zobrist as zobrist
+import hasami_shogi.src.model.capture_tables as capture_tables
+
+OPPOSITE_COLOR = {"RED": "BLACK", "BLACK": "RED"}
+# Squares in the center of the board (rows d-f, columns 4-6), searched before other quiet moves.
+CENTER_SQUARES = tuple(square for square in ALL_SQUARES if 2 < square // 9 < 6 and 2 < square % 9 < 6)
+
+
+class SearchAborted(Exception):
+    """Raised inside the search when its SearchLimits run out. Caught by AIPlayer.search."""
+
+
+class SearchLimits:
+    """
+    Defines the budget of one search: a time limit, a node limit and an external stop flag, any of which may be None.
+    Keeps the node counts afterwards.
+    """
+    def __init__(self, time_ms: float = None, max_nodes: int = None, stop_event=None):
+        """stop_event is anything with an is_set() method, e.g. a threading.Event set by another thread."""
+        self.start_time: float = time.perf_counter()
+        self.deadline: float = self.start_time + time_ms / 1000 if time_ms is not None else None
+        self.max_nodes: int = max_nodes
+        self.stop_event = stop_event
+        self.nodes: int = 0
+        self.q_nodes: int = 0                   # Nodes counted by the quiescence search, included in nodes
+
+    def get_elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start_time) * 1000
+
+    def count_node(self) -> None:
+        """Counts a search node. Raises SearchAborted once any limit is reached."""
+        self.nodes += 1
+        if (self.max_nodes is not None and self.nodes > self.max_nodes) \
+                or (self.deadline is not None and time.perf_counter() >= self.deadline) \
+                or (self.stop_event is not None and self.stop_event.is_set()):
+            raise SearchAborted
+
+    def can_start_iteration(self) -> bool:
+        """
+        Returns False once half the time is used: each iteration takes several times longer than the one before, so
+        the next one would almost surely be cut off and wasted.
+        """
+        return self.deadline is None or time.perf_counter() < (self.start_time + self.deadline) / 2
+
+
+class SearchOptions:
+    """
+    Defines the switches and parameters of the selective search features of AIPlayer: late move reductions, null move
+    pruning, futility pruning and pruning of losing captures. Each can be turned off on its own to measure its effect.
+    All only apply outside the principal variation, i.e. in null-window searches, and in the quiescence search. Also
+    holds the contempt, how the search scores draws.
+    """
+    def __init__(self, late_move_reductions: bool = True, null_move_pruning: bool = True,
+                 futility_pruning: bool = True, see_pruning: bool = True, lmr_min_depth: int = 3,
+                 lmr_min_index: int = 3, lmr_late_index: int = 10, null_move_reduction: int = 2,
+                 null_move_min_depth: int = 3, null_move_min_pieces: int = 3,
+                 futility_margins: tuple[float, ...] = (0, 100, 400), see_pruning_max_depth: int = 2,
+                 contempt: float = 25):
+        """
+        Late move reductions search quiet moves from lmr_min_index on one ply shallower, or two from lmr_late_index
+        on, at depth lmr_min_depth and above. Null move pruning lets the side to move pass and searches the reply
+        null_move_reduction plies shallower, at depth null_move_min_depth and above while it has at least
+        null_move_min_pieces pieces. Futility pruning skips quiet moves at depths 1 to len(futility_margins) - 1 when
+        the static evaluation plus futility_margins[depth] cannot reach alpha. SEE pruning skips captures that lose
+        material by static exchange evaluation at depth see_pruning_max_depth and below, and in quiescence. A draw
+        scores -contempt for the searching AIPlayer and contempt for its opponent, so with a positive contempt it
+        avoids repeating positions unless it is behind by more than that, and a negative one seeks draws.
+        """
+        self.late_move_reductions: bool = late_move_reductions
+        self.null_move_pruning: bool = null_move_pruning
+        self.futility_pruning: bool = futility_pruning
+        self.see_pruning: bool = see_pruning
+        self.lmr_min_depth: int = lmr_min_depth
+        self.lmr_min_index: int = lmr_min_index
+        self.lmr_late_index: int = lmr_late_index
+        self.null_move_reduction: int = null_move_reduction
+        self.null_move_min_depth: int = null_move_min_depth
+        self.null_move_min_pieces: int = null_move_min_pieces
+        self.futility_margins: tuple[float, ...] = futility_margins
+        self.see_pruning_max_depth: int = see_pruning_max_depth
+        self.contempt: float = contempt
+
+    @classmethod
+    def none(cls) -> "SearchOptions":
+        """Returns options with every selective search feature turned off, i.e. a full-width search."""
+        return cls(late_move_reductions=False, null_move_pruning=False, futility_pruning=False, see_pruning=False)
 
 
 class AIPlayer(Player):
     """
-    Defines the methods for an AI Hasami Shogi player. Inherits from regular Player class.
+    Defines the methods for an AI Hasami Shogi player. Inherits from regular Player class. Searches with negamax, so
+    every evaluation is scored for a given color and the search needs no AIPlayer for the opponent.
     """
 
-    H_WIN = 9999                    # Weight for a winning move
+    H_WIN = 9999                    # Score of a won game, less the plies from the root to the win
+    WIN_THRESHOLD = H_WIN - 1000    # Scores beyond this are wins or losses; position scores stay well inside it
     H_MATERIAL = 200                # Weight for number of pieces on board vs enemy's
-    H_CAPTURE = 100                # Weight for setting up a capture
     H_POT_CAP = 20
     H_CENTER = 1 / 16             # Weight for being in a central position
 
-    def __init__(self, *args, **kwargs):
-        """
-        Calls Player initializer with appropriate args, then adds additional properties.
+    TT_SIZE_MB = 16                 # Default transposition table size
+    SEARCH_TIME_MS = 500            # Default time per move for callers of search
+    MAX_SEARCH_DEPTH = 32
+    SCORE_INFINITY = 99999          # Bound of the full search window
+    NULL_WINDOW = 1 / 16            # Smallest difference between two scores, set by H_CENTER
+    ASPIRATION_WINDOW = 25          # Half-width of the first root window around the previous iteration's score
+    NUM_KILLERS = 2                 # Killer move slots per ply
+    DELTA_MARGIN = H_MATERIAL       # Largest positional gain assumed for a capture in quiescence delta pruning
+    SEE_MAX_PLIES = 8               # Longest capture and recapture sequence played out by static_exchange
+    SEE_WIN = 9                     # Pieces a capture that ends the game counts for in static_exchange
+
+    def __init__(self, *args, tt_size_mb: float = TT_SIZE_MB, options: SearchOptions = None, workers: int = 1,
+                 lazy_smp: bool = False, book: OpeningBook = None, tablebase: Tablebase = None,
+                 eval_cache: EvaluationCache = None, **kwargs):
+        """
+        Calls Player initializer with appropriate args, then adds additional properties. tt_size_mb sets the size of
+        the transposition table; 0 searches without one. options selects the selective search features, all on by
+        default. workers above 1 searches with that many processes, started on first use: splitting the root moves
+        between them, or with lazy_smp, searching the whole root in each of them into one shared table. book is an
+        OpeningBook consulted before every search. tablebase is an endgame Tablebase probed at the root and the leaves.
+        eval_cache is an EvaluationCache for static evaluations, which AIPlayers of either color may share.
         """
         super().__init__(*args, **kwargs)
-        self.alpha = None                               # Saves maximizer's best move
-        self.beta = None                                # Saves minimizer's best move
-        self.is_maximizing = self.get_color() == "BLACK"
-        self.initial_best_score = -9999 if self.is_maximizing else 9999
+        if lazy_smp and not tt_size_mb:
+            raise ValueError("Lazy SMP search needs a transposition table.")
+        self.options = options or SearchOptions()
+        self.tt_size_mb = tt_size_mb
+        self.workers = workers
+        self.lazy_smp = lazy_smp
+        self.book = book
+        self.tablebase = tablebase
+        self.eval_cache = eval_cache
+        self.parallel_search = None                     # RootParallelSearch or LazySMPSearch, once started
+        self.helper_nodes = 0                           # Nodes searched by Lazy SMP helpers in the last search
+        self.transposition_table = TranspositionTable(tt_size_mb) if tt_size_mb else None
+        self.limits = SearchLimits()                    # Limits and node count of the current or last search
+        self.depth_reached = 0                          # Depth of the last completed iteration
+        self.killers: list[list[tuple[int, int]]] = []  # Per ply, the latest quiet moves that caused a beta cutoff
+        self.history: list[int] = [0] * 81 * 81         # Per from * 81 + to, cutoff bonuses of quiet moves
+        self.clear_killers()
 
     def __repr__(self) -> str:
         """
@@ -30,204 +157,696 @@ class AIPlayer(Player):
         return type(self).__name__ + self._color
 
     def make_move(self, start: str, dest: str) -> bool:
+        """
+        Overrides parent method to route string moves through the validated index move.
+        """
+        return self.make_move_by_index(square_index(start), square_index(dest))
+
+    def make_move_by_index(self, start: int, dest: int) -> bool:
         """
         Overrides parent method to add extra validation, in case proposed moves are invalid.
         """
         init_move_log_length = len(self.get_game().move_log)
-        move_was_successful = super().make_move(start, dest)
+        move_was_successful = super().make_move_by_index(start, dest)
+        move_string = move_to_string((start, dest))
         if not move_was_successful:
-            raise ValueError(f"AI {self} made illegal move {start}{dest} with pieces {self.get_pieces()}")
+            raise ValueError(f"AI {self} made illegal move {move_string} with pieces "
+                             f"{[square_name(piece) for piece in self.get_pieces()]}")
         if self.get_active():
-            raise ValueError(f"Game failed to update active after valid move {start}{dest} by {self}.")
+            raise ValueError(f"Game failed to update active after valid move {move_string} by {self}.")
         if len(self.get_game().move_log) != init_move_log_length + 1:
-            raise ValueError(f"Move log failed to update for valid move {start}{dest} by {self} with.")
+            raise ValueError(f"Move log failed to update for valid move {move_string} by {self} with.")
         return True
 
-    def find_pot_cap_squares(self) -> dict[str, int]:
+    def find_pot_cap_squares(self, color: str = None) -> dict[int, int]:
         """
-        Returns dict of squares that, if taken by player, would result in dict[square] pieces being captured.
+        Returns dict of squares that, if taken by the given color (default own), would result in dict[square] pieces
+        being captured.
         """
-        for cluster in self.get_game().clusters.vulnerable_clusters[self.get_opposing_color()]:
-            risky_border_val = self.get_game().get_square_occupant(cluster.risky_border)
-            if risky_border_val != "NONE":
-                raise ValueError(f"Opponent cluster risky border is out of sync with board state: {cluster} risky "
-                                 f"border at {cluster.risky_border} has board value {risky_border_val}")
-        vulnerable_clusters = self.get_game().clusters.vulnerable_clusters[self.get_opposing_color()]
-        return {cluster.risky_border: len(cluster) for cluster in vulnerable_clusters}
+        return self.get_game().get_capture_threats(color or self._color)
 
-    def find_reachable_pieces(self, square_to_reach: str) -> set[str]:
+    def find_reachable_pieces(self, square_to_reach: int, color: str = None) -> set[int]:
         """
-        Returns set of own pieces that can reach the given square.
+        Returns set of pieces of the given color (default own) that can reach the given square.
         """
-        reachable_squares = self.get_game().tubes.get_squares_by_border(square_to_reach)
-        reachable_squares |= self.get_game().tubes.get_squares_by_member(square_to_reach)
+        color = color or self._color
+        board = self.get_board()
+        return {square for square in self.get_game().get_blocking_squares(square_to_reach)
+                if board.get_square(square) == color}
 
-        return self.get_pieces() & reachable_squares
-
-    def find_capture_moves(self) -> list[tuple[str, int]]:
+    def find_capture_moves(self, color: str = None) -> list[tuple[tuple[int, int], int]]:
         """
-        Returns a list of tuples of the form (move, num_captures), sorted by which move will result in the most
-        pieces captured.
+        Returns a list of tuples of the form (move, num_captures) for the given color (default own), sorted by which
+        move will result in the most pieces captured.
         """
-        squares_to_check = self.find_pot_cap_squares()
-        output = [(piece + square_to_reach, square_value) for square_to_reach, square_value in squares_to_check.items()
-                  for piece in self.find_reachable_pieces(square_to_reach)]
+        squares_to_check = self.find_pot_cap_squares(color)
+        output = [((piece, square_to_reach), square_value) for square_to_reach, square_value in squares_to_check.items()
+                  for piece in self.find_reachable_pieces(square_to_reach, color)]
         return list(sorted(output, key=lambda x: x[1], reverse=True))
 
-    def find_adjacent_moves(self) -> list[str]:
-        """
-        Returns all moves to squares adjacent to opponent.
-        """
-        opp_pieces = self.get_opposing_player().get_pieces()
-        active_pieces = self.get_pieces()
-
-        opponent_adjacent_squares = {adj_square for opp_piece in opp_pieces
-                                     for adj_square in get_adjacent_squares(opp_piece)
-                                     if adj_square not in opp_pieces | active_pieces}
-
-        adjacent_moves = [piece + square_to_reach for square_to_reach in opponent_adjacent_squares
-                          for piece in self.find_reachable_pieces(square_to_reach)]
-
-        return adjacent_moves
-
-    def get_all_valid_moves(self) -> set[str]:
-        """
-        Returns set of all valid moves given current game state.
-        """
-        return {move for piece in self.get_pieces() for move in self.get_game().return_valid_moves(piece)}
-
-    def order_available_moves(self) -> list[str]:
-        """
-        Returns a list of all possible moves given the current game state. Orders preferable moves first.
-        """
-        if not self.get_active():
-            raise Exception("order_available_moves called by inactive Player.")
-
-        capture_moves = [move[0] for move in self.find_capture_moves()]
-        adjacent_moves = [x for x in self.find_adjacent_moves() if x not in capture_moves]
-        preferred_moves = capture_moves + adjacent_moves
-        remaining_moves = [move for move in self.get_all_valid_moves() if move not in preferred_moves]
-        center_moves = [move for move in remaining_moves if move[2] in "def" and move[3] in "456"]  # ends in center
-        leftover_moves = [move for move in remaining_moves if move not in center_moves]
-
-        return preferred_moves + center_moves + leftover_moves
+    def find_recapture(self, target: int, color: str) -> tuple[tuple[int, int], int]:
+        """
+        Returns (move, num_captured) for the capture by the given color, which must be the active player, that takes
+        the piece on the target square and the most pieces with it, or None if there is none. Landing squares come
+        from the capture tables of the target's row and column, and from its corner if it is in one.
+        """
+        game = self.get_game()
+        board = self.get_board()
+        digit = capture_tables.PATTERN_DIGITS[color]
+        landing_squares = []
+        for axis, target_position in ((geometry.ROW_AXIS_OF[target], geometry.COL_OF[target]),
+                                      (geometry.COL_AXIS_OF[target], geometry.ROW_OF[target])):
+            pattern = board.axis_patterns[axis]
+            for position, mover, _ in capture_tables.THREATS[pattern]:
+                landed_pattern = pattern + digit * capture_tables.POSITION_WEIGHTS[position]
+                if mover == digit and target_position in capture_tables.CAPTURES[landed_pattern * 9 + position]:
+                    landing_squares.append(geometry.AXIS_SQUARES[axis][position])
+        corner_squares = geometry.CORNER_CAPTURE_SQUARES.get(target)
+        if corner_squares is not None:
+            for partner, landing_square in (corner_squares, corner_squares[::-1]):
+                if board.get_square(partner) == color and board.get_square(landing_square) == "NONE":
+                    landing_squares.append(landing_square)
+
+        best_recapture = None
+        for landing_square in landing_squares:
+            for piece in self.find_reachable_pieces(landing_square, color):
+                game.make_move_by_index(piece, landing_square)
+                captured = game.move_log[-1].cap_squares
+                is_recapture = target in captured
+                num_captured = AIPlayer.SEE_WIN if game.get_game_state().endswith("_WON") else len(captured)
+                game.undo_move()
+                if is_recapture and (best_recapture is None or num_captured > best_recapture[1]):
+                    best_recapture = (piece, landing_square), num_captured
+        return best_recapture
+
+    def static_exchange(self, move: tuple[int, int]) -> int:
+        """
+        Returns the net number of pieces the active player wins by the given move once the exchange it starts is
+        played out (static exchange evaluation): negative for a capture that loses material. See get_recapture_gain.
+        Unless the capture tables show that the moved piece could be captured back, the move is not even made.
+        """
+        game = self.get_game()
+        moving_from, moving_to = move
+        if geometry.CORNER_CAPTURES[moving_to] is None and moving_to not in geometry.CORNER_CAPTURE_SQUARES:
+            num_captured, is_threatened = self.find_line_exchange(moving_from, moving_to)
+            if not is_threatened:
+                opp_color = OPPOSITE_COLOR[self.get_board().get_square(moving_from)]
+                is_win = self.get_board().get_num_pieces(opp_color) - num_captured <= 1
+                return AIPlayer.SEE_WIN if is_win else num_captured
+        game.make_move_by_index(*move)
+        exchange = self.get_move_gain() - self.get_recapture_gain()
+        game.undo_move()
+        return exchange
+
+    def find_line_exchange(self, moving_from: int, moving_to: int) -> tuple[int, bool]:
+        """
+        Returns (num_captured, is_threatened) for a move that neither lands in nor next to a corner, from the capture
+        tables alone: the pieces it sandwiches on the row and column it lands on, and whether, once they are removed,
+        an enemy piece landing on that row or column could sandwich the moved piece.
+        """
+        patterns = self.get_board().axis_patterns
+        digit = capture_tables.PATTERN_DIGITS[self.get_board().get_square(moving_from)]
+        opp_digit = 3 - digit
+        weights = capture_tables.POSITION_WEIGHTS
+        num_captured, is_threatened = 0, False
+        for axis_of, position_of in ((geometry.ROW_AXIS_OF, geometry.COL_OF), (geometry.COL_AXIS_OF, geometry.ROW_OF)):
+            axis, position = axis_of[moving_to], position_of[moving_to]
+            pattern = patterns[axis] + digit * weights[position]
+            if axis_of[moving_from] == axis:
+                pattern -= digit * weights[position_of[moving_from]]
+            captured = capture_tables.CAPTURES[pattern * 9 + position]
+            num_captured += len(captured)
+            pattern -= opp_digit * sum(weights[captured_position] for captured_position in captured)
+            for threat_position, mover, _ in capture_tables.THREATS[pattern]:
+                landed_pattern = pattern + opp_digit * weights[threat_position]
+                if mover == opp_digit and position in capture_tables.CAPTURES[landed_pattern * 9 + threat_position]:
+                    is_threatened = True
+        return num_captured, is_threatened
+
+    def get_move_gain(self) -> int:
+        """Returns the number of pieces captured by the last move, or SEE_WIN if it won the game."""
+        game = self.get_game()
+        return AIPlayer.SEE_WIN if game.get_game_state().endswith("_WON") else len(game.move_log[-1].cap_squares)
+
+    def get_recapture_gain(self) -> int:
+        """
+        Returns the net number of pieces the active player wins by capturing the piece that just moved, 0 if it should
+        not: each side in turn may capture the piece that moved last, with the recapture taking the most, or stop when
+        going on would lose more. Only captures of the moving pieces are followed, so this is a cheap estimate rather
+        than a search.
+        """
+        game = self.get_game()
+        gains = []
+        target = game.move_log[-1].move[1]
+        while game.get_game_state() == "UNFINISHED" and len(gains) < AIPlayer.SEE_MAX_PLIES:
+            recapture = self.find_recapture(target, game.get_active_player())
+            if recapture is None:
+                break
+            game.make_move_by_index(*recapture[0])
+            gains.append(recapture[1])
+            target = recapture[0][1]
+        for _ in gains:
+            game.undo_move()
 
-    def get_center_heuristic(self) -> int:
-        """
-        Returns a score based on how many own pieces are close to the center of the board.
-        """
-        output = 0
-        for piece in self.get_pieces():
-            row, col = string_to_index(piece)
-            output += (8 - row) * row * (8 - col) * col
-        return output
+        # Back up the swap list: each side only recaptures if it comes out ahead
+        score = 0
+        for gain in reversed(gains):
+            score = max(0, gain - score)
+        return score
 
-    def get_capture_heuristic(self) -> int:
+    def find_adjacent_moves(self, color: str = None) -> list[tuple[int, int]]:
         """
-        Returns a score based on how many potential captures active can get, less how many opp would get on next turn.
+        Returns all moves of the given color (default own) to squares adjacent to the opponent.
         """
-        material_advantage = len(self.get_pieces()) - len(self.get_opposing_player().get_pieces())
-
-        # Check if any potential capture squares are reachable for both players, assume sorted best first.
-        active_cap_moves = self.find_capture_moves()
-        active_best = active_cap_moves[0][1] if active_cap_moves else 0
-        opp_cap_moves = self.get_opposing_player().find_capture_moves()
-
-        if not opp_cap_moves:           # No opposition, active makes best move.
-            return active_best
+        color = color or self._color
+        board = self.get_board()
+        opponent_adjacent_squares = {adj_square for opp_piece in board.get_squares_by_color(OPPOSITE_COLOR[color])
+                                     for adj_square in board.get_adjacent_squares_by_color(opp_piece, "NONE")}
 
-        opp_best = opp_cap_moves[0][1]
-        opp_next_best = opp_cap_moves[1][1] if len(opp_cap_moves) > 1 else 0
-        tradeoff = active_best - opp_best + material_advantage      # Play more aggressive/timid based on material
+        adjacent_moves = [(piece, square_to_reach) for square_to_reach in opponent_adjacent_squares
+                          for piece in self.find_reachable_pieces(square_to_reach, color)]
 
-        return max(tradeoff, opp_next_best)
+        return adjacent_moves
 
-    def get_potential_capture_heuristic(self) -> int:
-        """
-        Find all risky clusters and compare.
-        """
-        active_potential_captures = [cluster.squares for cluster in self.get_game().clusters.vulnerable_clusters[
-                                         self.get_opposing_color()]]
-        opp_potential_captures = [cluster.squares for cluster in self.get_game().clusters.vulnerable_clusters[
-            self.get_color()]]
-        num_active = len(set().union(*active_potential_captures))
-        num_opp = len(set().union(*opp_potential_captures))
+    def get_all_valid_moves(self, color: str = None) -> set[tuple[int, int]]:
+        """
+        Returns set of all valid moves of the given color (default own) given current game state.
+        """
+        game = self.get_game()
+        return {(piece, dest) for piece in self.get_board().get_squares_by_color(color or self._color)
+                for dest in game.get_reachable_squares(piece)}
+
+    def clear_killers(self) -> None:
+        """Empties the killer move slots of every ply."""
+        self.killers = [[()] * AIPlayer.NUM_KILLERS for _ in range(AIPlayer.MAX_SEARCH_DEPTH + 1)]
+
+    def age_history(self) -> None:
+        """Halves every history score, so moves that stopped causing cutoffs fade out between searches."""
+        self.history = [score >> 1 for score in self.history]
+
+    def record_cutoff(self, move: tuple[int, int], depth: int, ply: int) -> None:
+        """Records a quiet move that caused a beta cutoff in the killer slots of its ply and in the history table."""
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers.insert(0, move)
+            killers.pop()
+        self.history[move[0] * 81 + move[1]] += depth * depth
+
+    def is_legal_for(self, move: tuple[int, int], color: str) -> bool:
+        """Returns True if the given move, e.g. a stored killer or table move, is legal for the given color here."""
+        return bool(move) and self.get_board().get_square(move[0]) == color \
+            and move[1] in self.get_game().get_reachable_squares(move[0])
+
+    def generate_moves(self, color: str, ply: int = None, first_move: tuple[int, int] = ()):
+        """
+        Yields every move of the given color, which must be the active player, in stages: first_move (e.g. the
+        transposition table move) if legal, captures that win or trade material by static exchange evaluation, most
+        pieces captured first, the killer moves of the given ply, captures that lose material, moves next to the enemy
+        and to the center, then the rest. A stage is only generated once the previous one is used up, so a cutoff on
+        an early move skips generating the quiet moves. Quiet stages are sorted by history score, with moves next to
+        the enemy first among equal scores.
+        """
+        game = self.get_game()
+        board = self.get_board()
+        history = self.history
+        yielded = set()
+
+        # Stage 1: first move
+        if self.is_legal_for(first_move, color):
+            yielded.add(first_move)
+            yield first_move
+
+        # Stage 2: captures that do not lose material, most pieces captured first
+        losing_captures = []
+        for move, _ in self.find_capture_moves(color):
+            if move not in yielded:
+                yielded.add(move)
+                if self.static_exchange(move) < 0:
+                    losing_captures.append(move)
+                else:
+                    yield move
+
+        # Stage 3: killer moves
+        for move in self.killers[ply] if ply is not None else ():
+            if move not in yielded and self.is_legal_for(move, color):
+                yielded.add(move)
+                yield move
+
+        # Stage 4: captures that lose material
+        yield from losing_captures
+
+        # Stage 5: moves to squares next to the enemy, then to center squares, as one stage so history can reorder them
+        adjacent_squares = {adj_square for opp_piece in board.get_squares_by_color(OPPOSITE_COLOR[color])
+                            for adj_square in board.get_adjacent_squares_by_color(opp_piece, "NONE")}
+        center_squares = [square for square in CENTER_SQUARES
+                          if square not in adjacent_squares and board.get_square(square) == "NONE"]
+        stage_moves = [(piece, destination) for destination in list(adjacent_squares) + center_squares
+                       for piece in self.find_reachable_pieces(destination, color)]
+        stage_moves.sort(key=lambda stage_move: history[stage_move[0] * 81 + stage_move[1]], reverse=True)
+        for move in stage_moves:
+            if move not in yielded:
+                yielded.add(move)
+                yield move
+
+        # Stage 6: the rest
+        stage_moves = [(piece, destination) for piece in board.get_squares_by_color(color)
+                       for destination in game.get_reachable_squares(piece) if (piece, destination) not in yielded]
+        stage_moves.sort(key=lambda stage_move: history[stage_move[0] * 81 + stage_move[1]], reverse=True)
+        yield from stage_moves
+
+    def order_available_moves(self, color: str = None, ply: int = None) -> list[tuple[int, int]]:
+        """
+        Returns a list of all possible moves of the given color (default own), which must be the active player. Orders
+        preferable moves first, in the stages of generate_moves.
+        """
+        color = color or self._color
+        if self.get_game().get_active_player() != color:
+            raise Exception("order_available_moves called for inactive color.")
+        return list(self.generate_moves(color, ply))
+
+    def get_center_heuristic(self, color: str = None) -> int:
+        """
+        Returns a score based on how many pieces of the given color (default own) are close to the center of the board:
+        the sum of their CENTER_WEIGHT, kept up to date by the game as pieces move.
+        """
+        return self.get_game().get_center_sum(color or self._color)
+
+    def get_potential_capture_heuristic(self, color: str = None) -> int:
+        """
+        Compares how many pieces each side threatens to capture, from the given color's (default own) point of view.
+        """
+        color = color or self._color
+        num_active = sum(self.find_pot_cap_squares(color).values())
+        num_opp = sum(self.find_pot_cap_squares(OPPOSITE_COLOR[color]).values())
         return num_active - num_opp
 
-    def get_heuristic(self) -> float:
-        """
-        Returns an evaluation of the current board state. Will be signed according to whether current player is max.
-        """
-
-        material_points = (len(self.get_pieces()) - len(self.get_opposing_player().get_pieces())) * AIPlayer.H_MATERIAL
-        center_points = (self.get_center_heuristic() - self.get_opposing_player().get_center_heuristic()) * \
-                        AIPlayer.H_CENTER
-        cap_points = self.get_capture_heuristic() * AIPlayer.H_CAPTURE
-        # pot_cap_points = self.get_potential_capture_heuristic() * AIPlayer.H_POT_CAP
-        victory_points = AIPlayer.H_WIN if self.did_win() else 0
-
-        total = material_points + center_points + cap_points + victory_points
-        return total if self.is_maximizing else -total
-
-    def make_ai_clone(self) -> None:
-        """
-        Makes an AI to pilot a Player object while calculating next move. Uses given Player's pieces but returns
-        them to initial state when done.
-        """
-        ai_clone = AIPlayer(self.get_game(), self.get_opposing_player().get_color())
-        self.set_opposing_player(ai_clone)
-
-    def is_better_score(self, better_score: float, worse_score: float) -> bool:
-        return better_score > worse_score if self.is_maximizing else better_score < worse_score
-
-    def minimax_helper(self, depth: int, alpha: float, beta: float) -> tuple[str, float]:
-        """
-        Recurses alternating player moves until depth is 0 to find the most advantageous move for each player.
-        """
-        # Base case
-        if depth == 0 or self.get_game().get_game_state() != "UNFINISHED":
-            return "", self.get_heuristic()
-
-        # Recursion
-        best_score = self.initial_best_score
-        best_move = ""
-        possible_move_list = self.order_available_moves()
-
-        for index, possible_move in enumerate(possible_move_list):
-            self.make_move(possible_move[:2], possible_move[2:])
-            sub_move, sub_score = self.get_opposing_player().minimax_helper(depth - 1, alpha, beta)
-            self.undo_move()
-
-            # Evaluation
-            if self.is_better_score(sub_score, best_score):
-                best_move, best_score = possible_move, sub_score
-            if self.is_better_score(best_score, alpha):
-                alpha = best_score
-            if self.is_better_score(best_score, beta):
-                beta = best_score
-
-            # Cut short if no move will gain further advantage
-            if beta <= alpha:
+    def get_position_score(self, color: str) -> float:
+        """
+        Returns the material and center terms of the static evaluation from the given color's point of view. Both are
+        read from counts the board and game update incrementally, so no piece is visited.
+        """
+        opp_color = OPPOSITE_COLOR[color]
+        board = self.get_board()
+        game = self.get_game()
+        material_points = (board.get_num_pieces(color) - board.get_num_pieces(opp_color)) * AIPlayer.H_MATERIAL
+        center_points = (game.get_center_sum(color) - game.get_center_sum(opp_color)) * AIPlayer.H_CENTER
+        # pot_cap_points = self.get_potential_capture_heuristic(color) * AIPlayer.H_POT_CAP
+        return material_points + center_points
+
+    def get_draw_score(self, color: str) -> float:
+        """Returns the score of a draw from the given color's point of view, set by the contempt of self.options."""
+        return -self.options.contempt if color == self._color else self.options.contempt
+
+    def get_table_key(self) -> tuple[int, int]:
+        """
+        Returns (key, transform) for the transposition table in the current position: the game's symmetric key, and
+        the transform to its canonical image. Draws score with contempt for own color, so with contempt the key also
+        tells apart which color own color is in the canonical image, and images swapping the colors of the players
+        don't share entries.
+        """
+        key, transform = self.get_game().get_symmetric_key()
+        if self.options.contempt and symmetry.transform_color(self._color, transform) == "RED":
+            key ^= zobrist.CONTEMPT_KEY
+        return key, transform
+
+    def get_heuristic(self, color: str = None, ply: int = 0) -> float:
+        """
+        Returns a static evaluation of the current board state from the given color's (default own) point of view.
+        Pending captures are left to the quiescence search. A won game scores H_WIN - ply and a lost one ply - H_WIN,
+        ply being the distance from the root, so a quicker win or a slower loss scores higher. With an eval_cache, the
+        position score is cached by symmetric board key from BLACK's point of view in the canonical image, so both
+        colors' AIPlayers can share the entries and equivalent positions share one.
+        """
+        color = color or self._color
+        game = self.get_game()
+        state = game.get_game_state()
+        if state != "UNFINISHED":
+            if state == "DRAW":
+                return self.get_draw_score(color)
+            return AIPlayer.H_WIN - ply if state[:-4] == color else ply - AIPlayer.H_WIN
+        cache = self.eval_cache
+        if cache is None:
+            return self.get_position_score(color)
+
+        key, transform = game.get_symmetric_board_key()
+        black_color = symmetry.transform_color("BLACK", transform)     # Own color that is BLACK in the canonical image
+        black_score = cache.probe(key)
+        if black_score is None:
+            black_score = self.get_position_score(black_color)
+            cache.store(key, black_score)
+        return black_score if color == black_color else -black_score
+
+    @staticmethod
+    def to_table_score(score: float, ply: int) -> float:
+        """
+        Returns the given score of a node at the given ply as stored in the transposition table, with a win or loss
+        counted in plies from the node rather than the root, so it stays right when probed at another ply.
+        """
+        if score >= AIPlayer.WIN_THRESHOLD:
+            return score + ply
+        if score <= -AIPlayer.WIN_THRESHOLD:
+            return score - ply
+        return score
+
+    @staticmethod
+    def from_table_score(score: float, ply: int) -> float:
+        """Returns a score read from the transposition table for a node at the given ply. Inverse of to_table_score."""
+        return AIPlayer.to_table_score(score, -ply)
+
+    def negamax(self, depth: int, alpha: float, beta: float, color: str, first_move: tuple[int, int] = (),
+                ply: int = 0, allow_null: bool = True) -> tuple[tuple[int, int], float]:
+        """
+        Principal variation search for the given color, which must be the active player, scored from its point of
+        view. The first move is searched with the full window and the rest with a null window, re-searching those that
+        beat alpha. first_move is tried first unless the transposition table has a best move. ply is the distance from
+        the root, which indexes the killer moves. Null-window nodes are pruned and reduced as set by self.options;
+        allow_null is False right after a null move, so the two sides never pass in a row.
+        """
+        self.limits.count_node()
+        game = self.get_game()
+
+        # Base cases
+        if game.get_game_state() != "UNFINISHED":
+            return (), self.get_heuristic(color, ply)
+        if ply and game.is_repetition():    # Either side could repeat it again until the game is drawn
+            return (), self.get_draw_score(color)
+        if depth == 0:
+            return (), self.quiescence(alpha, beta, color, ply)
+        if ply and self.tablebase is not None:
+            tablebase_score = self.probe_tablebase(ply)
+            if tablebase_score is not None:
+                return (), tablebase_score
+
+        # Transposition table: cut off on a deep enough stored result, else try its best move first. Entries are
+        # stored under the table key, see get_table_key, with moves in the canonical image
+        table = self.transposition_table
+        key, transform = self.get_table_key() if table is not None else (0, symmetry.IDENTITY)
+        tt_move = ()
+        entry = table.probe(key) if table is not None else None
+        if entry is not None:
+            tt_depth, tt_score, tt_bound, tt_move = entry
+            tt_score = AIPlayer.from_table_score(tt_score, ply)
+            tt_move = symmetry.transform_move(tt_move, transform)
+            if tt_depth >= depth and (tt_bound == EXACT or (tt_bound == LOWER and tt_score >= beta)
+                                      or (tt_bound == UPPER and tt_score <= alpha)):
+                return tt_move, tt_score
+        alpha_orig = alpha
+        opp_color = OPPOSITE_COLOR[color]
+        options = self.options
+        is_pv = beta - alpha > AIPlayer.NULL_WINDOW
+        static_score = self.get_heuristic(color) if not is_pv and (options.null_move_pruning
+                                                                   or options.futility_pruning) else None
+
+        # Null move pruning: if passing still holds beta in a shallower search, a real move would too
+        if options.null_move_pruning and allow_null and not is_pv and depth >= options.null_move_min_depth \
+                and static_score >= beta and self.get_board().get_num_pieces(color) >= options.null_move_min_pieces:
+            game.toggle_active_player()
+            try:
+                score = -self.negamax(depth - 1 - options.null_move_reduction, -beta, -beta + AIPlayer.NULL_WINDOW,
+                                      opp_color, (), ply + 1, False)[1]
+            finally:
+                game.toggle_active_player()
+            if score >= beta:
+                return (), score
+
+        # Futility pruning: near the leaves, quiet moves that cannot bring the score up to alpha are skipped
+        is_futile = options.futility_pruning and not is_pv and depth < len(options.futility_margins) \
+            and static_score + options.futility_margins[depth] <= alpha
+
+        # SEE pruning: near the leaves, captures that lose material in the exchange they start are skipped
+        is_see_pruned = options.see_pruning and not is_pv and depth <= options.see_pruning_max_depth
+
+        # Recursion, generating moves lazily. A position that is its own mirror image, like the starting position,
+        # searches only one of each pair of mirrored moves
+        best_move, best_score = (), -AIPlayer.SCORE_INFINITY
+        moves = self.generate_moves(color, ply, tt_move or first_move)
+        if game.is_mirror_symmetric():
+            moves = symmetry.drop_mirrored_moves(moves)
+        for index, possible_move in enumerate(moves):
+            # The move is undone even if the search is aborted, so a null move further up is only taken back once the
+            # moves made after it have been
+            game.make_move_by_index(*possible_move)
+            try:
+                is_capture = bool(game.move_log[-1].cap_squares)
+                if best_move and (not is_capture and is_futile or is_capture and is_see_pruned
+                                  and self.get_move_gain() < self.get_recapture_gain()):
+                    continue
+                if index == 0:
+                    score = -self.negamax(depth - 1, -beta, -alpha, opp_color, (), ply + 1)[1]
+                else:
+                    # Late move reductions: quiet moves ordered late are searched shallower first
+                    reduction = 0
+                    if options.late_move_reductions and not is_capture and depth >= options.lmr_min_depth \
+                            and index >= options.lmr_min_index:
+                        reduction = 2 if index >= options.lmr_late_index and depth > 3 else 1
+                    score = -self.negamax(depth - 1 - reduction, -alpha - AIPlayer.NULL_WINDOW, -alpha, opp_color,
+                                          (), ply + 1)[1]
+                    if reduction and score > alpha:
+                        score = -self.negamax(depth - 1, -alpha - AIPlayer.NULL_WINDOW, -alpha, opp_color, (),
+                                              ply + 1)[1]
+                    if alpha < score < beta:
+                        score = -self.negamax(depth - 1, -beta, -alpha, opp_color, (), ply + 1)[1]
+            finally:
+                game.undo_move()
+
+            if score > best_score:
+                best_move, best_score = possible_move, score
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                if not is_capture:
+                    self.record_cutoff(possible_move, depth, ply)
                 break
+        if not best_move:           # No legal moves
+            best_score = ply - AIPlayer.H_WIN
 
+        if table is not None:
+            bound = UPPER if best_score <= alpha_orig else LOWER if best_score >= beta else EXACT
+            table.store(key, depth, AIPlayer.to_table_score(best_score, ply), bound,
+                        symmetry.transform_move(best_move, transform))
         return best_move, best_score
 
-    def minimax(self, depth: int) -> tuple[str, float]:
-        """
-        Finds the best move to make assuming opponent plays optimally. Tuple returned is (best_move, heuristic).
-        """
-        old_opp = self.get_opposing_player()
-        self.make_ai_clone()
-
-        next_move, heuristic = self.minimax_helper(depth, -9999, 9999)
+    def quiescence(self, alpha: float, beta: float, color: str, ply: int = 0) -> float:
+        """
+        Extends a leaf of the negamax search with capture moves only, so it is not scored in the middle of an exchange.
+        The side to move may stand pat on the static evaluation instead of capturing, and captures that could not
+        raise the score to alpha even with DELTA_MARGIN to spare are skipped (delta pruning), as are captures that
+        lose material by static exchange evaluation if self.options has SEE pruning. Scored for the given color, which
+        must be the active player; ply is the distance from the root.
+        """
+        self.limits.count_node()
+        self.limits.q_nodes += 1
+        game = self.get_game()
+        if self.tablebase is not None and game.get_game_state() == "UNFINISHED":
+            tablebase_score = self.probe_tablebase(ply)
+            if tablebase_score is not None:
+                return tablebase_score
+        stand_pat = self.get_heuristic(color, ply)
+        if game.get_game_state() != "UNFINISHED" or stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        opp_color = OPPOSITE_COLOR[color]
+        best_score = stand_pat
+        opp_pieces = self.get_board().get_num_pieces(opp_color)
+        see_pruning = self.options.see_pruning
+        for possible_move, num_captures in self.find_capture_moves(color):
+            # Moves are sorted by pieces captured, so once one is pruned all the rest would be, unless it wins. The
+            # skipped captures could still score up to the pruning bound, so the score fails low at that bound
+            delta_bound = stand_pat + num_captures * AIPlayer.H_MATERIAL + AIPlayer.DELTA_MARGIN
+            if delta_bound <= alpha and opp_pieces - num_captures > 1:
+                best_score = max(best_score, delta_bound)
+                break
+            if see_pruning and self.static_exchange(possible_move) < 0:
+                continue
+            game.make_move_by_index(*possible_move)
+            try:
+                score = -self.quiescence(-beta, -alpha, opp_color, ply + 1)
+            finally:
+                game.undo_move()
+
+            best_score = max(best_score, score)
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        return best_score
+
+    def get_tablebase_score(self, result: str, distance: int, color: str, ply: int = 0) -> float:
+        """
+        Returns the score of a tablebase (result, distance) for the given color at the given ply, on the scale of
+        get_heuristic: a win or loss is scored as the finished game distance plies further on, and a draw with contempt.
+        """
+        if result == "DRAW":
+            return self.get_draw_score(color)
+        return AIPlayer.H_WIN - ply - distance if result == "WIN" else ply + distance - AIPlayer.H_WIN
+
+    def probe_tablebase(self, ply: int = 0) -> float:
+        """
+        Returns the exact score of the current position for the active player at the given ply, or None if the
+        tablebase lacks it.
+        """
+        game = self.get_game()
+        probed = self.tablebase.probe(game)
+        return None if probed is None else self.get_tablebase_score(*probed, game.get_active_player(), ply)
+
+    def tablebase_move(self) -> tuple[tuple[int, int], float]:
+        """
+        Returns (best_move, heuristic) from the tablebase for own move in the current position, or None unless the
+        tablebase holds it. Every move is scored by probing the position it leads to, so the quickest win, or else a
+        draw, or else the slowest loss, is chosen.
+        """
+        game = self.get_game()
+        if self.tablebase is None or game.get_game_state() != "UNFINISHED" or self.probe_tablebase() is None:
+            return None
+        best_move, best_score = (), -AIPlayer.SCORE_INFINITY
+        for possible_move in self.generate_moves(self._color):
+            game.make_move_by_index(*possible_move)
+            state = game.get_game_state()
+            probed = self.tablebase.probe(game) if state == "UNFINISHED" else ("DRAW", 0) if state == "DRAW" \
+                else ("LOSS", 0)
+            game.undo_move()
+            if probed is None:
+                return None
+            result, distance = probed
+            score = self.get_tablebase_score({"WIN": "LOSS", "LOSS": "WIN"}.get(result, result), distance + 1,
+                                             self._color)
+            if score > best_score:
+                best_move, best_score = possible_move, score
+        return best_move, best_score
 
-        self.set_opposing_player(old_opp)
-        print(next_move, heuristic)
+    def aspiration_search(self, depth: int, guess: float, first_move: tuple[int, int]) -> tuple[tuple[int, int], float]:
+        """
+        Searches the root in a narrow window around guess, the previous iteration's score, widening the side that
+        failed until the score falls inside. A guess of None searches the full window.
+        """
+        infinity = AIPlayer.SCORE_INFINITY
+        if guess is None:
+            return self.negamax(depth, -infinity, infinity, self._color, first_move)
+
+        delta = AIPlayer.ASPIRATION_WINDOW
+        alpha, beta = guess - delta, guess + delta
+        while True:
+            best_move, best_score = self.negamax(depth, alpha, beta, self._color, first_move)
+            if best_score <= alpha and alpha > -infinity:
+                alpha = max(best_score - delta, -infinity)
+            elif best_score >= beta and beta < infinity:
+                beta = min(best_score + delta, infinity)
+                first_move = best_move
+            else:
+                return best_move, best_score
+            delta *= 4
+
+    def parallel_root_search(self, depth: int, first_move: tuple[int, int]) -> tuple[tuple[int, int], float]:
+        """
+        Searches own root moves to the given depth across the worker processes, first_move first, starting the
+        workers if needed. Used by search in place of aspiration_search when there is more than one worker.
+        """
+        from hasami_shogi.src.model.parallel_search import RootParallelSearch
+        if self.parallel_search is None:
+            self.parallel_search = RootParallelSearch(self.workers, type(self.get_board()),
+                                                      self.get_game().get_draw_rules(), self.tt_size_mb, self.options)
+        game = self.get_game()
+        history = game.get_move_history()
+        ordered_moves = self.generate_moves(self._color, 0, first_move)
+        if game.is_mirror_symmetric():
+            ordered_moves = symmetry.drop_mirrored_moves(ordered_moves)
+        return self.parallel_search.search_depth(history, self._color, list(ordered_moves), depth, self.limits)
+
+    def start_helpers(self, max_depth: int) -> None:
+        """
+        Starts the Lazy SMP helpers searching own position up to max_depth, moving the transposition table into shared
+        memory and starting the helper processes if needed.
+        """
+        from hasami_shogi.src.model.parallel_search import LazySMPSearch
+        if self.parallel_search is None:
+            self.transposition_table = SharedTranspositionTable(self.tt_size_mb)
+            self.transposition_table.new_search()
+            self.parallel_search = LazySMPSearch(self.workers, type(self.get_board()), self.get_game().get_draw_rules(),
+                                                 self.transposition_table, self.options)
+        history = self.get_game().get_move_history()
+        self.parallel_search.start(history, self._color, max_depth, self.transposition_table.age)
+
+    def close(self) -> None:
+        """
+        Stops the worker processes of the parallel search, if any. A shared transposition table is freed and replaced
+        by a private one; a later search starts everything again.
+        """
+        if self.parallel_search is not None:
+            self.parallel_search.shutdown()
+            self.parallel_search = None
+        if isinstance(self.transposition_table, SharedTranspositionTable):
+            self.transposition_table.close(unlink=True)
+            self.transposition_table = TranspositionTable(self.tt_size_mb)
+
+    def minimax(self, depth: int) -> tuple[tuple[int, int], float]:
+        """
+        Finds the best move to make assuming opponent plays optimally, searching to exactly the given depth. Tuple
+        returned is (best_move, heuristic), with the heuristic from own point of view.
+        """
+        return self.search(max_depth=depth, start_depth=depth)
+
+    def search(self, time_ms: float = None, max_depth: int = MAX_SEARCH_DEPTH, max_nodes: int = None,
+               stop_event=None, start_depth: int = 1, quiet: bool = False) -> tuple[tuple[int, int], float]:
+        """
+        Searches with iterative deepening from start_depth until max_depth, time_ms, max_nodes or stop_event (e.g. a
+        threading.Event) ends it. Each iteration tries the previous best move first, in an aspiration window around the
+        previous score, and the transposition table carries the rest of that line over. With more than one worker,
+        each iteration instead splits the root moves across the worker processes, or with lazy_smp, helper processes
+        search alongside into the shared table until this search ends. Returns (best_move, heuristic)
+        of the deepest completed iteration, or the first ordered move if none completed. The heuristic is from own
+        point of view. A legal book move, or the tablebase's move, is returned without searching. The move and score are
+        printed unless quiet is set, e.g. for a search in a background thread.
+        """
+        game = self.get_game()
+        self.limits = SearchLimits(time_ms, max_nodes, stop_event)
+        self.transposition_table is not None and self.transposition_table.new_search()
+        self.clear_killers()
+        self.age_history()
+        self.depth_reached = 0
+        self.helper_nodes = 0
+        if self.book is not None and game.get_game_state() == "UNFINISHED":
+            key, transform = game.get_symmetric_key()
+            book_move = self.book.choose_move(key)
+            if book_move is not None:
+                book_move = symmetry.transform_move(book_move[0], transform), book_move[1]
+                if self.is_legal_for(book_move[0], self._color):
+                    quiet or print(move_to_string(book_move[0]), book_move[1], "(book)")
+                    return book_move
+        tablebase_move = self.tablebase_move()
+        if tablebase_move is not None:
+            quiet or print(move_to_string(tablebase_move[0]), tablebase_move[1], "(tablebase)")
+            return tablebase_move
+        is_lazy_smp = self.lazy_smp and self.workers > 1
+        is_root_parallel = self.workers > 1 and not self.lazy_smp
+
+        next_move, heuristic = (), self.get_heuristic()
+        try:
+            if is_lazy_smp and game.get_game_state() == "UNFINISHED":
+                self.start_helpers(max_depth)
+            if game.get_game_state() == "UNFINISHED":
+                next_move = next(self.generate_moves(self._color), ())
+            for depth in range(start_depth, max(start_depth, max_depth) + 1):
+                if self.depth_reached and not self.limits.can_start_iteration():
+                    break
+                guess = heuristic if self.depth_reached else None
+                if is_root_parallel:
+                    next_move, heuristic = self.parallel_root_search(depth, next_move)
+                else:
+                    next_move, heuristic = self.aspiration_search(depth, guess, next_move)
+                self.depth_reached = depth
+                if not next_move:
+                    break
+        except SearchAborted:
+            pass                # negamax and quiescence undo their moves as the abort unwinds them
+        finally:
+            if is_lazy_smp and self.parallel_search is not None:
+                self.helper_nodes = self.parallel_search.stop()
+
+        quiet or print(move_to_string(next_move) if next_move else next_move, heuristic)
         return next_move, heuristic
 
     def ai_make_move(self, depth: int) -> None:
         next_move = self.minimax(depth)
-        self.make_move(next_move[0][:2], next_move[0][2:])
+        self.make_move_by_index(*next_move[0])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,97 @@
+# Lookup tables describing the geometry of the 9x9 board, built once at import. Every table is indexed by integer
+# square (0-80, numbered row by row) so geometry questions become a single tuple read instead of a recomputation.
+
+SQUARES = range(81)
+
+# Directions, in the order used by RAYS.
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+DIRECTION_STEPS = (-9, 9, -1, 1)
+
+# Row/column membership. Axes 0-8 are rows a-i, axes 9-17 are columns 1-9.
+ROW_OF = tuple(square // 9 for square in SQUARES)
+COL_OF = tuple(square % 9 for square in SQUARES)
+ROW_AXIS_OF = ROW_OF
+COL_AXIS_OF = tuple(9 + col for col in COL_OF)
+ROW_BIT = tuple(1 << col for col in COL_OF)         # Bit of the square within its row's occupancy
+COL_BIT = tuple(1 << row for row in ROW_OF)         # Bit of the square within its column's occupancy
+AXIS_SQUARES = tuple(tuple(row * 9 + col for col in range(9)) for row in range(9)) \
+    + tuple(tuple(row * 9 + col for row in range(9)) for col in range(9))
+
+
+def _ray(square: int, direction: int) -> tuple[int, ...]:
+    """Returns the squares from the given square (exclusive) to the edge of the board in the given direction."""
+    row, col = divmod(square, 9)
+    row_step, col_step = {UP: (-1, 0), DOWN: (1, 0), LEFT: (0, -1), RIGHT: (0, 1)}[direction]
+    output = []
+    row, col = row + row_step, col + col_step
+    while 0 <= row < 9 and 0 <= col < 9:
+        output.append(row * 9 + col)
+        row, col = row + row_step, col + col_step
+    return tuple(output)
+
+
+# RAYS[square][direction] is the tuple of squares from square to the board edge, nearest first.
+RAYS = tuple(tuple(_ray(square, direction) for direction in DIRECTIONS) for square in SQUARES)
+
+# NEIGHBOURS[square] is the tuple of orthogonally adjacent squares, in board order.
+NEIGHBOURS = tuple(tuple(sorted(ray[0] for ray in RAYS[square] if ray)) for square in SQUARES)
+
+
+def _next_square_row(square1: int) -> tuple:
+    """Returns the row of NEXT_SQUARE for the given first square."""
+    output = [None] * 81
+    for ray in RAYS[square1]:
+        if len(ray) > 1:
+            output[ray[0]] = ray[1]
+    return tuple(output)
+
+
+# NEXT_SQUARE[square1][square2] is the square after square2 on the line through adjacent squares square1 and square2,
+# or None if that is off the board or the squares are not adjacent.
+NEXT_SQUARE = tuple(_next_square_row(square) for square in SQUARES)
+
+
+def _square_range_row(square_from: int) -> tuple:
+    """Returns the row of SQUARE_RANGES for the given starting square."""
+    output = [None] * 81
+    output[square_from] = (square_from,)
+    for ray in RAYS[square_from]:
+        for distance, square_to in enumerate(ray):
+            output[square_to] = (square_from,) + ray[:distance + 1]
+    return tuple(output)
+
+
+# SQUARE_RANGES[square_from][square_to] is the tuple of squares from one square to the other, inclusive, or None if the
+# squares do not share a row or column.
+SQUARE_RANGES = tuple(_square_range_row(square) for square in SQUARES)
+
+
+def _closest_corner(square: int):
+    """Returns the corner within one square of the given square in both directions, or None."""
+    row, col = divmod(square, 9)
+    if 1 < row < 7 or 1 < col < 7:
+        return None
+    return (0 if row < 2 else 72) + (0 if col < 2 else 8)
+
+
+CLOSEST_CORNER = tuple(_closest_corner(square) for square in SQUARES)
+
+# Corner captures: the corner piece is captured when the enemy holds both squares orthogonally next to it.
+CORNER_CAPTURE_SQUARES = {0: (1, 9), 8: (7, 17), 72: (63, 73), 80: (71, 79)}
+
+
+def _corner_capture(square: int):
+    """Returns (capture partner, corner) if arriving at the given square can complete a corner capture, else None."""
+    for corner, capturing_squares in CORNER_CAPTURE_SQUARES.items():
+        if square in capturing_squares:
+            return capturing_squares[capturing_squares.index(square) - 1], corner
+    return None
+
+
+# CORNER_CAPTURES[square] is (capture partner, corner) for the eight squares next to a corner, else None.
+CORNER_CAPTURES = tuple(_corner_capture(square) for square in SQUARES)
+
+# CENTER_WEIGHT[square] is how central the square is: (8 - row) * row * (8 - col) * col, 0 on the edges and 256 at e5.
+CENTER_WEIGHT = tuple((8 - ROW_OF[square]) * ROW_OF[square] * (8 - COL_OF[square]) * COL_OF[square]
+                      for square in SQUARES)
@@ -1,3 +1,5 @@
+import itertools
+
 from hasami_shogi.src.model.game_board import GameBoard
 
 
@@ -5,20 +7,22 @@ class ClusterUpdates:
     """
     Defines data structure to hold information used by ClusterCollection to update data members.
     """
-    def __init__(self, cluster: "Cluster", borders: set[str] = None, members: set[str] = None):
+    __slots__ = ("cluster", "borders", "members", "remove_from_all", "add_to_all")
+
+    def __init__(self, cluster: "Cluster", borders: set[int] = None, members: set[int] = None):
         self.cluster: Cluster = cluster                             # Cluster to add or remove
-        self.borders: set[str] = borders if borders else set()      # Borders to update
-        self.members: set[str] = members if members else set()      # Members to update
+        self.borders: set[int] = borders if borders else set()      # Borders to update
+        self.members: set[int] = members if members else set()      # Members to update
         self.remove_from_all: bool = False                          # Set true to remove cluster from all collections
         self.add_to_all: bool = False                               # Set true to add cluster to all collections
 
     def __repr__(self) -> str:
         return f"Cluster: {self.cluster}, Borders: {self.borders}, Members: {self.members}"
 
-    def add_to_members(self, members: set[str]) -> None:
+    def add_to_members(self, members: set[int]) -> None:
         self.members |= members
 
-    def add_to_borders(self, borders: set[str]) -> None:
+    def add_to_borders(self, borders: set[int]) -> None:
         self.borders |= borders
 
 
@@ -26,6 +30,8 @@ class ClusterOpResult:
     """
     Collection of ClusterUpdates and instructions on whether to add or remove.
     """
+    __slots__ = ("to_remove", "to_add")
+
     def __init__(self):
         self.to_remove: list[ClusterUpdates] = []
         self.to_add: list[ClusterUpdates] = []
@@ -51,18 +57,25 @@ class ClusterOpResult:
 
 class Cluster:
     """
-    Contains methods for maintaining a collection of adjacent squares of the same color.
+    Contains methods for maintaining a collection of adjacent squares of the same color. A border is None where the
+    cluster runs against the edge of the board. Each cluster has a unique cluster_id, used as its key in the
+    ClusterCollection indexes and as its hash.
     """
+    __slots__ = ("cluster_id", "board", "squares", "squares_sorted", "lower_occ", "upper_occ", "color", "lower_border",
+                 "upper_border")
 
-    def __init__(self, squares: list[str], board: GameBoard):
+    _next_id = itertools.count()
+
+    def __init__(self, squares: list[int], board: GameBoard):
         """
         Square list must be sorted.
         """
+        self.cluster_id: int = next(Cluster._next_id)
         self.board: GameBoard = board
-        self.squares: set[str] = set(squares)
-        self.squares_sorted: list[str] = squares
-        self.lower_occ: str = self.squares_sorted[0]
-        self.upper_occ: str = self.squares_sorted[-1]
+        self.squares: set[int] = set(squares)
+        self.squares_sorted: list[int] = squares
+        self.lower_occ: int = self.squares_sorted[0]
+        self.upper_occ: int = self.squares_sorted[-1]
         self.color: str = self.board.get_square(self.lower_occ)
 
         self.lower_border = self.upper_border = None
@@ -75,14 +88,18 @@ class Cluster:
     def __repr__(self) -> str:
         return type(self).__name__ + repr(self.squares)
 
+    def __hash__(self) -> int:
+        return self.cluster_id
+
     def __contains__(self, item) -> bool:
         return item in self.squares
 
     def validation(self) -> None:
-        if [sq for sq in self.squares if sq[0] != self.lower_occ[0]] and [sq for sq in self.squares if sq[1] != self.lower_occ[1]]:
+        if [sq for sq in self.squares if sq // 9 != self.lower_occ // 9] and \
+                [sq for sq in self.squares if sq % 9 != self.lower_occ % 9]:
             raise ValueError(f"Squares must be all in one line: {self.squares}")
 
-    def raise_if_bad_square(self, square: str) -> None:
+    def raise_if_bad_square(self, square: int) -> None:
         if square not in self.squares:
             raise ValueError(f"{square} not in self.squares {self.squares}")
 
@@ -111,7 +128,7 @@ class Cluster:
     def update_upper_occ(self) -> None:
         self.upper_occ = max(self.squares)
 
-    def release(self, square: str) -> ClusterOpResult:
+    def release(self, square: int) -> ClusterOpResult:
         """
         Handles removing given square from set and creating new clusters from resulting split. Returns these new
         clusters along with instructions on how to update them in the ClusterCollection.
@@ -176,13 +193,11 @@ class Cluster:
 
     def can_merge_with(self, merging_cluster: "Cluster") -> bool:
         """
-        Returns False if merging would throw an error, else True.
+        Returns False if merging would throw an error, else True. Checks the same conditions as merge_validation
+        without raising, since most candidates on the move path are rejected.
         """
-        try:
-            self.merge_validation(merging_cluster)
-        except ValueError:
-            return False
-        return True
+        return (self.upper_occ == merging_cluster.lower_border or merging_cluster.upper_occ == self.lower_border) \
+            and type(self) == type(merging_cluster) and self.color == merging_cluster.color
 
     def merge(self, merging_cluster: "Cluster") -> ClusterOpResult:
         """
@@ -222,16 +237,16 @@ class Cluster:
             results += self.merge(cluster)
         return results
 
-    def get_borders(self) -> set[str]:
+    def get_borders(self) -> set[int]:
         return {self.lower_border, self.upper_border}
 
-    def get_other_border(self, square: str) -> str:
+    def get_other_border(self, square: int) -> int:
         """
-        Given one of self's borders, returns the other, or "" if square not a border.
+        Given one of self's borders, returns the other, or None if square not a border.
         """
         border_squares: set = self.get_borders()
         if square not in border_squares:
-            return ""
+            return None
         border_squares.remove(square)
         return border_squares.pop()
 
@@ -240,96 +255,38 @@ class VerticalCluster(Cluster):
     """
     Defines methods for finding borders in a vertical orientation.
     """
-    LOWER_BORDERS = {
-        "a": "",
-        "b": "a",
-        "c": "b",
-        "d": "c",
-        "e": "d",
-        "f": "e",
-        "g": "f",
-        "h": "g",
-        "i": "h"
-    }
-
-    UPPER_BORDERS = {
-        "a": "b",
-        "b": "c",
-        "c": "d",
-        "d": "e",
-        "e": "f",
-        "f": "g",
-        "g": "h",
-        "h": "i",
-        "i": ""
-    }
+    __slots__ = ()
 
     def find_lower_border(self) -> None:
-        if self.lower_border == "":
-            return
-        row, col = self.lower_occ
-        prev_row = self.LOWER_BORDERS[row]
-        self.lower_border = prev_row + col if prev_row else ""
+        self.lower_border = self.lower_occ - 9 if self.lower_occ >= 9 else None
 
     def find_upper_border(self) -> None:
-        if self.upper_border == "":
-            return
-        row, col = self.upper_occ
-        next_row = self.UPPER_BORDERS[row]
-        self.upper_border = next_row + col if next_row else ""
+        self.upper_border = self.upper_occ + 9 if self.upper_occ < 72 else None
 
 
 class HorizontalCluster(Cluster):
     """
     Defines methods for finding borders in a horizontal orientation.
     """
-    LOWER_BORDERS = {
-        "1": "",
-        "2": "1",
-        "3": "2",
-        "4": "3",
-        "5": "4",
-        "6": "5",
-        "7": "6",
-        "8": "7",
-        "9": "8"
-    }
-
-    UPPER_BORDERS = {
-        "1": "2",
-        "2": "3",
-        "3": "4",
-        "4": "5",
-        "5": "6",
-        "6": "7",
-        "7": "8",
-        "8": "9",
-        "9": ""
-    }
+    __slots__ = ()
 
     def find_lower_border(self) -> None:
-        if self.lower_border == "":
-            return
-        row, col = self.lower_occ
-        prev_col = self.LOWER_BORDERS[col]
-        self.lower_border = row + prev_col if prev_col else ""
+        self.lower_border = self.lower_occ - 1 if self.lower_occ % 9 != 0 else None
 
     def find_upper_border(self) -> None:
-        if self.upper_border == "":
-            return
-        row, col = self.upper_occ
-        next_col = self.UPPER_BORDERS[col]
-        self.upper_border = row + next_col if next_col else ""
+        self.upper_border = self.upper_occ + 1 if self.upper_occ % 9 != 8 else None
 
 
 class CaptureCluster(Cluster):
     """
     Expands functionality of Cluster to include helpful capture-related methods and properties.
     """
+    __slots__ = ("opp_color", "risky_border", "is_captured")
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.opp_color: str = self.board.opposite_color(self.color)
-        self.risky_border: str = ""                 # Border that, if opponent takes, will result in capture
+        self.risky_border: int = None               # Border that, if opponent takes, will result in capture
         self.is_captured: bool = False              # True if opponent just took risky_border
         self.check_if_capturable()
 
@@ -342,28 +299,28 @@ class CaptureCluster(Cluster):
         """
 
         # Scenario: capture occurred
-        if self.risky_border and self.board.get_square(self.risky_border) == self.opp_color:
+        if self.risky_border is not None and self.board.get_square(self.risky_border) == self.opp_color:
             self.is_captured = True
-            self.risky_border = ""
+            self.risky_border = None
             return None
 
         # Scenario: one side against edge of board
-        if not self.lower_border or not self.upper_border:
-            self.risky_border = ""
+        if self.lower_border is None or self.upper_border is None:
+            self.risky_border = None
             return None
 
         # Update risky_border according to board state
         lb_val = self.board.get_square(self.lower_border)
         ub_val = self.board.get_square(self.upper_border)
         if lb_val == ub_val == "NONE":
-            self.risky_border = ""
+            self.risky_border = None
             return None
         if lb_val == "NONE":
             self.risky_border = self.lower_border
         elif ub_val == "NONE":
             self.risky_border = self.upper_border
         else:
-            self.risky_border = ""
+            self.risky_border = None
         return None
 
     def merge(self, *args, **kwargs) -> ClusterOpResult:
@@ -375,27 +332,9 @@ class CaptureCluster(Cluster):
         return results
 
 
-class Tube(Cluster):
-    """
-    Defines methods for a Cluster of empty squares.
-    """
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        if self.color != "NONE":
-            raise ValueError(f"Tube initialized with occupied squares: {self}")
-
-
 class VertCapCluster(CaptureCluster, VerticalCluster):
-    pass
+    __slots__ = ()
 
 
 class HorCapCluster(CaptureCluster, HorizontalCluster):
-    pass
-
-
-class VertTube(Tube, VerticalCluster):
-    pass
-
-
-class HorTube(Tube, HorizontalCluster):
-    pass
+    __slots__ = ()
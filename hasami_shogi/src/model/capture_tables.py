@@ -0,0 +1,88 @@
+import hasami_shogi.src.model.board_geometry as geometry
+
+# Linear capture tables keyed on (line pattern, landing position), built once at import. A line pattern encodes a whole
+# row or column in base 3, one digit per position (column for rows, row for columns): 0 empty, 1 BLACK, 2 RED. With
+# only 3^9 patterns per line, every sandwich capture can be looked up instead of tracked move by move.
+
+PATTERN_DIGITS = {"NONE": 0, "BLACK": 1, "RED": 2}
+DIGIT_COLORS = ("NONE", "BLACK", "RED")
+POSITION_WEIGHTS = tuple(3 ** position for position in range(9))
+NUM_PATTERNS = 3 ** 9
+
+# Weight of each square's digit within its row's and its column's pattern.
+ROW_PATTERN_WEIGHT = tuple(POSITION_WEIGHTS[col] for col in geometry.COL_OF)
+COL_PATTERN_WEIGHT = tuple(POSITION_WEIGHTS[row] for row in geometry.ROW_OF)
+
+
+def pattern_digit(pattern: int, position: int) -> int:
+    """Returns the digit (0 empty, 1 BLACK, 2 RED) at the given position of a line pattern."""
+    return pattern // POSITION_WEIGHTS[position] % 3
+
+
+def _side_captures(digits: tuple[int, ...], mover: int) -> tuple[int, ...]:
+    """
+    Given the digits leading away from a landing square, nearest first, returns the offsets (1 = adjacent) captured by
+    a mover of the given digit: a run of enemy pieces closed off by one of the mover's own.
+    """
+    run_length = 0
+    for digit in digits:
+        if digit == 0:
+            return ()
+        if digit == mover:
+            return tuple(range(1, run_length + 1))
+        run_length += 1
+    return ()
+
+
+def _build_capture_table() -> list[tuple[int, ...]]:
+    """
+    Builds CAPTURES so that CAPTURES[pattern * 9 + position] is the tuple of line positions captured when the piece at
+    position has just landed there. Combines one-sided results rather than scanning every full pattern.
+    """
+    table = [()] * (NUM_PATTERNS * 9)
+    interned = {(): ()}
+    for position in range(9):
+        left_width, right_width = position, 8 - position
+        for mover in (1, 2):
+            left_results = []
+            for left_pattern in range(3 ** left_width):
+                # Digit i of left_pattern is line position i; nearest first means walking down from position - 1.
+                digits = tuple(left_pattern // 3 ** i % 3 for i in range(left_width - 1, -1, -1))
+                left_results.append(tuple(position - offset for offset in _side_captures(digits, mover)))
+            right_results = []
+            for right_pattern in range(3 ** right_width):
+                digits = tuple(right_pattern // 3 ** i % 3 for i in range(right_width))
+                right_results.append(tuple(position + offset for offset in _side_captures(digits, mover)))
+            for left_pattern, left_captured in enumerate(left_results):
+                base = left_pattern + mover * POSITION_WEIGHTS[position]
+                for right_pattern, right_captured in enumerate(right_results):
+                    captured = left_captured + right_captured
+                    if captured:
+                        pattern = base + right_pattern * POSITION_WEIGHTS[position] * 3
+                        table[pattern * 9 + position] = interned.setdefault(captured, captured)
+    return table
+
+
+CAPTURES = _build_capture_table()
+
+
+def _build_threat_table() -> list[tuple[tuple[int, int, int], ...]]:
+    """
+    Builds THREATS so that THREATS[pattern] lists (position, digit, count) for every empty position where a piece of
+    the given digit landing would capture count pieces on that line.
+    """
+    table = []
+    for pattern in range(NUM_PATTERNS):
+        threats = []
+        for position in range(9):
+            if pattern_digit(pattern, position) != 0:
+                continue
+            for mover in (1, 2):
+                captured = CAPTURES[(pattern + mover * POSITION_WEIGHTS[position]) * 9 + position]
+                if captured:
+                    threats.append((position, mover, len(captured)))
+        table.append(tuple(threats))
+    return table
+
+
+THREATS = _build_threat_table()
@@ -1,11 +1,12 @@
 from hasami_shogi.src.model.capture_cluster import ClusterOpResult, Cluster, VertCapCluster, \
-    HorCapCluster, VerticalCluster, HorizontalCluster, CaptureCluster, VertTube, HorTube, ClusterUpdates
+    HorCapCluster, VerticalCluster, HorizontalCluster, CaptureCluster, ClusterUpdates
 from hasami_shogi.src.model.game_board import GameBoard
 
 
 class ClusterCollection:
     """
     Defines methods for maintaining a collection of clusters, including sub-collections indexed on member and border.
+    Every collection is a dict keyed on cluster_id, so adding or removing a reference is O(1).
     """
     H_TYPE = HorizontalCluster
     V_TYPE = VerticalCluster
@@ -16,9 +17,9 @@ class ClusterCollection:
 
         self.board: GameBoard = board
 
-        self.all_clusters: list[Cluster] = []
-        self.clusters_by_member: dict[str, list[Cluster]] = {}
-        self.clusters_by_border: dict[str, list[Cluster]] = {}
+        self.all_clusters: dict[int, Cluster] = {}
+        self.clusters_by_member: dict[int, dict[int, Cluster]] = {}
+        self.clusters_by_border: dict[int, dict[int, Cluster]] = {}
         self.initialize_all_clusters()
 
     def initialize_all_clusters(self) -> None:
@@ -29,39 +30,40 @@ class ClusterCollection:
 
     def initialize_clusters_by_member(self) -> None:
         """
-        Creates a dictionary keyed on each square of the board, containing a list of clusters in which that square is a
-        member.
+        Creates a dictionary keyed on each square of the board, containing the clusters (by id) in which that square is
+        a member.
         """
         self.clusters_by_member = {
-            square: [cluster for cluster in self.all_clusters if square in cluster]
+            square: {cluster_id: cluster for cluster_id, cluster in self.all_clusters.items() if square in cluster}
             for square in self.board.get_all_squares()
         }
 
     def initialize_clusters_by_border(self) -> None:
         """
-        Creates a dictionary keyed on each square of the board, containing a list of clusters in which that square is a
-        border.
+        Creates a dictionary keyed on each square of the board, containing the clusters (by id) in which that square is
+        a border.
         """
         self.clusters_by_border = {
-            border: [cluster for cluster in self.all_clusters if border in cluster.get_borders()]
+            border: {cluster_id: cluster for cluster_id, cluster in self.all_clusters.items()
+                     if border in cluster.get_borders()}
             for border in self.board.get_all_squares()
         }
 
-    def get_squares_by_member(self, square: str) -> set[str]:
+    def get_squares_by_member(self, square: int) -> set[int]:
         """
         Returns set of all squares that share a cluster with the given square.
         """
         output = set()
-        for cluster in self.clusters_by_member[square]:
+        for cluster in self.clusters_by_member[square].values():
             output |= cluster.squares
         return output
 
-    def get_squares_by_border(self, square: str) -> set[str]:
+    def get_squares_by_border(self, square: int) -> set[int]:
         """
         Returns set of all squares within any cluster that has given square as a border.
         """
         output = set()
-        for cluster in self.clusters_by_border[square]:
+        for cluster in self.clusters_by_border[square].values():
             output |= cluster.squares
         return output
 
@@ -69,21 +71,25 @@ class ClusterCollection:
         """
         Removes references of the given cluster from all collections.
         """
-        self.all_clusters and self.all_clusters.remove(cluster)
+        cluster_id = cluster.cluster_id
+        del self.all_clusters[cluster_id]
         for member in cluster.squares_sorted:
-            self.clusters_by_member[member].remove(cluster)
+            del self.clusters_by_member[member][cluster_id]
         for border in cluster.get_borders():
-            border and self.clusters_by_border[border].remove(cluster)
+            if border is not None:
+                del self.clusters_by_border[border][cluster_id]
 
     def add_to_all(self, cluster: Cluster) -> None:
         """
         Adds references of given cluster to all collections.
         """
-        self.all_clusters.append(cluster)
+        cluster_id = cluster.cluster_id
+        self.all_clusters[cluster_id] = cluster
         for member in cluster.squares:
-            self.clusters_by_member[member].append(cluster)
+            self.clusters_by_member[member][cluster_id] = cluster
         for border in cluster.get_borders():
-            border and self.clusters_by_border[border].append(cluster)
+            if border is not None:
+                self.clusters_by_border[border][cluster_id] = cluster
 
     def execute_removal(self, cluster_update: ClusterUpdates) -> None:
         """
@@ -92,10 +98,12 @@ class ClusterCollection:
         if cluster_update.remove_from_all:
             self.remove_from_all(cluster_update.cluster)
         else:
+            cluster_id = cluster_update.cluster.cluster_id
             for member in cluster_update.members:
-                self.clusters_by_member[member].remove(cluster_update.cluster)
+                del self.clusters_by_member[member][cluster_id]
             for border in cluster_update.borders:
-                border and self.clusters_by_border[border].remove(cluster_update.cluster)
+                if border is not None:
+                    del self.clusters_by_border[border][cluster_id]
 
     def execute_add(self, cluster_update: ClusterUpdates) -> None:
         """
@@ -104,18 +112,20 @@ class ClusterCollection:
         if cluster_update.add_to_all:
             self.add_to_all(cluster_update.cluster)
         else:
+            cluster = cluster_update.cluster
             for member in cluster_update.members:
-                self.clusters_by_member[member].append(cluster_update.cluster)
+                self.clusters_by_member[member][cluster.cluster_id] = cluster
             for border in cluster_update.borders:
-                border and self.clusters_by_border[border].append(cluster_update.cluster)
+                if border is not None:
+                    self.clusters_by_border[border][cluster.cluster_id] = cluster
 
-    def update_clusters_departing(self, square: str) -> None:
+    def update_clusters_departing(self, square: int) -> None:
         """
         Releases square from existing clusters. Uses results of release operation to update internal state.
         """
         results = ClusterOpResult()
 
-        for cluster in self.clusters_by_member[square]:
+        for cluster in self.clusters_by_member[square].values():
             results += cluster.release(square)
 
         for cluster_update in results.to_remove:
@@ -124,7 +134,7 @@ class ClusterCollection:
         for cluster_update in results.to_add:
             self.execute_add(cluster_update)
 
-    def update_clusters_arriving(self, square: str) -> None:
+    def update_clusters_arriving(self, square: int) -> None:
         """
         Creates new clusters for square and merges with existing clusters. Uses results of merge operations to
         update internal state.
@@ -132,8 +142,9 @@ class ClusterCollection:
         new_h_cluster = self.H_TYPE([square], self.board)
         new_v_cluster = self.V_TYPE([square], self.board)
 
-        h_merges = [cluster for cluster in self.clusters_by_border[square] if cluster.can_merge_with(new_h_cluster)]
-        v_merges = [cluster for cluster in self.clusters_by_border[square] if cluster.can_merge_with(new_v_cluster)]
+        bordering_clusters = self.clusters_by_border[square].values()
+        h_merges = [cluster for cluster in bordering_clusters if cluster.can_merge_with(new_h_cluster)]
+        v_merges = [cluster for cluster in bordering_clusters if cluster.can_merge_with(new_v_cluster)]
 
         results = new_h_cluster.merge_with_multiple(h_merges)
         results += new_v_cluster.merge_with_multiple(v_merges)
@@ -155,9 +166,9 @@ class CapClusterCollection(ClusterCollection):
 
     def __init__(self, *args, **kwargs):
 
-        self.clusters_by_color: dict[str, list[CaptureCluster]] = {}
-        self.vulnerable_clusters: dict[str, list[CaptureCluster]] = {}
-        self.captured_squares: set[str] = set()
+        self.clusters_by_color: dict[str, dict[int, CaptureCluster]] = {}
+        self.vulnerable_clusters: dict[str, dict[int, CaptureCluster]] = {}
+        self.captured_squares: set[int] = set()
 
         super().__init__(*args, **kwargs)
 
@@ -169,59 +180,61 @@ class CapClusterCollection(ClusterCollection):
         red_v_clusters = [self.V_TYPE([sq], self.board) for sq in red_squares]
         red_h_cluster = self.H_TYPE(sorted(list(red_squares)), self.board)
 
-        self.all_clusters = [black_h_cluster] + [red_h_cluster] + black_v_clusters + red_v_clusters
+        black_clusters = {cluster.cluster_id: cluster for cluster in [black_h_cluster] + black_v_clusters}
+        red_clusters = {cluster.cluster_id: cluster for cluster in [red_h_cluster] + red_v_clusters}
+
+        self.all_clusters = {**black_clusters, **red_clusters}
         self.initialize_clusters_by_member()
         self.initialize_clusters_by_border()
 
         self.clusters_by_color = {
-            "BLACK": [black_h_cluster] + black_v_clusters,
-            "RED": [red_h_cluster] + red_v_clusters
+            "BLACK": dict(black_clusters),
+            "RED": dict(red_clusters)
         }
 
         self.vulnerable_clusters = {
-            "BLACK": [],
-            "RED": []
+            "BLACK": {},
+            "RED": {}
         }
 
         self.captured_squares = set()
 
     def remove_from_all(self, cluster: CaptureCluster) -> None:
         super().remove_from_all(cluster)
-        self.clusters_by_color[cluster.color].remove(cluster)
+        del self.clusters_by_color[cluster.color][cluster.cluster_id]
         self.remove_vulnerable_cluster(cluster)
 
     def add_to_all(self, cluster: CaptureCluster) -> None:
         super().add_to_all(cluster)
-        self.clusters_by_color[cluster.color].append(cluster)
+        self.clusters_by_color[cluster.color][cluster.cluster_id] = cluster
 
-    def update_clusters_departing(self, square: str) -> None:
+    def update_clusters_departing(self, square: int) -> None:
         super().update_clusters_departing(square)
         self.update_vulnerable_clusters(square)
 
-    def update_clusters_arriving(self, square: str) -> None:
+    def update_clusters_arriving(self, square: int) -> None:
         super().update_clusters_arriving(square)
         self.update_vulnerable_clusters(square)
 
     def add_vulnerable_cluster(self, cluster: CaptureCluster) -> None:
-        if cluster not in self.vulnerable_clusters[cluster.color]:
-            self.vulnerable_clusters[cluster.color].append(cluster)
+        self.vulnerable_clusters[cluster.color][cluster.cluster_id] = cluster
 
     def remove_vulnerable_cluster(self, cluster: CaptureCluster) -> None:
-        if cluster in self.vulnerable_clusters[cluster.color]:
-            self.vulnerable_clusters[cluster.color].remove(cluster)
+        self.vulnerable_clusters[cluster.color].pop(cluster.cluster_id, None)
 
-    def update_vulnerable_clusters(self, square: str) -> None:
+    def update_vulnerable_clusters(self, square: int) -> None:
         """
         Given a square where a piece either left or arrived, updates currently vulnerable clusters.
         """
-        for cluster in self.clusters_by_border[square] + self.clusters_by_member[square]:
-            cluster.check_if_capturable()
-            if cluster.is_captured:
-                self.report_captured(cluster)
-            if cluster.risky_border:
-                self.add_vulnerable_cluster(cluster)
-            else:
-                self.remove_vulnerable_cluster(cluster)
+        for clusters in (self.clusters_by_border[square], self.clusters_by_member[square]):
+            for cluster in clusters.values():
+                cluster.check_if_capturable()
+                if cluster.is_captured:
+                    self.report_captured(cluster)
+                if cluster.risky_border is not None:
+                    self.vulnerable_clusters[cluster.color][cluster.cluster_id] = cluster
+                else:
+                    self.vulnerable_clusters[cluster.color].pop(cluster.cluster_id, None)
 
     def handle_captured_squares(self, captured_squares: list) -> None:
         """
@@ -230,9 +243,9 @@ class CapClusterCollection(ClusterCollection):
         """
         if len(captured_squares) <= 1:
             return None
-        large_cluster = [cluster for cluster in self.clusters_by_member[captured_squares[0]] if len(cluster) == len(
-            captured_squares)][0]
-        self.execute_removal(large_cluster)
+        large_cluster = [cluster for cluster in self.clusters_by_member[captured_squares[0]].values()
+                         if len(cluster) == len(captured_squares)][0]
+        self.remove_from_all(large_cluster)
 
     def report_captured(self, cluster: CaptureCluster) -> None:
         """
@@ -242,28 +255,3 @@ class CapClusterCollection(ClusterCollection):
 
     def clear_captures(self) -> None:
         self.captured_squares = set()
-
-
-class TubeCollection(ClusterCollection):
-    """
-    Implements ClusterCollection for a collection of Tubes (Clusters of color "NONE").
-    """
-    H_TYPE = HorTube
-    V_TYPE = VertTube
-
-    def initialize_all_clusters(self):
-        v_tubes = []
-        h_tubes = []
-
-        for col in [str(col_num) for col_num in range(1, 10)]:
-            col_squares = sorted(self.board.get_squares_by_axis(col)[1:-1])
-            v_tubes.append(self.V_TYPE(col_squares, self.board))
-
-        for row in [chr(row_num) for row_num in range(98, 105)]:
-            row_squares = sorted(self.board.get_squares_by_axis(row))
-            h_tubes.append(self.H_TYPE(row_squares, self.board))
-
-        self.all_clusters = h_tubes + v_tubes
-        self.initialize_clusters_by_member()
-        self.initialize_clusters_by_border()
-
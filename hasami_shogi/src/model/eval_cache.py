@@ -0,0 +1,86 @@
+from array import array
+
+from hasami_shogi.src.model.transposition_table import SCORE_SCALE, SCORE_OFFSET
+
+# Fixed-size cache of static evaluations, separate from the transposition table. Each entry is 16 bytes: a 64-bit check
+# word in one array('Q') and a 64-bit data word in another, the data word being the score * SCORE_SCALE offset by
+# SCORE_OFFSET and the check word the position key XOR the data word, as in the transposition table. Entries come in
+# two-way buckets, most recently used first: a hit in the second way swaps it to the front, and a store moves the front
+# entry back, evicting the least recently used of the two.
+#
+# The check word makes an entry whose two words were written by different threads at the same time read as a miss, so
+# AIPlayers searching in different threads, e.g. an AI and its pondering thread, can share one cache without locks.
+
+ENTRY_BYTES = 16
+DEFAULT_SIZE_MB = 4
+
+
+class EvaluationCache:
+    """
+    Defines a bounded cache of static evaluations keyed on position keys, with two-way buckets and least recently used
+    eviction. Counts hits and misses so the hit rate can be reported.
+    """
+
+    def __init__(self, size_mb: float):
+        """Allocates the largest power-of-two number of two-entry buckets that fits in the given size, at least one."""
+        num_buckets = 1
+        while num_buckets * 4 * ENTRY_BYTES <= size_mb * 2 ** 20:
+            num_buckets *= 2
+        self.num_entries: int = num_buckets * 2
+        self.bucket_mask: int = num_buckets - 1
+        self.checks = array("Q", bytes(8 * self.num_entries))
+        self.data = array("Q", bytes(8 * self.num_entries))
+        self.hits: int = 0
+        self.misses: int = 0
+        self.stores: int = 0
+
+    def __len__(self) -> int:
+        return self.num_entries
+
+    def get_size_bytes(self) -> int:
+        """Returns the memory held by the entries, in bytes."""
+        return self.num_entries * ENTRY_BYTES
+
+    def clear(self) -> None:
+        """Empties the cache and resets the counters."""
+        self.checks = array("Q", bytes(8 * self.num_entries))
+        self.data = array("Q", bytes(8 * self.num_entries))
+        self.hits = self.misses = self.stores = 0
+
+    def probe(self, key: int) -> float:
+        """Returns the score stored for the given key, or None if it is not cached."""
+        checks, data = self.checks, self.data
+        index = (key & self.bucket_mask) << 1
+        if checks[index] ^ data[index] == key:
+            self.hits += 1
+            return (data[index] - SCORE_OFFSET) / SCORE_SCALE
+        if checks[index + 1] ^ data[index + 1] == key:
+            self.hits += 1
+            score_data = data[index + 1]
+            checks[index], checks[index + 1] = checks[index + 1], checks[index]
+            data[index], data[index + 1] = data[index + 1], data[index]
+            return (score_data - SCORE_OFFSET) / SCORE_SCALE
+        self.misses += 1
+        return None
+
+    def store(self, key: int, score: float) -> None:
+        """Stores the score of the given key at the front of its bucket, moving the previous front entry back."""
+        checks, data = self.checks, self.data
+        index = (key & self.bucket_mask) << 1
+        score_data = round(score * SCORE_SCALE) + SCORE_OFFSET
+        if checks[index] ^ data[index] != key:
+            checks[index + 1], data[index + 1] = checks[index], data[index]
+        checks[index], data[index] = key ^ score_data, score_data
+        self.stores += 1
+
+    def get_stats(self) -> dict[str, float]:
+        """Returns the counters along with the cache size, e.g. for logging after a game."""
+        probes = self.hits + self.misses
+        return {
+            "entries": self.num_entries,
+            "size_bytes": self.get_size_bytes(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": self.hits / probes if probes else 0.0
+        }
@@ -1,11 +1,15 @@
+from collections.abc import KeysView
+
 import hasami_shogi.src.model.hasami_shogi_utilities as utils
+import hasami_shogi.src.model.board_geometry as geometry
+import hasami_shogi.src.model.capture_tables as capture_tables
 
 
 class GameBoard:
-    """Defines the methods for a Hasami Shogi game board. Used by HasamiShogiGame."""
+    """Defines the methods for a Hasami Shogi game board. Used by HasamiShogiGame. Squares are integers 0-80."""
 
-    RED_START = {'a1', 'a2', 'a3', 'a4', 'a5', 'a6', 'a7', 'a8', 'a9'}
-    BLACK_START = {'i1', 'i2', 'i3', 'i4', 'i5', 'i6', 'i7', 'i8', 'i9'}
+    RED_START = set(utils.AXIS_SQUARES[0])          # Row a
+    BLACK_START = set(utils.AXIS_SQUARES[8])        # Row i
 
     @staticmethod
     def opposite_color(color):
@@ -14,68 +18,112 @@ class GameBoard:
 
     @staticmethod
     def find_closest_corner(square):
-        """Finds the closest corner to the new square to check for corner capture."""
-        closest_corner = ""
-        row, col = square
-        if row in {"a", "b"}:
-            closest_corner += "a"
-        elif row in {"h", "i"}:
-            closest_corner += "i"
-        if col in {"1", "2"}:
-            closest_corner += "1"
-        elif col in {"8", "9"}:
-            closest_corner += "9"
-        return closest_corner
+        """Finds the closest corner to the new square to check for corner capture. Returns None if not near one."""
+        return geometry.CLOSEST_CORNER[square]
 
     def __init__(self):
         """
         Initializes a Hasami Shogi game board and sets player positions.
         """
-        self.square_values = {square: "NONE" for row in utils.BOARD for square in row} \
-            | {square: "RED" for square in GameBoard.RED_START} \
-            | {square: "BLACK" for square in GameBoard.BLACK_START}
+        self.square_values = ["NONE"] * 81
+        for square in GameBoard.RED_START:
+            self.square_values[square] = "RED"
+        for square in GameBoard.BLACK_START:
+            self.square_values[square] = "BLACK"
+        self.axis_occupancy: list[int] = []
+        self.axis_patterns: list[int] = []
+        self.pieces_by_color: dict[str, dict[int, None]] = {}
+        self.initialize_axes()
+        self.initialize_pieces()
+
+    def initialize_pieces(self) -> None:
+        """
+        Builds the squares held by each value (RED, BLACK and NONE), in board order. Each is a dict used as an ordered
+        set, so set_square can move a square between them in O(1) and readers get a read-only keys view.
+        """
+        self.pieces_by_color = {"RED": {}, "BLACK": {}, "NONE": {}}
+        for square in utils.ALL_SQUARES:
+            self.pieces_by_color[self.get_square(square)][square] = None
 
-    def get_square(self, square: str) -> str:
-        """Given a square string, returns the value at that square."""
+    def update_pieces(self, square: int, old_value: str, new_value: str) -> None:
+        """Moves the given square from the squares of its old value to those of its new value."""
+        del self.pieces_by_color[old_value][square]
+        self.pieces_by_color[new_value][square] = None
+
+    def initialize_axes(self) -> None:
+        """
+        Builds the 9-bit occupancy and the base-3 pattern of every row and column (axes 0-17). Position p of a row is
+        column p, position p of a column is row p. Kept up to date by set_square and used to index the sliding move
+        and capture tables.
+        """
+        self.axis_occupancy = [0] * 18
+        self.axis_patterns = [0] * 18
+        for square in utils.ALL_SQUARES:
+            self.update_axes(square, "NONE", self.get_square(square))
+
+    def update_axes(self, square: int, old_value: str, new_value: str) -> None:
+        """Updates the occupancy and pattern of the given square's row and column for a change of its value."""
+        row_axis, col_axis = geometry.ROW_AXIS_OF[square], geometry.COL_AXIS_OF[square]
+        if (old_value == "NONE") != (new_value == "NONE"):
+            self.axis_occupancy[row_axis] ^= geometry.ROW_BIT[square]
+            self.axis_occupancy[col_axis] ^= geometry.COL_BIT[square]
+        digit_change = capture_tables.PATTERN_DIGITS[new_value] - capture_tables.PATTERN_DIGITS[old_value]
+        self.axis_patterns[row_axis] += digit_change * capture_tables.ROW_PATTERN_WEIGHT[square]
+        self.axis_patterns[col_axis] += digit_change * capture_tables.COL_PATTERN_WEIGHT[square]
+
+    def get_square(self, square: int) -> str:
+        """Given a square, returns the value at that square."""
         return self.square_values[square]
 
-    def set_square(self, square: str, square_value: str) -> None:
+    def set_square(self, square: int, square_value: str) -> None:
         """Sets the value of the given square to the given value."""
-        if square not in self.square_values or square_value not in {"RED", "BLACK", "NONE"}:
+        if square not in utils.ALL_SQUARES or square_value not in {"RED", "BLACK", "NONE"}:
             return None
+        old_value = self.square_values[square]
+        self.update_axes(square, old_value, square_value)
+        self.update_pieces(square, old_value, square_value)
         self.square_values[square] = square_value
 
-    def get_squares_by_color(self, seeking_color: str) -> set[str]:
+    def get_squares_by_color(self, seeking_color: str) -> KeysView[int]:
         """
-        Returns set of squares belonging to the given color.
+        Returns a read-only, set-like view of the squares belonging to the given color (or NONE for empty squares).
+        O(1); the view follows later changes to the board, so copy it to keep a snapshot.
         """
-        return {square for square, color in self.square_values.items() if color == seeking_color}
+        return self.pieces_by_color[seeking_color].keys()
+
+    def get_num_pieces(self, color: str) -> int:
+        """Returns the number of pieces of the given color on the board. O(1)"""
+        return len(self.pieces_by_color[color])
 
-    def get_squares_by_axis(self, axis: str) -> list[str]:
+    def get_squares_by_axis(self, axis: int) -> list[int]:
         """
-        Returns list of all squares in the given row or column.
+        Returns list of all squares in the given axis (0-8 for rows a-i, 9-17 for columns 1-9).
         """
-        return [square for square in self.square_values.keys() if axis in square]
+        return list(utils.AXIS_SQUARES[axis])
 
-    def get_occupied_squares_by_axis(self, axis: str) -> list[str]:
+    def get_occupied_squares_by_axis(self, axis: int) -> list[int]:
         """
         Returns sorted list of all squares that are occupied in the given row or column.
         """
-        return [square for square, value in self.square_values.items() if axis in square and value != "NONE"]
+        return [square for square in utils.AXIS_SQUARES[axis] if self.square_values[square] != "NONE"]
 
-    def get_free_squares_by_axis(self, axis: str) -> list[str]:
+    def get_free_squares_by_axis(self, axis: int) -> list[int]:
         """
         Returns sorted list of all squares that are free in the given row or column.
         """
-        return [square for square, value in self.square_values.items() if axis in square and value == "NONE"]
+        return [square for square in utils.AXIS_SQUARES[axis] if self.square_values[square] == "NONE"]
 
-    def get_all_squares(self) -> set[str]:
-        """Returns all possible squares of board as a set of square strings."""
-        return set(self.square_values.keys())
+    def get_adjacent_squares_by_color(self, square: int, color: str) -> set[int]:
+        """Returns the squares directly adjacent to the given square that hold the given value."""
+        return {adjacent for adjacent in geometry.NEIGHBOURS[square] if self.square_values[adjacent] == color}
+
+    def get_all_squares(self) -> set[int]:
+        """Returns all possible squares of board as a set."""
+        return set(utils.ALL_SQUARES)
 
     def get_board_list(self) -> list[list[str]]:
         """Returns the board as a list of lists of square values."""
-        return [[self.get_square(square) for square in row] for row in utils.BOARD]
+        return [[self.get_square(square) for square in row] for row in utils.BOARD_INDICES]
 
     def print_board(self) -> None:
         """Prints the current board with row/column labels. Abbreviates RED and BLACK and replaces NONE with '.'. """
@@ -93,10 +141,9 @@ class GameBoard:
         """
         Returns the current RED and BLACK squares as a string.
         """
-        red_list = sorted(list(self.get_squares_by_color("RED")))
-        black_list = sorted(list(self.get_squares_by_color("BLACK")))
+        red_list = [utils.square_name(square) for square in sorted(self.get_squares_by_color("RED"))]
+        black_list = [utils.square_name(square) for square in sorted(self.get_squares_by_color("BLACK"))]
         red_list.insert(0, "r")
         black_list.insert(0, "b")
         red_list.extend(black_list)
         return "".join(red_list)
-
@@ -1,6 +1,11 @@
 from hasami_shogi.src.model.game_board import GameBoard
-from hasami_shogi.src.model.cluster_collection import CapClusterCollection, TubeCollection
+from hasami_shogi.src.model.cluster_collection import CapClusterCollection
 import hasami_shogi.src.model.hasami_shogi_utilities as utils
+import hasami_shogi.src.model.zobrist as zobrist
+import hasami_shogi.src.model.symmetry as symmetry
+import hasami_shogi.src.model.board_geometry as geometry
+import hasami_shogi.src.model.move_tables as move_tables
+import hasami_shogi.src.model.capture_tables as capture_tables
 
 
 class ShogiMove:
@@ -8,30 +13,47 @@ class ShogiMove:
 
     def __init__(self):
         self.player: str = ""
-        self.move: str = ""
+        self.move: tuple[int, int] = ()
         self.cap_color: str = ""
-        self.cap_squares: list[str] = []
+        self.cap_squares: list[int] = []
 
     def __repr__(self) -> str:
-        output = self.move
-        output += f" CAPTURED {self.cap_squares}, color {self.cap_color}" if self.cap_squares else ""
+        output = utils.move_to_string(self.move)
+        output += f" CAPTURED {[utils.square_name(square) for square in self.cap_squares]}, color {self.cap_color}" \
+            if self.cap_squares else ""
         return output
 
 
 class HasamiShogiGame:
-    """Defines the methods for a game of Hasami Shogi."""
+    """Defines the methods for a game of Hasami Shogi. Squares are integers 0-80; make_move also accepts the public
+    square string notation, e.g. make_move("i5", "e5")."""
 
-    def __init__(self):
+    REPETITION_LIMIT = 3            # Occurrences of the same position, same player to move, that draw the game
+    MAX_MOVES = 300                 # Moves by either player after which the game is drawn
+
+    def __init__(self, board_type: type = GameBoard, track_clusters: bool = False,
+                 repetition_limit: int = REPETITION_LIMIT, max_moves: int = MAX_MOVES):
         """Creates a new board, sets game state to UNFINISHED,
-        active player to BLACK, captured pieces to 0."""
-        self._game_board: GameBoard = GameBoard()
-        self._game_state: str = "UNFINISHED"                        # UNFINISHED, RED_WON, BLACK_WON
+        active player to BLACK, captured pieces to 0. board_type selects the board class, GameBoard or a subclass.
+        Captures are found with the line capture tables, so CaptureClusters are only maintained if track_clusters is
+        set.
+        The game is drawn when a position occurs for the repetition_limit-th time or after max_moves moves; None turns
+        either rule off."""
+        self._game_board: GameBoard = board_type()
+        self._game_state: str = "UNFINISHED"                        # UNFINISHED, RED_WON, BLACK_WON, DRAW
         self._active_player: str = "BLACK"                          # BLACK, RED
         self._inactive_player: str = "RED"                          # BLACK, RED
         self._captured_pieces: dict[str, int] = {"RED": 0, "BLACK": 0}
         self.move_log: list[ShogiMove] = []
-        self.clusters = CapClusterCollection(board=self._game_board)
-        self.tubes = TubeCollection(board=self._game_board)
+        self.clusters = CapClusterCollection(board=self._game_board) if track_clusters else None
+        self._zobrist_key: int = zobrist.compute_hash(self._game_board, self._active_player)
+        self._mirror_key: int = zobrist.compute_hash(self._game_board, self._active_player, symmetry.MIRROR)
+        self.repetition_limit: int = repetition_limit
+        self.max_moves: int = max_moves
+        self._position_counts: dict[int, int] = {self._zobrist_key: 1}   # Zobrist key -> occurrences in the game
+        self._center_sums: dict[str, int] = {color: sum(geometry.CENTER_WEIGHT[square] for square in
+                                                        self._game_board.get_squares_by_color(color))
+                                             for color in ("RED", "BLACK", "NONE")}
 
     def get_game_board(self) -> GameBoard:
         """Returns the game board object."""
@@ -45,6 +67,57 @@ class HasamiShogiGame:
         """Sets the game state to the given value."""
         self._game_state = game_state
 
+    @property
+    def zobrist_key(self) -> int:
+        """64-bit Zobrist key of the current board and side to move. Updated in O(1) on every change."""
+        return self._zobrist_key
+
+    def get_symmetric_key(self) -> tuple[int, int]:
+        """
+        Returns (key, transform): the smallest Zobrist key among the current position's images under the symmetry
+        transforms, which all its images share, and the transform whose image has it, which maps moves to that image
+        and back. Tables store positions under this key so equivalent positions share one entry. The flipped images'
+        keys are the board keys with their halves swapped (see zobrist.PIECE_KEYS), with the other side to move.
+        """
+        own_side = zobrist.RED_TO_MOVE_KEY if self._active_player == "RED" else 0
+        swapped_side = own_side ^ zobrist.RED_TO_MOVE_KEY
+        board_key, mirror_board_key = self._zobrist_key ^ own_side, self._mirror_key ^ own_side
+        keys = (self._zobrist_key, self._mirror_key,
+                zobrist.swap_halves(board_key) ^ swapped_side, zobrist.swap_halves(mirror_board_key) ^ swapped_side)
+        key = min(keys)
+        return key, keys.index(key)
+
+    def get_symmetric_board_key(self) -> tuple[int, int]:
+        """
+        Returns (key, transform) like get_symmetric_key, for the board alone: the key is the same whichever player is
+        to move. A transform that swaps the colors turns one color's score into the other's.
+        """
+        own_side = zobrist.RED_TO_MOVE_KEY if self._active_player == "RED" else 0
+        board_key, mirror_board_key = self._zobrist_key ^ own_side, self._mirror_key ^ own_side
+        keys = (board_key, mirror_board_key, zobrist.swap_halves(board_key), zobrist.swap_halves(mirror_board_key))
+        key = min(keys)
+        return key, keys.index(key)
+
+    def is_mirror_symmetric(self) -> bool:
+        """Returns True if the current position is its own mirror image, so mirrored moves are equivalent."""
+        return self._mirror_key == self._zobrist_key
+
+    def get_draw_rules(self) -> dict[str, int]:
+        """Returns the repetition_limit and max_moves of the game, as keyword arguments for a replica's constructor."""
+        return {"repetition_limit": self.repetition_limit, "max_moves": self.max_moves}
+
+    def get_position_count(self) -> int:
+        """Returns how many times the current position has occurred in the game, this time included."""
+        return self._position_counts.get(self._zobrist_key, 0)
+
+    def is_repetition(self) -> bool:
+        """Returns True if a repetition rule is in force and the current position occurred earlier in the game."""
+        return bool(self.repetition_limit) and self._position_counts.get(self._zobrist_key, 0) > 1
+
+    def get_center_sum(self, color: str) -> int:
+        """Returns the sum of the center weights of the given color's squares. Updated in O(1) on every change."""
+        return self._center_sums[color]
+
     def get_active_player(self) -> str:
         """Returns the current player."""
         return self._active_player
@@ -52,6 +125,8 @@ class HasamiShogiGame:
     def toggle_active_player(self) -> None:
         """Switches the active player to the other color."""
         self._active_player, self._inactive_player = self._inactive_player, self._active_player
+        self._zobrist_key ^= zobrist.RED_TO_MOVE_KEY
+        self._mirror_key ^= zobrist.RED_TO_MOVE_KEY
 
     def get_num_captured_pieces(self, player_color: str) -> int:
         """Returns the number of captured pieces of the given color."""
@@ -61,83 +136,96 @@ class HasamiShogiGame:
         """Adds the given number to the captured pieces of the given color."""
         self._captured_pieces[player_color] += num_captured
 
-    def get_square_occupant(self, square_string: str) -> str:
+    def get_square_occupant(self, square: int) -> str:
         """Returns the value at the given square on the board: RED, BLACK, or NONE."""
-        return self.get_game_board().get_square(square_string)
+        return self.get_game_board().get_square(square)
 
-    def set_square_occupant(self, square_string: str, value: str) -> None:
+    def set_square_occupant(self, square: int, value: str) -> None:
         """Sets the occupant at the given square to the given value."""
-        old_value = self.get_square_occupant(square_string)
-        self.get_game_board().set_square(square_string, value)
+        old_value = self.get_square_occupant(square)
+        self.get_game_board().set_square(square, value)
+        value = self.get_square_occupant(square)
+        self._zobrist_key ^= zobrist.PIECE_KEYS[old_value][square] ^ zobrist.PIECE_KEYS[value][square]
+        self._mirror_key ^= zobrist.MIRROR_PIECE_KEYS[old_value][square] ^ zobrist.MIRROR_PIECE_KEYS[value][square]
+        center_sums, weight = self._center_sums, geometry.CENTER_WEIGHT[square]
+        center_sums[old_value] -= weight
+        center_sums[value] += weight
+        if self.clusters is None:
+            return None
         if old_value != "NONE":
-            self.clusters.update_clusters_departing(square_string)
-        else:
-            self.tubes.update_clusters_departing(square_string)
+            self.clusters.update_clusters_departing(square)
         if value != "NONE":
-            self.clusters.update_clusters_arriving(square_string)
-        else:
-            self.tubes.update_clusters_arriving(square_string)
+            self.clusters.update_clusters_arriving(square)
 
-    def set_square_occupants(self, list_of_squares: list[str], value: str) -> None:
+    def set_square_occupants(self, list_of_squares: list[int], value: str) -> None:
         """
         Sets each square in the given list to the given value.
         """
         for square in list_of_squares:
             self.set_square_occupant(square, value)
 
-    def execute_move(self, moving_from: str, moving_to: str) -> None:
+    def execute_move(self, moving_from: int, moving_to: int) -> None:
         """(Blindly) moves the piece at the first position to the second position."""
         piece_moving = self.get_square_occupant(moving_from)
         self.set_square_occupant(moving_from, "NONE")
         self.set_square_occupant(moving_to, piece_moving)
 
-    def path_is_clear(self, moving_from: str, moving_to: str) -> bool:
-        return any(moving_to in tube for tube in self.tubes.clusters_by_border[moving_from])
+    def path_is_clear(self, moving_from: int, moving_to: int) -> bool:
+        """Returns True if the piece at the first square can slide to the second. O(1) table lookup."""
+        return moving_to in self.get_reachable_squares(moving_from)
 
-    def is_move_legal(self, moving_from: str, moving_to: str) -> bool:
+    def is_move_legal(self, moving_from: int, moving_to: int) -> bool:
         """Checks if move from first square to second is legal. Returns True if so, False if not."""
         return self.get_game_state() == "UNFINISHED"\
-            and moving_from in self.get_game_board().get_all_squares()\
-            and moving_to in self.get_game_board().get_all_squares()\
+            and moving_from in utils.ALL_SQUARES\
+            and moving_to in utils.ALL_SQUARES\
             and self.get_square_occupant(moving_from) == self.get_active_player()\
             and utils.move_is_straight(moving_from, moving_to)\
             and moving_from != moving_to\
             and self.path_is_clear(moving_from, moving_to)
 
-    def check_linear_captures(self, moved_to: str) -> list[str]:
-        """Searches four directions around latest move, captures pieces, and updates capture counts."""
-        if type(moved_to) != str and len(moved_to) != 2:
-            raise ValueError(f"check_linear_captures needs a 2-character square string. moved_to = {moved_to}")
-
-        capture_list = list(self.clusters.captured_squares)
-        self.clusters.clear_captures()
-        return capture_list
+    def check_linear_captures(self, moved_to: int) -> list[int]:
+        """Returns the pieces sandwiched along the row and column of the latest move, read from the line capture
+        tables."""
+        if moved_to not in utils.ALL_SQUARES:
+            raise ValueError(f"check_linear_captures needs a square from 0 to 80. moved_to = {moved_to}")
+
+        patterns = self._game_board.axis_patterns
+        row_axis, col_axis = geometry.ROW_AXIS_OF[moved_to], geometry.COL_AXIS_OF[moved_to]
+        row_squares, col_squares = geometry.AXIS_SQUARES[row_axis], geometry.AXIS_SQUARES[col_axis]
+        row_captures = capture_tables.CAPTURES[patterns[row_axis] * 9 + geometry.COL_OF[moved_to]]
+        col_captures = capture_tables.CAPTURES[patterns[col_axis] * 9 + geometry.ROW_OF[moved_to]]
+        return [row_squares[position] for position in row_captures] \
+            + [col_squares[position] for position in col_captures]
+
+    def get_capture_threats(self, color: str) -> dict[int, int]:
+        """
+        Returns {square: num_captured} for every empty square that, if taken by the given color, would sandwich enemy
+        pieces along its row or column. Reads one threat table entry per row and column.
+        """
+        digit = capture_tables.PATTERN_DIGITS[color]
+        output = {}
+        for axis, pattern in enumerate(self._game_board.axis_patterns):
+            for position, mover, num_captured in capture_tables.THREATS[pattern]:
+                if mover == digit:
+                    square = geometry.AXIS_SQUARES[axis][position]
+                    output[square] = output.get(square, 0) + num_captured
+        return output
 
-    def check_corner_capture(self, moved_to: str) -> list[str]:
+    def check_corner_capture(self, moved_to: int) -> list[int]:
         """Checks for a capture in the corner. Removes enemy piece in corner. Must occur after linear check for
         correct prev move data update."""
-        capture_scenarios = {
-            # Key is the captured piece, lists are capturing positions.
-            "a1": ["a2", "b1"],
-            "a9": ["a8", "b9"],
-            "i1": ["h1", "i2"],
-            "i9": ["h9", "i8"]
-        }
-
-        closest_corner = GameBoard.find_closest_corner(moved_to)
-        capturing_squares = capture_scenarios.get(closest_corner, [])
-        if moved_to not in capturing_squares:
+        corner_capture = geometry.CORNER_CAPTURES[moved_to]
+        if corner_capture is None:
             return []
 
-        moved_to_index = capturing_squares.index(moved_to)
-        capture_partner = capturing_squares[moved_to_index - 1]
-
+        capture_partner, corner = corner_capture
         corner_captured = self.get_square_occupant(capture_partner) == self._active_player and \
-            self.get_square_occupant(closest_corner) == self._inactive_player
+            self.get_square_occupant(corner) == self._inactive_player
 
-        return [closest_corner] if corner_captured else []
+        return [corner] if corner_captured else []
 
-    def handle_captured_pieces(self, captured_squares: list[str]) -> None:
+    def handle_captured_pieces(self, captured_squares: list[int]) -> None:
         """
         Captures the given list of squares, updating score and board state.
         """
@@ -162,17 +250,23 @@ class HasamiShogiGame:
             self.set_game_state("RED_WON")
 
     def make_move(self, moving_from: str, moving_to: str) -> bool:
+        """Takes a move in square string notation. If move is legal, executes and returns True. Else False."""
+        if moving_from not in utils.SQUARE_INDEX or moving_to not in utils.SQUARE_INDEX:
+            return False
+        return self.make_move_by_index(utils.SQUARE_INDEX[moving_from], utils.SQUARE_INDEX[moving_to])
+
+    def make_move_by_index(self, moving_from: int, moving_to: int) -> bool:
         """If move is legal, executes and returns True. Else False."""
 
         # Check if move is legal and execute
         if not self.is_move_legal(moving_from, moving_to):
             return False
-        self.clusters.clear_captures()
+        self.clusters is not None and self.clusters.clear_captures()
         self.execute_move(moving_from, moving_to)
 
         # Add to move log
         self.move_log.append(ShogiMove())
-        self.move_log[-1].move = moving_from + moving_to
+        self.move_log[-1].move = (moving_from, moving_to)
         self.move_log[-1].player = self._active_player
 
         # Check and execute captures
@@ -182,29 +276,98 @@ class HasamiShogiGame:
 
         self.check_win()
         self.toggle_active_player()
+        self.count_position()
         return True
 
+    def count_position(self) -> None:
+        """
+        Counts an occurrence of the current position, just reached by a move, and draws an unfinished game if that
+        makes repetition_limit occurrences or the move log has reached max_moves.
+        """
+        key = self._zobrist_key
+        count = self._position_counts.get(key, 0) + 1
+        self._position_counts[key] = count
+        if self._game_state == "UNFINISHED" and (self.repetition_limit and count >= self.repetition_limit
+                                                 or self.max_moves and len(self.move_log) >= self.max_moves):
+            self._game_state = "DRAW"
+
     def undo_move(self) -> None:
         """Undoes the last move. References last move in self.move_log. Force executes last move in reverse, returns
         any captured pieces, toggles active player, and resets prev move to None. Can only undo up to one move."""
         if not self.move_log:
             return None
 
+        counts, key = self._position_counts, self._zobrist_key
+        count = counts[key] - 1
+        if count:
+            counts[key] = count
+        else:
+            del counts[key]
         prev_move = self.move_log.pop()
         self._game_state = "UNFINISHED"  # Safe to assume game state was unfinished if move was made
         self.toggle_active_player()  # Assume undo occurs after player switch
-        self.execute_move(prev_move.move[2:], prev_move.move[:2])
+        self.execute_move(prev_move.move[1], prev_move.move[0])
         self.set_square_occupants(prev_move.cap_squares, prev_move.cap_color)
         prev_move.cap_color and self.add_num_captured_pieces(prev_move.cap_color, -len(prev_move.cap_squares))
 
         return None
 
-    def get_reachable_squares(self, square: str) -> set[str]:
-        return self.tubes.get_squares_by_border(square)
+    def set_position(self, pieces: dict[str, list[int]], active_player: str) -> None:
+        """
+        Sets up a position from {color: squares} for RED and BLACK with the given player to move, e.g. to analyse it.
+        The move log and position counts are cleared, each color's captured count is however many of its 9 pieces are
+        missing, and the game state is checked as if the position was reached in play.
+        """
+        for color in ("RED", "BLACK"):
+            self.set_square_occupants(list(self._game_board.get_squares_by_color(color)), "NONE")
+        for color, squares in pieces.items():
+            self.set_square_occupants(list(squares), color)
+        self.move_log = []
+        self._captured_pieces = {color: 9 - self._game_board.get_num_pieces(color) for color in ("RED", "BLACK")}
+        if active_player != self._active_player:
+            self.toggle_active_player()
+        self._position_counts = {self._zobrist_key: 1}
+        self._game_state = "UNFINISHED"
+        self.check_win()
+
+    def get_move_history(self) -> list[tuple[int, int]]:
+        """Returns the moves made so far as (from, to) tuples, oldest first."""
+        return [entry.move for entry in self.move_log]
 
-    def return_valid_moves(self, square_string: str) -> set[str]:
-        """Returns all valid moves for the given square. O(1)"""
-        if self.get_square_occupant(square_string) != self.get_active_player():
-            raise Exception("Given square string is not active player.")
+    def set_move_history(self, history: list[tuple[int, int]]) -> bool:
+        """
+        Brings a game started from the initial position to the position after the given moves, undoing only the moves
+        that differ from its own. Used to keep replicas of a game in step with it. Returns True if the position changed.
+        """
+        common = 0
+        for entry, move in zip(self.move_log, history):
+            if entry.move != move:
+                break
+            common += 1
+        if common == len(self.move_log) == len(history):
+            return False
+        while len(self.move_log) > common:
+            self.undo_move()
+        for move in history[common:]:
+            self.make_move_by_index(*move)
+        return True
 
-        return {f"{square_string}{dest}" for dest in self.get_reachable_squares(square_string)}
+    def get_reachable_squares(self, square: int) -> tuple[int, ...]:
+        """Returns the empty squares a piece on the given square can slide to, read from the sliding move tables."""
+        occupancy = self._game_board.axis_occupancy
+        return move_tables.ROW_SLIDES[square][occupancy[geometry.ROW_AXIS_OF[square]]] \
+            + move_tables.COL_SLIDES[square][occupancy[geometry.COL_AXIS_OF[square]]]
+
+    def get_blocking_squares(self, square: int) -> tuple[int, ...]:
+        """Returns the nearest occupied square in each direction from the given square, i.e. the pieces that could
+        slide onto it."""
+        occupancy = self._game_board.axis_occupancy
+        return move_tables.ROW_BLOCKERS[square][occupancy[geometry.ROW_AXIS_OF[square]]] \
+            + move_tables.COL_BLOCKERS[square][occupancy[geometry.COL_AXIS_OF[square]]]
+
+    def return_valid_moves(self, square: int) -> set[tuple[int, int]]:
+        """Returns all valid moves for the given square as (from, to) tuples. O(1)"""
+        if self.get_square_occupant(square) != self.get_active_player():
+            raise Exception("Given square is not active player.")
+
+        return {(square, dest) for dest in self.get_reachable_squares(square)}
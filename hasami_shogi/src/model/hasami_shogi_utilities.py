@@ -1,3 +1,6 @@
+import hasami_shogi.src.model.board_geometry as geometry
+
+
 def bi_dict(dictionary):
     """Given a dictionary, adds all values as keys and their keys as values. Does not work if values are mutable."""
     temp_dict = dict(dictionary)
@@ -16,15 +19,27 @@ all_squares_in_order = [row + col for row in row_num for col in col_num]
 bi_dict(row_num)
 bi_dict(col_num)
 all_squares = set(all_squares_in_order)
+
+# The model works on integer squares 0-80, numbered row by row: a1 = 0, a9 = 8, b1 = 9, ..., i9 = 80.
+SQUARE_NAMES = tuple(all_squares_in_order)
+SQUARE_INDEX = {square_string: square for square, square_string in enumerate(SQUARE_NAMES)}
+ALL_SQUARES = range(81)
+BOARD_INDICES = [list(geometry.AXIS_SQUARES[row]) for row in range(9)]
+
+# An axis is a whole row or column: axes 0-8 are rows a-i, axes 9-17 are columns 1-9.
+ROW_AXES = range(9)
+COL_AXES = range(9, 18)
+AXIS_SQUARES = geometry.AXIS_SQUARES
+
 CORNER_CAP_PIECES = {
-    'a2': 'b1',
-    'b1': 'a2',
-    'a8': 'b9',
-    'b9': 'a8',
-    'h1': 'i2',
-    'i2': 'h1',
-    'h9': 'i8',
-    'i8': 'h9'
+    1: 9,
+    9: 1,
+    7: 17,
+    17: 7,
+    63: 73,
+    73: 63,
+    71: 79,
+    79: 71
 }
 
 
@@ -43,13 +58,33 @@ def string_to_index(square_string):
     return row_num[square_string[0]], col_num[square_string[1]]
 
 
+def square_index(square_string: str) -> int:
+    """Converts a square string to its integer square. Assumes valid input."""
+    return SQUARE_INDEX[square_string]
+
+
+def square_name(square: int) -> str:
+    """Converts an integer square to its square string. Assumes valid input."""
+    return SQUARE_NAMES[square]
+
+
+def move_to_string(move: tuple[int, int]) -> str:
+    """Converts a (from, to) integer move to its 4-character string, e.g. (76, 40) -> 'i5e5'."""
+    return SQUARE_NAMES[move[0]] + SQUARE_NAMES[move[1]]
+
+
+def string_to_move(move_string: str) -> tuple[int, int]:
+    """Converts a 4-character move string to a (from, to) integer move. Assumes valid input."""
+    return SQUARE_INDEX[move_string[:2]], SQUARE_INDEX[move_string[2:]]
+
+
 def get_game_pieces(game):
     """Given a game, returns a {'color': {square string set}} dictionary. Does not contain empty squares."""
     output = {"RED": set(), "BLACK": set()}
-    for square in all_squares_in_order:
+    for square in ALL_SQUARES:
         square_occupant = game.get_square_occupant(square)
         if square_occupant in output:
-            output[square_occupant].add(square)
+            output[square_occupant].add(SQUARE_NAMES[square])
     return output
 
 
@@ -67,50 +102,37 @@ def get_piece_color(game_piece_dict, piece):
     return None
 
 
-def get_adjacent_squares(square_string):
-    """Returns all directly adjacent pieces of the given square string."""
-    row, col = string_to_index(square_string)
-    poss_rows = row+1, row-1
-    poss_cols = col+1, col-1
-    return {index_to_string(x, col) for x in poss_rows if 0<=x<9} | {index_to_string(row, y) for y in poss_cols if 0<=y<9}
+def get_adjacent_squares(square):
+    """Returns a tuple of all directly adjacent squares of the given square. O(1) table read."""
+    return geometry.NEIGHBOURS[square]
 
 
-def get_next_square(square_string1, square_string2):
-    """Given two adjacent square strings, gives the next square in a line. Returns None if off board. Assumes valid input."""
-    if not square_string1 or not square_string2:
+def get_next_square(square1, square2):
+    """Given two adjacent squares, gives the next square in a line. Returns None if off board. O(1) table read."""
+    if square1 is None or square2 is None:
         return None
-    (row1, col1), (row2, col2) = string_to_index(square_string1), string_to_index(square_string2)
-    row_dir, col_dir = row2 - row1, col2 - col1
-    next_row, next_col = row2 + row_dir, col2 + col_dir
-    if 0 <= next_row < 9 and 0 <= next_col < 9:
-        return index_to_string(next_row, next_col)
-    return None
+    return geometry.NEXT_SQUARE[square1][square2]
 
 
 def move_is_straight(moving_from, moving_to):
     """
     Returns whether the given move is pure horizontal/vertical.
     """
-    return moving_from[0] == moving_to[0] or moving_from[1] == moving_to[1]
+    return geometry.ROW_OF[moving_from] == geometry.ROW_OF[moving_to] \
+        or geometry.COL_OF[moving_from] == geometry.COL_OF[moving_to]
+
+
+def build_square_range(square_from, square_to):
+    """Returns list of squares from first square to second, inclusive. Range cannot be diagonal."""
+    if square_from is None or square_to is None:
+        return None
+    square_range = geometry.SQUARE_RANGES[square_from][square_to]
+    return list(square_range) if square_range is not None else None
 
 
 def build_square_string_range(square_string_from, square_string_to):
     """Returns list of square strings from first square to second. Range cannot be diagonal. Assumes valid input."""
     if not square_string_from or not square_string_to:
         return None
-
-    if square_string_from[0] != square_string_to[0] and square_string_from[1] != square_string_to[1]:
-        return None
-
-    # 1. Convert square strings to indices.
-    row_from, col_from = string_to_index(square_string_from)
-    row_to, col_to = string_to_index(square_string_to)
-
-    # 2. Generate ranges. There should be exactly one range of length 0.
-    row_min, row_max = min(row_to, row_from), max(row_to, row_from)
-    col_min, col_max = min(col_to, col_from), max(col_to, col_from)
-    row_range, col_range = range(row_min, row_max + 1), range(col_min, col_max + 1)
-
-    # 3. Generate list of square strings from ranges. Reverse output if necessary.
-    output_range = [index_to_string(row, col) for row in row_range for col in col_range]
-    return output_range if row_from <= row_to and col_from <= col_to else output_range[::-1]
+    square_range = build_square_range(SQUARE_INDEX[square_string_from], SQUARE_INDEX[square_string_to])
+    return [SQUARE_NAMES[square] for square in square_range] if square_range is not None else None
@@ -0,0 +1,77 @@
+import hasami_shogi.src.model.board_geometry as geometry
+
+# Sliding move tables keyed on (position in line, 9-bit line occupancy), built once at import. A line is a row or
+# column; bit p of an occupancy is set when position p of that line is occupied (column for rows, row for columns).
+# The bit of the moving piece itself is ignored, so the tables can be read before or after it is placed.
+
+LINE_POSITIONS = range(9)
+OCCUPANCIES = range(512)
+
+
+def _slide_mask(position: int, occupancy: int) -> int:
+    """Returns the mask of line positions a piece at the given position can slide to."""
+    output = 0
+    for step in (-1, 1):
+        target = position + step
+        while 0 <= target < 9 and not occupancy & (1 << target):
+            output |= 1 << target
+            target += step
+    return output
+
+
+def _first_blockers(position: int, occupancy: int) -> tuple[int, ...]:
+    """Returns the positions of the nearest occupied square on each side of the given position."""
+    output = []
+    for step in (-1, 1):
+        target = position + step
+        while 0 <= target < 9:
+            if occupancy & (1 << target):
+                output.append(target)
+                break
+            target += step
+    return tuple(output)
+
+
+# MASK_POSITIONS[mask] is the tuple of positions set in a 9-bit mask.
+MASK_POSITIONS = tuple(tuple(position for position in LINE_POSITIONS if mask & (1 << position)) for mask in OCCUPANCIES)
+
+# SLIDE_MASKS[position][occupancy] is the 9-bit mask of positions reachable by sliding along the line.
+SLIDE_MASKS = tuple(tuple(_slide_mask(position, occupancy) for occupancy in OCCUPANCIES) for position in LINE_POSITIONS)
+
+# BLOCKER_POSITIONS[position][occupancy] is the positions of the nearest piece on either side, i.e. the pieces that
+# could slide onto the given position.
+BLOCKER_POSITIONS = tuple(tuple(_first_blockers(position, occupancy) for occupancy in OCCUPANCIES)
+                          for position in LINE_POSITIONS)
+
+
+_interned_squares = {}
+
+
+def _squares_by_occupancy(axis: int, position: int, positions_table) -> tuple:
+    """Maps a positions table for one square onto board squares, for every occupancy of its line. Equal tuples are
+    shared, since most occupancies differ only in bits that do not affect the result."""
+    axis_squares = geometry.AXIS_SQUARES[axis]
+    return tuple(_interned_squares.setdefault(squares, squares) for squares in (
+        tuple(axis_squares[target] for target in positions_table[position][occupancy]) for occupancy in OCCUPANCIES))
+
+
+def _slide_positions(position: int) -> tuple:
+    """Returns the reachable positions for every occupancy of a line, for a piece at the given position."""
+    return tuple(MASK_POSITIONS[mask] for mask in SLIDE_MASKS[position])
+
+
+_SLIDE_POSITIONS = tuple(_slide_positions(position) for position in LINE_POSITIONS)
+
+# ROW_SLIDES[square][row occupancy] and COL_SLIDES[square][column occupancy] are the board squares reachable along
+# the square's row and column.
+ROW_SLIDES = tuple(_squares_by_occupancy(geometry.ROW_AXIS_OF[square], geometry.COL_OF[square], _SLIDE_POSITIONS)
+                   for square in geometry.SQUARES)
+COL_SLIDES = tuple(_squares_by_occupancy(geometry.COL_AXIS_OF[square], geometry.ROW_OF[square], _SLIDE_POSITIONS)
+                   for square in geometry.SQUARES)
+
+# ROW_BLOCKERS[square][row occupancy] and COL_BLOCKERS[square][column occupancy] are the nearest occupied squares
+# along the square's row and column.
+ROW_BLOCKERS = tuple(_squares_by_occupancy(geometry.ROW_AXIS_OF[square], geometry.COL_OF[square], BLOCKER_POSITIONS)
+                     for square in geometry.SQUARES)
+COL_BLOCKERS = tuple(_squares_by_occupancy(geometry.COL_AXIS_OF[square], geometry.ROW_OF[square], BLOCKER_POSITIONS)
+                     for square in geometry.SQUARES)
@@ -0,0 +1,101 @@
+import mmap
+import os
+import random
+import struct
+
+from hasami_shogi.src.model.transposition_table import encode_move, decode_move, SCORE_SCALE
+
+# Opening book file: a 16-byte header, then fixed 16-byte records sorted by position key, so a lookup is a binary
+# search straight over the memory-mapped file and opening a book reads nothing up front.
+#
+# Header: magic b"HSBOOK", version u16, record count u32, 4 reserved bytes.
+# Record: symmetric Zobrist key (side to move included, see HasamiShogiGame.get_symmetric_key) u64, move u16 packed by
+# encode_move, weight u16 (how often the move was chosen when the book was built), score i32 (search score *
+# SCORE_SCALE, for the side to move). All little-endian. Moves are those of the position's canonical image, so
+# equivalent positions share their records.
+
+MAGIC = b"HSBOOK"
+VERSION = 2
+HEADER = struct.Struct("<6sHI4x")
+RECORD = struct.Struct("<QHHi")
+KEY = struct.Struct("<Q")
+MAX_WEIGHT = 0xFFFF
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "opening_book.bin")
+
+
+def write_book(path: str, entries: dict[int, dict[tuple[int, int], tuple[int, float]]]) -> int:
+    """
+    Writes a book file from {key: {move: (weight, score)}}, sorted by key and heaviest move first. Weights are capped at
+    MAX_WEIGHT. Returns the number of records written.
+    """
+    records = sorted((key, -min(weight, MAX_WEIGHT), encode_move(move), round(score * SCORE_SCALE))
+                     for key, moves in entries.items() for move, (weight, score) in moves.items())
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as book_file:
+        book_file.write(HEADER.pack(MAGIC, VERSION, len(records)))
+        for key, negative_weight, move_code, score in records:
+            book_file.write(RECORD.pack(key, move_code, -negative_weight, score))
+    return len(records)
+
+
+class OpeningBook:
+    """
+    Defines a read-only opening book backed by a memory-mapped book file. Looks up the book moves of a position by
+    binary search on its symmetric Zobrist key.
+    """
+
+    @classmethod
+    def open_default(cls):
+        """Returns the book shipped with the game, or None if it has not been built."""
+        return cls(DEFAULT_PATH) if os.path.exists(DEFAULT_PATH) else None
+
+    def __init__(self, path: str):
+        """Maps the given book file. Raises ValueError if it is not a book file."""
+        with open(path, "rb") as book_file:
+            self.mapping = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.num_records = HEADER.unpack_from(self.mapping, 0)
+        if magic != MAGIC or version != VERSION or len(self.mapping) != HEADER.size + self.num_records * RECORD.size:
+            self.mapping.close()
+            raise ValueError(f"{path} is not a version {VERSION} opening book.")
+
+    def __len__(self) -> int:
+        return self.num_records
+
+    def close(self) -> None:
+        """Unmaps the book file."""
+        self.mapping.close()
+
+    def get_key(self, index: int) -> int:
+        """Returns the key of the record at the given index."""
+        return KEY.unpack_from(self.mapping, HEADER.size + index * RECORD.size)[0]
+
+    def probe(self, key: int) -> list[tuple[tuple[int, int], int, float]]:
+        """Returns the (move, weight, score) records of the given position, heaviest first, or [] if not in the book."""
+        low, high = 0, self.num_records
+        while low < high:
+            middle = (low + high) // 2
+            if self.get_key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        output = []
+        for index in range(low, self.num_records):
+            record_key, move_code, weight, score = RECORD.unpack_from(self.mapping, HEADER.size + index * RECORD.size)
+            if record_key != key:
+                break
+            output.append((decode_move(move_code), weight, score / SCORE_SCALE))
+        return output
+
+    def choose_move(self, key: int, rng: random.Random = None) -> tuple[tuple[int, int], float]:
+        """
+        Returns (move, score) from the book for the given position, or None if it has no moves for it. Picks the
+        heaviest move, or with rng, a move at random in proportion to its weight.
+        """
+        records = self.probe(key)
+        if not records:
+            return None
+        if rng is None:
+            move, _, score = records[0]
+        else:
+            move, _, score = rng.choices(records, weights=[weight for _, weight, _ in records])[0]
+        return move, score
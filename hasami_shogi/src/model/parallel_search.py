@@ -0,0 +1,228 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+from hasami_shogi.src.model.ai_player import AIPlayer, SearchAborted, SearchLimits, SearchOptions, OPPOSITE_COLOR
+from hasami_shogi.src.model.transposition_table import TranspositionTable, SharedTranspositionTable
+
+# Two ways of searching with several processes. Either way each worker keeps its own HasamiShogiGame replica and an
+# AIPlayer per color for the life of the pool, and only replays the moves that differ from the last position it was
+# sent, so no game is pickled during a search.
+#
+# Root-parallel search: the root moves of one iteration are split across the workers, each with its own
+# transposition table. The best root score found so far is shared through one double in shared memory, so every
+# worker searches its move against the current alpha.
+#
+# Lazy SMP: helper workers run their own iterative deepening search of the same root alongside the main process, odd
+# helpers one ply ahead, and all of them read and write one SharedTranspositionTable. The helpers only speed the main
+# search up by filling the table; the main process's result is the one played.
+
+POLL_SECONDS = 0.01             # How often the main process checks its limits while waiting on workers
+
+_worker: dict = {}              # Per worker process: game, ais (AIPlayer per color), shared_alpha, stop_flag
+
+
+class SharedFlag:
+    """Wraps a shared byte as a stop flag with an is_set() method, so SearchLimits can read it in any process."""
+    def __init__(self, raw_value):
+        self.raw_value = raw_value
+
+    def is_set(self) -> bool:
+        return bool(self.raw_value.value)
+
+
+def _init_worker(board_type: type, draw_rules: dict[str, int], table: TranspositionTable, options: SearchOptions,
+                 stop_flag, shared_alpha=None) -> None:
+    """
+    Builds the game replica, with the searching game's draw rules, and the AIPlayers of a new worker process, both
+    using the given table (or none).
+    """
+    game = HasamiShogiGame(board_type, **draw_rules)
+    ais = {color: AIPlayer(game, color, tt_size_mb=0, options=options) for color in ("BLACK", "RED")}
+    for ai in ais.values():
+        ai.transposition_table = table
+    _worker.update(game=game, ais=ais, shared_alpha=shared_alpha, stop_flag=stop_flag)
+
+
+def _init_root_worker(board_type: type, draw_rules: dict[str, int], tt_size_mb: float, options: SearchOptions,
+                      shared_alpha, stop_flag) -> None:
+    """Initializes a root-parallel worker with a transposition table of its own."""
+    _init_worker(board_type, draw_rules, TranspositionTable(tt_size_mb) if tt_size_mb else None, options, stop_flag,
+                 shared_alpha)
+
+
+def _init_helper(board_type: type, draw_rules: dict[str, int], table_name: str, tt_size_mb: float,
+                 options: SearchOptions, stop_flag) -> None:
+    """Initializes a Lazy SMP helper, attached to the main process's shared transposition table."""
+    _init_worker(board_type, draw_rules, SharedTranspositionTable(tt_size_mb, table_name), options, stop_flag)
+
+
+def _sync_game(history: list[tuple[int, int]]) -> bool:
+    """
+    Brings the worker's game to the position after the given moves, undoing only the moves that differ. Returns True
+    if the position changed.
+    """
+    if not _worker["game"].set_move_history(history):
+        return False
+    for ai in _worker["ais"].values():
+        ai.clear_killers()
+    return True
+
+
+def _search_root_move(history: list[tuple[int, int]], color: str, move: tuple[int, int], depth: int,
+                      deadline: float, max_nodes: int) -> tuple[tuple[int, int], float, int]:
+    """
+    Searches one root move in a worker, first with a null window at the shared alpha, then with the full window if it
+    beats it. Returns (move, score, nodes), with a score of None if the search was stopped. deadline is a time.time()
+    value or None.
+    """
+    game, ai, shared_alpha = _worker["game"], _worker["ais"][color], _worker["shared_alpha"]
+    if _sync_game(history) and ai.transposition_table is not None:
+        ai.transposition_table.new_search()
+    time_ms = max(0.0, deadline - time.time()) * 1000 if deadline is not None else None
+    ai.limits = SearchLimits(time_ms, max_nodes, SharedFlag(_worker["stop_flag"]))
+    opp_color = OPPOSITE_COLOR[color]
+    infinity = AIPlayer.SCORE_INFINITY
+
+    game.make_move_by_index(*move)
+    try:
+        alpha = shared_alpha.value
+        score = -ai.negamax(depth - 1, -alpha - AIPlayer.NULL_WINDOW, -alpha, opp_color, (), 1)[1]
+        if score > alpha:
+            score = -ai.negamax(depth - 1, -infinity, -alpha, opp_color, (), 1)[1]
+        with shared_alpha.get_lock():
+            shared_alpha.value = max(shared_alpha.value, score)
+    except SearchAborted:
+        score = None
+    while len(game.move_log) > len(history):
+        game.undo_move()
+    return move, score, ai.limits.nodes
+
+
+def _helper_search(history: list[tuple[int, int]], color: str, max_depth: int, helper_index: int, age: int) -> int:
+    """
+    Runs a Lazy SMP helper's iterative deepening search of the position after history until max_depth or the stop
+    flag, odd helpers starting one ply deeper. Searches in table generation age, like the main process. Returns the
+    nodes searched.
+    """
+    _sync_game(history)
+    ai = _worker["ais"][color]
+    ai.transposition_table.age = (age - 1) & 0xFF         # search starts a new generation, landing on age
+    ai.search(max_depth=max_depth, stop_event=SharedFlag(_worker["stop_flag"]), start_depth=1 + helper_index % 2,
+              quiet=True)
+    return ai.limits.nodes
+
+
+class RootParallelSearch:
+    """
+    Defines a pool of worker processes that search the root moves of a position in parallel, one move per task. The
+    first move is searched alone to set alpha (young brothers wait), then the rest are shared out. Used by AIPlayer
+    when it has more than one worker.
+    """
+    def __init__(self, workers: int, board_type: type, draw_rules: dict[str, int], tt_size_mb: float,
+                 options: SearchOptions):
+        """
+        Starts the given number of worker processes, each with a transposition table of tt_size_mb. draw_rules are the
+        searching game's, from HasamiShogiGame.get_draw_rules.
+        """
+        context = multiprocessing.get_context()
+        self.workers: int = workers
+        self.shared_alpha = context.Value("d", -AIPlayer.SCORE_INFINITY)
+        self.stop_flag = context.RawValue("b", 0)
+        self.executor = ProcessPoolExecutor(workers, mp_context=context, initializer=_init_root_worker,
+                                            initargs=(board_type, draw_rules, tt_size_mb, options, self.shared_alpha,
+                                                      self.stop_flag))
+
+    def shutdown(self) -> None:
+        """Stops the worker processes."""
+        self.executor.shutdown(cancel_futures=True)
+
+    def search_depth(self, history: list[tuple[int, int]], color: str, ordered_moves: list[tuple[int, int]],
+                     depth: int, limits: SearchLimits) -> tuple[tuple[int, int], float]:
+        """
+        Searches the position after history to the given depth for the given color to move, trying ordered_moves in
+        order. Returns (best_move, score), counting worker nodes in limits. Raises SearchAborted if limits run out
+        first; max_nodes then applies to each root move on its own.
+        """
+        self.shared_alpha.value = -AIPlayer.SCORE_INFINITY
+        self.stop_flag.value = 0
+        deadline = time.time() + limits.deadline - time.perf_counter() if limits.deadline is not None else None
+        best_move, best_score = (), -AIPlayer.SCORE_INFINITY
+        for moves in (ordered_moves[:1], ordered_moves[1:]):
+            futures = [self.executor.submit(_search_root_move, history, color, move, depth, deadline,
+                                            limits.max_nodes) for move in moves]
+            for move, score in self.collect(futures, limits):
+                if score > best_score:
+                    best_move, best_score = move, score
+        if not best_move:           # No legal moves
+            best_score = -AIPlayer.H_WIN
+        return best_move, best_score
+
+    def collect(self, futures: list, limits: SearchLimits) -> list[tuple[tuple[int, int], float]]:
+        """
+        Waits for the given tasks and returns their (move, score) results. Stops every worker and raises SearchAborted
+        if a task was stopped, or if the deadline or stop event of limits is reached while waiting.
+        """
+        results = []
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                move, score, nodes = future.result()
+                limits.nodes += nodes
+                if score is None:
+                    self.stop(pending)
+                    raise SearchAborted
+                results.append((move, score))
+            if (limits.deadline is not None and time.perf_counter() >= limits.deadline) \
+                    or (limits.stop_event is not None and limits.stop_event.is_set()):
+                self.stop(pending)
+                raise SearchAborted
+        return results
+
+    def stop(self, pending: set) -> None:
+        """Cancels the given tasks and waits for those already running to stop."""
+        self.stop_flag.value = 1
+        for future in pending:
+            future.cancel()
+        wait(pending)
+
+
+class LazySMPSearch:
+    """
+    Defines a pool of Lazy SMP helper processes that search alongside the main process into its shared transposition
+    table. Used by AIPlayer in lazy_smp mode, where the main process is one of the workers.
+    """
+    def __init__(self, workers: int, board_type: type, draw_rules: dict[str, int], table: SharedTranspositionTable,
+                 options: SearchOptions):
+        """
+        Starts workers - 1 helper processes attached to the given table. draw_rules are the searching game's, from
+        HasamiShogiGame.get_draw_rules.
+        """
+        context = multiprocessing.get_context()
+        self.num_helpers: int = workers - 1
+        self.stop_flag = context.RawValue("b", 0)
+        self.futures: list = []
+        self.executor = ProcessPoolExecutor(self.num_helpers, mp_context=context, initializer=_init_helper,
+                                            initargs=(board_type, draw_rules, table.get_name(),
+                                                      table.get_size_bytes() / 2 ** 20, options, self.stop_flag))
+
+    def shutdown(self) -> None:
+        """Stops the helper processes."""
+        self.stop()
+        self.executor.shutdown()
+
+    def start(self, history: list[tuple[int, int]], color: str, max_depth: int, age: int) -> None:
+        """Starts every helper searching the position after history for the given color, in table generation age."""
+        self.stop_flag.value = 0
+        self.futures = [self.executor.submit(_helper_search, history, color,
+                                             min(max_depth + helper_index % 2, AIPlayer.MAX_SEARCH_DEPTH),
+                                             helper_index, age) for helper_index in range(self.num_helpers)]
+
+    def stop(self) -> int:
+        """Stops the helpers and waits for them. Returns the nodes they searched."""
+        self.stop_flag.value = 1
+        nodes = sum(future.result() for future in self.futures)
+        self.futures = []
+        return nodes
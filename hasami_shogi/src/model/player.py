@@ -1,3 +1,5 @@
+from collections.abc import KeysView
+
 from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
 from hasami_shogi.src.model.game_board import GameBoard
 
@@ -40,14 +42,18 @@ class Player:
             self._opposing_player = player
             player._opposing_player = self
 
-    def get_pieces(self) -> set[str]:
-        """Returns all the current player's pieces as a set."""
+    def get_pieces(self) -> KeysView[int]:
+        """Returns all the current player's pieces as a read-only, set-like view maintained by the board."""
         return self.get_game().get_game_board().get_squares_by_color(self.get_color())
 
     def make_move(self, start: str, destination: str) -> bool:
-        """Makes the given move in the game and updates piece locations in log and opponent's log."""
+        """Makes the given move, in square string notation, in the game."""
         return self._game.make_move(start, destination)
 
+    def make_move_by_index(self, start: int, destination: int) -> bool:
+        """Makes the given move, as integer squares, in the game."""
+        return self._game.make_move_by_index(start, destination)
+
     def undo_move(self) -> None:
         """Calls undo_move on HasamiShogiGame."""
         init_move_log_length = len(self.get_game().move_log)
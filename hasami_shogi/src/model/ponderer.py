@@ -0,0 +1,104 @@
+import threading
+import time
+
+from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+from hasami_shogi.src.model.ai_player import AIPlayer, OPPOSITE_COLOR
+from hasami_shogi.src.model.hasami_shogi_utilities import move_to_string
+import hasami_shogi.src.model.symmetry as symmetry
+
+
+class Ponderer:
+    """
+    Defines pondering for an AIPlayer: thinking on the opponent's time. While the opponent chooses a move, a background
+    thread plays the predicted reply on a replica of the game and searches the AI's answer to it, into the AI's own
+    transposition table. If the opponent then plays the predicted move (a ponder hit), the answer is ready early; if not
+    (a miss), the AI searches as usual, starting from the table entries the ponder search left behind.
+    """
+
+    def __init__(self, ai: AIPlayer):
+        """Creates a ponderer for the given AI, with a replica game that only the pondering thread searches."""
+        self.ai: AIPlayer = ai
+        self.replica = HasamiShogiGame(type(ai.get_board()), **ai.get_game().get_draw_rules())
+        self.ponder_ai = AIPlayer(self.replica, ai.get_color(), tt_size_mb=0, options=ai.options,
+                                  eval_cache=ai.eval_cache, book=ai.book, tablebase=ai.tablebase)
+        self.ponder_ai.transposition_table = ai.transposition_table
+        self.predicted_move: tuple[int, int] = ()
+        self.ponder_history: list[tuple[int, int]] = []    # Moves of the pondered position, the predicted move last
+        self.start_time: float = 0.0
+        self.stop_event = threading.Event()
+        self.thread: threading.Thread = None
+        self.result: tuple[tuple[int, int], float] = ((), 0.0)
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def is_pondering(self) -> bool:
+        """Returns True while the pondering thread is running."""
+        return self.thread is not None and self.thread.is_alive()
+
+    def predict_reply(self) -> tuple[int, int]:
+        """
+        Returns the opponent's expected move in the current game: the best move stored in the transposition table by
+        the AI's last search if it is legal, else the opponent's first ordered move.
+        """
+        opp_color = OPPOSITE_COLOR[self.ai.get_color()]
+        table = self.ai.transposition_table
+        key, transform = self.ai.get_table_key()
+        entry = table.probe(key) if table is not None else None
+        move = symmetry.transform_move(entry[3], transform) if entry is not None else ()
+        if move and self.ai.is_legal_for(move, opp_color):
+            return move
+        return next(self.ai.generate_moves(opp_color), ())
+
+    def start(self) -> None:
+        """
+        Starts pondering on the predicted reply. Call once the AI has moved and the opponent is to move; does nothing
+        otherwise.
+        """
+        game = self.ai.get_game()
+        if self.is_pondering() or self.ai.get_active() or game.get_game_state() != "UNFINISHED":
+            return None
+        self.predicted_move = self.predict_reply()
+        if not self.predicted_move:
+            return None
+        self.ponder_history = game.get_move_history() + [self.predicted_move]
+        self.replica.set_move_history(self.ponder_history)
+        self.ponder_ai.transposition_table = self.ai.transposition_table
+        if self.replica.get_game_state() != "UNFINISHED":
+            return None
+        self.stop_event.clear()
+        self.start_time = time.perf_counter()
+        self.thread = threading.Thread(target=self.ponder, daemon=True)
+        self.thread.start()
+
+    def ponder(self) -> None:
+        """Body of the pondering thread. Searches the replica until stopped and keeps the result."""
+        self.result = self.ponder_ai.search(stop_event=self.stop_event, quiet=True)
+
+    def stop(self) -> None:
+        """Stops pondering and waits for the thread to finish."""
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+
+    def search(self, time_ms: float) -> tuple[tuple[int, int], float]:
+        """
+        Returns the AI's (best_move, heuristic) in the current game, like AIPlayer.search with the given time budget.
+        On a ponder hit the time already spent pondering counts towards the budget, so the answer may be immediate; on
+        a miss the pondering is stopped and the AI searches as usual. The pondering thread searches quietly, so the
+        answer is only printed here, like AIPlayer.search prints it.
+        """
+        if self.thread is not None and self.ai.get_game().get_move_history() == self.ponder_history:
+            remaining_seconds = time_ms / 1000 - (time.perf_counter() - self.start_time)
+            if remaining_seconds > 0:
+                self.thread.join(remaining_seconds)
+            self.stop()
+            if self.ponder_ai.depth_reached:    # Not if nothing was searched, e.g. a book or tablebase position
+                self.hits += 1
+                self.ai.limits, self.ai.depth_reached = self.ponder_ai.limits, self.ponder_ai.depth_reached
+                print(move_to_string(self.result[0]) if self.result[0] else self.result[0], self.result[1], "(ponder)")
+                return self.result
+        elif self.thread is not None:
+            self.misses += 1
+        self.stop()
+        return self.ai.search(time_ms=time_ms)
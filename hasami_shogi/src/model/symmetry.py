@@ -0,0 +1,56 @@
+from typing import Iterable, Iterator
+
+import hasami_shogi.src.model.board_geometry as geometry
+
+# Symmetries of Hasami Shogi positions. Mirroring the columns (col -> 8 - col) gives a position of the same value, and
+# so does flipping the rows (row -> 8 - row) while swapping the colors and the player to move, since the rules treat
+# both colors alike. With the identity and the two combined they form four transforms, numbered so that composing two
+# is XOR, and each is its own inverse. HasamiShogiGame keeps the Zobrist key of every image up to date; the smallest
+# is the position's symmetric key, shared by all its images, and the transform giving it maps moves to and from the
+# canonical image.
+
+IDENTITY, MIRROR, FLIP, MIRROR_FLIP = range(4)
+TRANSFORMS = (IDENTITY, MIRROR, FLIP, MIRROR_FLIP)
+SQUARE_MAPS = tuple(tuple((8 - geometry.ROW_OF[square] if transform & FLIP else geometry.ROW_OF[square]) * 9
+                          + (8 - geometry.COL_OF[square] if transform & MIRROR else geometry.COL_OF[square])
+                          for square in geometry.SQUARES) for transform in TRANSFORMS)
+SWAPS_COLORS = (False, False, True, True)
+SWAPPED_COLOR = {"RED": "BLACK", "BLACK": "RED", "NONE": "NONE"}
+
+
+def transform_color(color: str, transform: int) -> str:
+    """Returns the color a piece or player of the given color has in the image under the given transform."""
+    return SWAPPED_COLOR[color] if SWAPS_COLORS[transform] else color
+
+
+def transform_move(move: tuple[int, int], transform: int) -> tuple[int, int]:
+    """Returns the image of the given move under the given transform. The empty move () is its own image."""
+    if not transform or not move:
+        return move
+    square_map = SQUARE_MAPS[transform]
+    return square_map[move[0]], square_map[move[1]]
+
+
+def transform_position(pieces: dict[str, Iterable[int]], active_player: str,
+                       transform: int) -> tuple[dict[str, list[int]], str]:
+    """
+    Returns the image of the position with the given {color: squares} and player to move under the given transform, as
+    ({color: sorted squares}, player to move).
+    """
+    square_map = SQUARE_MAPS[transform]
+    image = {transform_color(color, transform): sorted(square_map[square] for square in squares)
+             for color, squares in pieces.items()}
+    return image, transform_color(active_player, transform)
+
+
+def drop_mirrored_moves(moves: Iterable[tuple[int, int]]) -> Iterator[tuple[int, int]]:
+    """
+    Yields the given moves in order, skipping any whose mirror image came earlier. In a position that is its own mirror
+    image, a move and its mirror image lead to positions of the same value, so only one needs searching.
+    """
+    mirrored = set()
+    for move in moves:
+        if move in mirrored:
+            continue
+        mirrored.add(transform_move(move, MIRROR))
+        yield move
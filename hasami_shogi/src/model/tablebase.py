@@ -0,0 +1,169 @@
+import glob
+import mmap
+import os
+import re
+import struct
+from math import comb
+
+from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+import hasami_shogi.src.model.symmetry as symmetry
+
+# Endgame tablebase files, one per material class (pieces of BLACK and RED, at least 2 each: with fewer the game is
+# over). Every position of the class has one byte at its index: 0 for a draw, else 1 + the distance in plies to the
+# end of the game with best play, which is a win for the side to move if odd and a loss if even.
+#
+# Header: magic b"HSTBAS", version u16, BLACK pieces u8, RED pieces u8, 6 reserved bytes, position count u64.
+#
+# A position is indexed by the colex rank of its sorted BLACK squares among the 81, then of its sorted RED squares
+# among the 81 - BLACK squares left, then the side to move: (black_rank * C(81 - BLACK, RED) + red_rank) * 2 + side,
+# with side 0 for BLACK and 1 for RED. Every index is a distinct legal placement, so the table has no holes.
+#
+# Flipping the rows while swapping the colors and the side to move keeps a position's result (see symmetry), so only
+# classes with at least as many BLACK pieces as RED are built, and the others are probed through their flipped image.
+
+MAGIC = b"HSTBAS"
+VERSION = 1
+HEADER = struct.Struct("<6sHBB6xQ")
+DRAW = 0
+MAX_DISTANCE = 254
+MIN_PIECES = 2                  # Pieces per side of the smallest class; a side with fewer has lost
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(__file__), "data", "tablebase")
+FILE_PATTERN = re.compile(r"tb_(\d)v(\d)\.bin$")
+BINOMIAL = [[comb(n, k) for k in range(10)] for n in range(82)]
+
+
+def table_file_name(num_black: int, num_red: int) -> str:
+    """Returns the file name of the given material class."""
+    return f"tb_{num_black}v{num_red}.bin"
+
+
+def num_positions(num_black: int, num_red: int) -> int:
+    """Returns the number of positions, both sides to move, in the given material class."""
+    return BINOMIAL[81][num_black] * BINOMIAL[81 - num_black][num_red] * 2
+
+
+def material_classes(max_pieces: int) -> list[tuple[int, int]]:
+    """
+    Returns every (BLACK pieces, RED pieces) class with at most max_pieces in total and at least as many BLACK pieces
+    as RED, smallest first. The others are the flipped images of these.
+    """
+    return [(num_black, total - num_black) for total in range(2 * MIN_PIECES, max_pieces + 1)
+            for num_black in range((total + 1) // 2, total - MIN_PIECES + 1) if num_black <= 9]
+
+
+def rank_combination(squares: list[int]) -> int:
+    """Returns the colex rank of the given sorted squares among all sets of that size."""
+    return sum(BINOMIAL[square][count + 1] for count, square in enumerate(squares))
+
+
+def unrank_combination(rank: int, size: int) -> list[int]:
+    """Returns the sorted squares with the given colex rank among all sets of the given size."""
+    squares = []
+    square = 81
+    for count in range(size, 0, -1):
+        square -= 1
+        while BINOMIAL[square][count] > rank:
+            square -= 1
+        rank -= BINOMIAL[square][count]
+        squares.append(square)
+    return squares[::-1]
+
+
+def position_index(black: list[int], red: list[int], active_player: str) -> int:
+    """Returns the index of the position with the given sorted BLACK and RED squares and player to move."""
+    black_set = set(black)
+    free_squares = [square for square in range(81) if square not in black_set]
+    red_rank = rank_combination([free_squares.index(square) for square in red])
+    return ((rank_combination(black) * BINOMIAL[81 - len(black)][len(red)] + red_rank) * 2
+            + (active_player == "RED"))
+
+
+def index_position(index: int, num_black: int, num_red: int) -> tuple[list[int], list[int], str]:
+    """Returns the sorted (BLACK squares, RED squares, player to move) of the given index in a material class."""
+    index, side = divmod(index, 2)
+    black_rank, red_rank = divmod(index, BINOMIAL[81 - num_black][num_red])
+    black = unrank_combination(black_rank, num_black)
+    black_set = set(black)
+    free_squares = [square for square in range(81) if square not in black_set]
+    red = [free_squares[position] for position in unrank_combination(red_rank, num_red)]
+    return black, red, "RED" if side else "BLACK"
+
+
+def decode_value(value: int) -> tuple[str, int]:
+    """Returns the (result, distance) of a table byte, result being WIN, LOSS or DRAW for the side to move."""
+    if value == DRAW:
+        return "DRAW", 0
+    distance = value - 1
+    return ("WIN" if distance % 2 else "LOSS"), distance
+
+
+def write_table(path: str, num_black: int, num_red: int, values: bytes) -> None:
+    """Writes the table of a material class from one byte per position index."""
+    if len(values) != num_positions(num_black, num_red):
+        raise ValueError(f"A {num_black}v{num_red} table needs {num_positions(num_black, num_red)} values.")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as table_file:
+        table_file.write(HEADER.pack(MAGIC, VERSION, num_black, num_red, len(values)))
+        table_file.write(values)
+
+
+class Tablebase:
+    """
+    Defines a read-only endgame tablebase: the memory-mapped tables of every material class found in a directory.
+    Probing a position of a loaded class is one byte read, giving its exact result and distance to the end.
+    """
+
+    @classmethod
+    def open_default(cls):
+        """Returns the tablebase shipped with the game, or None if no tables have been built."""
+        tablebase = cls(DEFAULT_DIRECTORY)
+        if not tablebase.tables:
+            return None
+        return tablebase
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY):
+        """Maps every table file in the given directory. Raises ValueError on a file that is not a valid table."""
+        self.tables: dict[tuple[int, int], mmap.mmap] = {}
+        for path in sorted(glob.glob(os.path.join(directory, "tb_*v*.bin"))):
+            match = FILE_PATTERN.search(path)
+            if match is None:
+                continue
+            with open(path, "rb") as table_file:
+                mapping = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, num_black, num_red, count = HEADER.unpack_from(mapping, 0)
+            if magic != MAGIC or version != VERSION or (num_black, num_red) != tuple(map(int, match.groups())) \
+                    or count != num_positions(num_black, num_red) or len(mapping) != HEADER.size + count:
+                mapping.close()
+                raise ValueError(f"{path} is not a version {VERSION} tablebase file.")
+            self.tables[num_black, num_red] = mapping
+        self.max_pieces = max((sum(material) for material in self.tables), default=0)
+
+    def close(self) -> None:
+        """Unmaps the table files."""
+        for mapping in self.tables.values():
+            mapping.close()
+        self.tables = {}
+        self.max_pieces = 0
+
+    def probe_position(self, black: list[int], red: list[int], active_player: str) -> tuple[str, int]:
+        """
+        Returns the (result, distance) for the side to move of the position with the given sorted BLACK and RED
+        squares, or None if neither its material class nor the flipped class is loaded.
+        """
+        mapping = self.tables.get((len(black), len(red)))
+        if mapping is None:
+            mapping = self.tables.get((len(red), len(black)))
+            if mapping is None:
+                return None
+            image, active_player = symmetry.transform_position({"BLACK": black, "RED": red}, active_player,
+                                                               symmetry.FLIP)
+            black, red = image["BLACK"], image["RED"]
+        return decode_value(mapping[HEADER.size + position_index(black, red, active_player)])
+
+    def probe(self, game: HasamiShogiGame) -> tuple[str, int]:
+        """Returns the (result, distance) for the side to move in the given unfinished game, or None if not loaded."""
+        board = game.get_game_board()
+        if board.get_num_pieces("BLACK") + board.get_num_pieces("RED") > self.max_pieces:
+            return None
+        return self.probe_position(sorted(board.get_squares_by_color("BLACK")),
+                                   sorted(board.get_squares_by_color("RED")), game.get_active_player())
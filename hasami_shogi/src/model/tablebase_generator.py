@@ -0,0 +1,157 @@
+import os
+
+from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+from hasami_shogi.src.model.tablebase import Tablebase, write_table, table_file_name, num_positions, \
+    material_classes, position_index, index_position, MAX_DISTANCE, DRAW
+
+OPPOSITE_COLOR = {"RED": "BLACK", "BLACK": "RED"}
+
+
+class TablebaseGenerator:
+    """
+    Defines a retrograde analysis solver for one material class. Every position is first scanned forward once: moves
+    that capture leave the class and are scored from the smaller classes' tables (or win outright), the rest are
+    counted. Solved positions are then taken in order of distance and their predecessors, found by un-moving the piece
+    that moved last, are updated: a predecessor of a loss wins at once, and a predecessor all of whose moves lead to
+    wins for the opponent loses. Positions never solved are draws.
+    """
+
+    def __init__(self, num_black: int, num_red: int, tablebase: Tablebase = None):
+        """
+        Creates a solver for the given class. tablebase must hold every smaller class that a capture can reach, i.e.
+        those with one side reduced to 2 or more pieces, or their flipped images.
+        """
+        self.num_black = num_black
+        self.num_red = num_red
+        self.size = num_positions(num_black, num_red)
+        self.tablebase = tablebase
+        self.game = HasamiShogiGame(repetition_limit=None, max_moves=None)
+
+    def set_index(self, index: int) -> None:
+        """Sets up the position of the given index on the solver's game."""
+        black, red, active_player = index_position(index, self.num_black, self.num_red)
+        self.game.set_position({"BLACK": black, "RED": red}, active_player)
+
+    def get_index(self) -> int:
+        """Returns the index of the position on the solver's game."""
+        board = self.game.get_game_board()
+        return position_index(sorted(board.get_squares_by_color("BLACK")), sorted(board.get_squares_by_color("RED")),
+                              self.game.get_active_player())
+
+    def scan(self, index: int) -> tuple[int, int, int, bool]:
+        """
+        Scans the moves of the given position. Returns (quiet_moves, win_distance, loss_distance, has_draw): the number
+        of moves that stay in the class, the distance of the quickest win through a capture (0 if none), the longest
+        distance of a loss through captures that lose, and whether a capture reaches a drawn position.
+        """
+        self.set_index(index)
+        game = self.game
+        color = game.get_active_player()
+        quiet_moves = win_distance = loss_distance = 0
+        has_draw = False
+        for square in list(game.get_game_board().get_squares_by_color(color)):
+            for destination in game.get_reachable_squares(square):
+                game.make_move_by_index(square, destination)
+                if not game.move_log[-1].cap_squares:
+                    quiet_moves += 1
+                else:
+                    if game.get_game_state() != "UNFINISHED":
+                        result, distance = "LOSS", 0
+                    else:
+                        probed = self.tablebase.probe(game) if self.tablebase is not None else None
+                        if probed is None:
+                            raise ValueError(f"Solving {self.num_black}v{self.num_red} needs the smaller tables.")
+                        result, distance = probed
+                    if result == "LOSS":
+                        win_distance = min(win_distance or MAX_DISTANCE, distance + 1)
+                    elif result == "WIN":
+                        loss_distance = max(loss_distance, distance + 1)
+                    else:
+                        has_draw = True
+                game.undo_move()
+        return quiet_moves, win_distance, loss_distance, has_draw
+
+    def predecessors(self, index: int) -> list[int]:
+        """
+        Returns the indices of the positions of the class that lead to the given one by a move that captures nothing:
+        the player not to move slid a piece onto its square from any square it can reach, and landing there must not
+        sandwich a piece of the player to move.
+        """
+        self.set_index(index)
+        game = self.game
+        previous_color = OPPOSITE_COLOR[game.get_active_player()]
+        output = []
+        game.toggle_active_player()
+        try:
+            for square in list(game.get_game_board().get_squares_by_color(previous_color)):
+                if game.check_linear_captures(square) or game.check_corner_capture(square):
+                    continue
+                for previous_square in game.get_reachable_squares(square):
+                    game.execute_move(square, previous_square)
+                    output.append(self.get_index())
+                    game.execute_move(previous_square, square)
+        finally:
+            game.toggle_active_player()
+        return output
+
+    def solve(self) -> bytearray:
+        """Solves the class. Returns one table byte per position index."""
+        values = bytearray(self.size)
+        quiet_left = bytearray(self.size)           # Quiet moves not yet known to lead to an opponent's win
+        loss_distance = bytearray(self.size)        # Longest distance among the opponent's wins found so far
+        has_escape = bytearray(self.size)           # 1 if a capture draws, so the position can never lose
+        pending: list[list[int]] = [[] for _ in range(MAX_DISTANCE + 1)]   # Per distance, indices to solve
+
+        for index in range(self.size):
+            quiet_moves, win_distance, loss_distance[index], draw = self.scan(index)
+            quiet_left[index], has_escape[index] = quiet_moves, draw or bool(win_distance)
+            if win_distance:
+                pending[win_distance].append(index)
+            elif not quiet_moves and not draw:
+                pending[loss_distance[index]].append(index)
+
+        for distance in range(MAX_DISTANCE + 1):
+            for index in pending[distance]:
+                if values[index] != DRAW:
+                    continue
+                values[index] = distance + 1
+                for previous in self.predecessors(index):
+                    if values[previous] != DRAW:
+                        continue
+                    if distance % 2 == 0:           # A loss for the side to move, so a win for the previous player
+                        self.push(pending, distance + 1, previous)
+                        has_escape[previous] = 1
+                    else:
+                        quiet_left[previous] -= 1
+                        loss_distance[previous] = max(loss_distance[previous], distance + 1)
+                        if not quiet_left[previous] and not has_escape[previous]:
+                            self.push(pending, loss_distance[previous], previous)
+            pending[distance] = []
+        return values
+
+    @staticmethod
+    def push(pending: list[list[int]], distance: int, index: int) -> None:
+        """Queues an index to be solved at the given distance. Raises ValueError beyond MAX_DISTANCE."""
+        if distance > MAX_DISTANCE:
+            raise ValueError(f"Distance {distance} does not fit in a table byte.")
+        pending[distance].append(index)
+
+
+def build_tables(max_pieces: int, directory: str) -> list[str]:
+    """
+    Solves and writes every material class up to max_pieces in total, smallest first so each class can read the
+    tables of the classes its captures reach. Classes already in the directory are kept. Returns the paths written.
+    """
+    written = []
+    for num_black, num_red in material_classes(max_pieces):
+        path = os.path.join(directory, table_file_name(num_black, num_red))
+        if os.path.exists(path):
+            continue
+        tablebase = Tablebase(directory)
+        try:
+            values = TablebaseGenerator(num_black, num_red, tablebase).solve()
+        finally:
+            tablebase.close()
+        write_table(path, num_black, num_red, values)
+        written.append(path)
+    return written
@@ -0,0 +1,169 @@
+from array import array
+from multiprocessing import shared_memory
+
+# Fixed-size transposition table for the AI search. Each entry is 16 bytes: a 64-bit check word in one array('Q') and
+# a packed 64-bit data word in another, so memory use is set once from a size in MB and never grows. The check word is
+# the Zobrist key XOR the data word, so an entry whose two words were written by different processes at the same time
+# (see SharedTranspositionTable) fails the check and reads as a collision instead of returning another position's data.
+#
+# Data word layout, lowest bits first:
+#   bits  0-31  score * SCORE_SCALE, offset by 2^31 (heuristic scores are multiples of 1/16)
+#   bits 32-39  remaining search depth
+#   bits 40-41  bound type: EXACT, LOWER or UPPER
+#   bits 42-49  age, i.e. the search generation the entry was stored in
+#   bits 50-62  best move as from * 81 + to + 1, or 0 for none
+
+EXACT, LOWER, UPPER = 0, 1, 2
+ENTRY_BYTES = 16
+SCORE_SCALE = 16
+SCORE_OFFSET = 1 << 31
+NO_MOVE = 0
+
+
+def encode_move(move: tuple) -> int:
+    """Packs a (from, to) move into 13 bits. An empty move packs to NO_MOVE."""
+    return move[0] * 81 + move[1] + 1 if move else NO_MOVE
+
+
+def decode_move(code: int) -> tuple:
+    """Unpacks a move packed by encode_move. NO_MOVE unpacks to an empty tuple."""
+    return divmod(code - 1, 81) if code else ()
+
+
+class TranspositionTable:
+    """
+    Defines a fixed-size, always-allocated table of search results keyed on Zobrist keys. Keeps depth, score, bound
+    type and best move per position, and counts hits, misses and collisions so the size can be tuned.
+    """
+
+    def __init__(self, size_mb: float):
+        """
+        Allocates the largest power-of-two number of entries that fits in the given size, at least one.
+        """
+        num_entries = 1
+        while num_entries * 2 * ENTRY_BYTES <= size_mb * 2 ** 20:
+            num_entries *= 2
+        self.num_entries: int = num_entries
+        self.index_mask: int = num_entries - 1
+        self.keys, self.data = self.allocate()      # Check words (key ^ data) and data words
+        self.age: int = 0
+        self.hits: int = 0                  # Probes that found their position
+        self.misses: int = 0                # Probes that found an empty slot
+        self.collisions: int = 0            # Probes that found a different position in their slot
+        self.stores: int = 0
+
+    def __len__(self) -> int:
+        return self.num_entries
+
+    def allocate(self) -> tuple:
+        """Returns zeroed check word and data word arrays of num_entries each."""
+        return array("Q", bytes(8 * self.num_entries)), array("Q", bytes(8 * self.num_entries))
+
+    def get_size_bytes(self) -> int:
+        """Returns the memory held by the entries, in bytes."""
+        return self.num_entries * ENTRY_BYTES
+
+    def new_search(self) -> None:
+        """Starts a new search generation. Entries from earlier generations become the first to be replaced."""
+        self.age = (self.age + 1) & 0xFF
+
+    def clear(self) -> None:
+        """Empties the table and resets the counters."""
+        self.keys, self.data = self.allocate()
+        self.hits = self.misses = self.collisions = self.stores = 0
+
+    def probe(self, key: int):
+        """
+        Returns (depth, score, bound, move) stored for the given key, or None if the position is not in the table.
+        """
+        index = key & self.index_mask
+        data = self.data[index]
+        stored_key = self.keys[index] ^ data
+        if stored_key != key:
+            if stored_key:
+                self.collisions += 1
+            else:
+                self.misses += 1
+            return None
+        self.hits += 1
+        return (data >> 32 & 0xFF, ((data & 0xFFFFFFFF) - SCORE_OFFSET) / SCORE_SCALE, data >> 40 & 0x3,
+                decode_move(data >> 50))
+
+    def store(self, key: int, depth: int, score: float, bound: int, move: tuple) -> None:
+        """
+        Stores a search result. An occupied slot is only replaced by the same position, by a result at least as deep,
+        or if its entry is from an earlier search.
+        """
+        index = key & self.index_mask
+        stored_data = self.data[index]
+        stored_key = self.keys[index] ^ stored_data
+        if stored_key and stored_key != key:
+            if stored_data >> 42 & 0xFF == self.age and stored_data >> 32 & 0xFF > depth:
+                return None
+        data = (round(score * SCORE_SCALE) + SCORE_OFFSET) | min(depth, 0xFF) << 32 | bound << 40 | self.age << 42 \
+            | encode_move(move) << 50
+        self.keys[index] = key ^ data
+        self.data[index] = data
+        self.stores += 1
+
+    def get_fill(self, sample_size: int = 1000) -> float:
+        """Returns the fraction of entries in use, sampled from the start of the table."""
+        sample = self.keys[:sample_size]
+        return sum(1 for key in sample if key) / len(sample)
+
+    def get_stats(self) -> dict[str, float]:
+        """Returns the counters along with the table size and fill, e.g. for logging after a search."""
+        probes = self.hits + self.misses + self.collisions
+        return {
+            "entries": self.num_entries,
+            "size_bytes": self.get_size_bytes(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "hit_rate": self.hits / probes if probes else 0.0,
+            "fill": self.get_fill()
+        }
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """
+    Defines a transposition table whose entries live in multiprocessing shared memory, so several processes can search
+    into one table without locks. The process that creates it passes get_name() to the others, which attach with the
+    same size. Counters and age are kept per process.
+    """
+
+    def __init__(self, size_mb: float, name: str = None):
+        """Creates a new shared table of the given size, or attaches to the existing one with the given name."""
+        self.name: str = name
+        self.shared_memory = None
+        self.words = None               # The whole shared buffer as 64-bit words, check words first
+        super().__init__(size_mb)
+
+    def allocate(self) -> tuple:
+        """Returns the check word and data word halves of the shared buffer, creating or attaching to it first."""
+        if self.shared_memory is None:
+            if self.name is None:
+                self.shared_memory = shared_memory.SharedMemory(create=True, size=self.get_size_bytes())
+                self.name = self.shared_memory.name
+            else:
+                self.shared_memory = shared_memory.SharedMemory(name=self.name)
+            self.words = self.shared_memory.buf[:self.get_size_bytes()].cast("Q")
+        return self.words[:self.num_entries], self.words[self.num_entries:]
+
+    def get_name(self) -> str:
+        """Returns the name other processes attach to the table by."""
+        return self.name
+
+    def clear(self) -> None:
+        """Empties the table for every process attached to it and resets this process's counters."""
+        self.shared_memory.buf[:self.get_size_bytes()] = bytes(self.get_size_bytes())
+        self.hits = self.misses = self.collisions = self.stores = 0
+
+    def close(self, unlink: bool = False) -> None:
+        """Detaches this process from the table. The creating process unlinks it, freeing the memory once all close."""
+        for view in (self.keys, self.data, self.words):
+            view.release()
+        self.shared_memory.close()
+        if unlink:
+            self.shared_memory.unlink()
@@ -0,0 +1,44 @@
+import random
+import hasami_shogi.src.model.hasami_shogi_utilities as utils
+import hasami_shogi.src.model.symmetry as symmetry
+
+
+# Fixed seed so keys, and anything stored under them, are stable between runs and processes.
+_rng = random.Random(0x5A0B1157)
+
+
+def swap_halves(key: int) -> int:
+    """Returns the 64-bit key with its two 32-bit halves swapped."""
+    return key >> 32 | (key & 0xFFFFFFFF) << 32
+
+
+# RED's key on a square is BLACK's on the flipped square with its halves swapped. The key of a board's image under
+# symmetry.FLIP, which also swaps the colors, is then the board's own key with its halves swapped, so it needs no
+# upkeep of its own.
+_BLACK_KEYS = tuple(_rng.getrandbits(64) for _ in utils.ALL_SQUARES)
+PIECE_KEYS = {
+    "RED": tuple(swap_halves(_BLACK_KEYS[square]) for square in symmetry.SQUARE_MAPS[symmetry.FLIP]),
+    "BLACK": _BLACK_KEYS,
+    "NONE": (0,) * 81
+}
+RED_TO_MOVE_KEY = _rng.getrandbits(64)      # XORed in while RED is the active player
+CONTEMPT_KEY = _rng.getrandbits(64)         # XORed into table keys by an AIPlayer with contempt playing RED's image
+
+# IMAGE_PIECE_KEYS[transform][color][square] is the key of the piece the image of the board under a symmetry transform
+# has in place of the given piece, so XORing them over the board gives the key of the image.
+IMAGE_PIECE_KEYS = tuple({color: tuple(PIECE_KEYS[symmetry.transform_color(color, transform)][square_map[square]]
+                                       for square in utils.ALL_SQUARES) for color in PIECE_KEYS}
+                         for transform, square_map in zip(symmetry.TRANSFORMS, symmetry.SQUARE_MAPS))
+MIRROR_PIECE_KEYS = IMAGE_PIECE_KEYS[symmetry.MIRROR]
+
+
+def compute_hash(board, active_player: str, transform: int = symmetry.IDENTITY) -> int:
+    """
+    Computes the 64-bit Zobrist key of the given board and side to move, or of their image under the given symmetry
+    transform, from scratch. O(81); HasamiShogiGame keeps the key and its mirror image's key up to date incrementally.
+    """
+    key = RED_TO_MOVE_KEY if symmetry.transform_color(active_player, transform) == "RED" else 0
+    for color in ["RED", "BLACK"]:
+        for square in board.get_squares_by_color(color):
+            key ^= IMAGE_PIECE_KEYS[transform][color][square]
+    return key
@@ -2,15 +2,19 @@ import sys
 from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
 from hasami_shogi.src.model.player import Player
 from hasami_shogi.src.model.ai_player import AIPlayer
-from hasami_shogi.src.model.hasami_shogi_utilities import get_game_pieces
+from hasami_shogi.src.model.ponderer import Ponderer
+from hasami_shogi.src.model.opening_book import OpeningBook
+from hasami_shogi.src.model.tablebase import Tablebase
+from hasami_shogi.src.model.eval_cache import EvaluationCache, DEFAULT_SIZE_MB
+from hasami_shogi.src.model.hasami_shogi_utilities import get_game_pieces, square_index, square_name, move_to_string
 from hasami_shogi.src.view.visual_constants import *
 import pygame
 
 
 class VisualGame():
     """Contains methods and data members used to visually render a game of Hasami Shogi."""
-    def __init__(self, num_players, ai_depth=None, player_color=None):
-        """Initialize an instance of a visual Hasami Shogi game."""
+    def __init__(self, num_players, ai_time_ms=AIPlayer.SEARCH_TIME_MS, player_color=None, ponder=False):
+        """Initialize an instance of a visual Hasami Shogi game. With ponder, a single AI thinks on the human's time."""
         self._selected_square = None
         self._prev_move = None
         self._curr_move = None
@@ -18,22 +22,28 @@ class VisualGame():
         self._player_red = Player(self._game, "RED")
         self._player_black = Player(self._game, "BLACK")
         self._ai = num_players < 2
-        self._ai_depth = ai_depth
+        self._ai_time_ms = ai_time_ms
         self._zero_player = num_players == 0
         self._just_captured = set()
         self._just_captured_color = None
+        self._ponderer = None
 
         if self._ai:
+            book, tablebase = OpeningBook.open_default(), Tablebase.open_default()
             if num_players == 0:
-                self._player_red = AIPlayer(self._game, "RED")
-                self._player_black = AIPlayer(self._game, "BLACK")
+                eval_cache = EvaluationCache(DEFAULT_SIZE_MB)    # Shared: each AI evaluates the other's positions
+                self._player_red = AIPlayer(self._game, "RED", book=book, tablebase=tablebase, eval_cache=eval_cache)
+                self._player_black = AIPlayer(self._game, "BLACK", book=book, tablebase=tablebase,
+                                              eval_cache=eval_cache)
                 self._ai_player = self._player_black
             elif player_color == "RED":
-                self._player_black = AIPlayer(self._game, "BLACK")
+                self._player_black = AIPlayer(self._game, "BLACK", book=book, tablebase=tablebase)
                 self._ai_player = self._player_black
             elif player_color == "BLACK":
-                self._player_red = AIPlayer(self._game, "RED")
+                self._player_red = AIPlayer(self._game, "RED", book=book, tablebase=tablebase)
                 self._ai_player = self._player_red
+            if ponder and num_players == 1:
+                self._ponderer = Ponderer(self._ai_player)
 
         self._player_red.set_opposing_player(self._player_black)
         self._screen = pygame.display.set_mode((screen_size, screen_size))
@@ -71,7 +81,7 @@ class VisualGame():
                 square_string = row + col
                 x, y = self.square_string_to_gcoord(square_string)
                 center = x + square_size//2, y + square_size//2
-                square_color = self._game.get_square_occupant(square_string)
+                square_color = self._game.get_square_occupant(square_index(square_string))
                 if square_color == "RED":
                     pygame.draw.circle(self._screen, red, center, piece_size)
                 elif square_color == "BLACK":
@@ -94,6 +104,10 @@ class VisualGame():
                 width, height = victory_font.size("RED WON!")
                 victory_coords = screen_size//2 - width//2, screen_size//2 - height//2
                 self._screen.blit(victory_font.render("RED WON!", False, red, grey), victory_coords)
+            elif game_state == "DRAW":
+                width, height = victory_font.size("DRAW!")
+                victory_coords = screen_size // 2 - width // 2, screen_size // 2 - height // 2
+                self._screen.blit(victory_font.render("DRAW!", False, black, grey), victory_coords)
             else:
                 width, height = victory_font.size("BLACK WON!")
                 victory_coords = screen_size // 2 - width // 2, screen_size // 2 - height // 2
@@ -133,9 +147,9 @@ class VisualGame():
     def draw_possible_moves(self):
         """Draws all possible moves for the selected square."""
         if self._selected_square:
-            possible_moves = self._game.return_valid_moves(self._selected_square)
-            for square in possible_moves:
-                x, y = self.square_string_to_gcoord(square[2:])
+            possible_moves = self._game.return_valid_moves(square_index(self._selected_square))
+            for move in possible_moves:
+                x, y = self.square_string_to_gcoord(square_name(move[1]))
                 center = x + square_size//2, y + square_size//2
                 pygame.draw.circle(self._screen, grey, center, dot_size)
 
@@ -192,13 +206,14 @@ class VisualGame():
             return
         square_string = self.gcoord_to_square_string(gcoord)
         if not self._selected_square:
-            if self._game.get_square_occupant(square_string) != self._game.get_active_player():
+            if self._game.get_square_occupant(square_index(square_string)) != self._game.get_active_player():
                 return
             self._selected_square = square_string
             self._just_captured = set()
         elif self._selected_square == square_string:
             self._selected_square = None        # Reset selection
-        elif self._game.get_square_occupant(square_string) == self._game.get_square_occupant(self._selected_square):
+        elif self._game.get_square_occupant(square_index(square_string)) == \
+                self._game.get_square_occupant(square_index(self._selected_square)):
             self._selected_square = square_string
         else:
             inactive_player = {"RED": "BLACK", "BLACK": "RED"}[self._game.get_active_player()]
@@ -244,15 +259,20 @@ class VisualGame():
                     if self._ai_player.get_active():
                         self.check_for_quit()
                         prev_pieces = set(self._ai_player.get_opposing_player().get_pieces())
-                        next_move, heuristic = self._ai_player.minimax(self._ai_depth)
+                        if self._ponderer is not None:
+                            next_move, heuristic = self._ponderer.search(self._ai_time_ms)
+                        else:
+                            next_move, heuristic = self._ai_player.search(time_ms=self._ai_time_ms)
+                        next_move = move_to_string(next_move)
                         self._ai_player.make_move(next_move[:2], next_move[2:])
+                        self._ponderer is not None and self._ponderer.start()
                         self._prev_move = next_move[:2]
                         self._curr_move = next_move[2:]
                         new_pieces = self._ai_player.get_opposing_player().get_pieces()
                         print(heuristic)
                         if new_pieces != prev_pieces:
                             self._just_captured_color = self._ai_player.get_opposing_color()
-                            self._just_captured = prev_pieces - new_pieces
+                            self._just_captured = {square_name(piece) for piece in prev_pieces - new_pieces}
                         else:
                             self._just_captured = set()
                         if self._zero_player:
@@ -0,0 +1,445 @@
+import random
+import threading
+import time
+import unittest
+from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+from hasami_shogi.src.model.ai_player import AIPlayer, SearchOptions, SearchLimits
+from hasami_shogi.src.model.player import Player
+from hasami_shogi.src.model.hasami_shogi_utilities import square_index
+
+
+def new_ai_game(moves=(), **ai_options):
+    """
+    Returns a game with the given string moves made, and its BLACK and RED AIPlayers, created with the given keyword
+    arguments and a 1 MB transposition table unless they set one. Shared by the tests of the parallel searches.
+    """
+    game = HasamiShogiGame()
+    ai_options = {"tt_size_mb": 1, **ai_options}
+    ai_black, ai_red = AIPlayer(game, "BLACK", **ai_options), AIPlayer(game, "RED", **ai_options)
+    ai_black.set_opposing_player(ai_red)
+    for move in moves:
+        game.make_move(move[:2], move[2:])
+    return game, ai_black, ai_red
+
+
+class TestMoveOrdering(unittest.TestCase):
+    """Defines tests for the staged move generator and its capture, killer and history ordering."""
+    def test_every_move_once(self):
+        """Asserts that the ordered moves are exactly the valid moves, without repeats."""
+        game, ai_black, ai_red = new_ai_game(["i5e5", "a4e4", "i8e8", "a6e6"])
+        ordered_moves = ai_black.order_available_moves()
+        self.assertEqual(len(ordered_moves), len(set(ordered_moves)))
+        self.assertEqual(ai_black.get_all_valid_moves(), set(ordered_moves))
+
+    def test_captures_then_killers_then_history(self):
+        """
+        Asserts that captures come first, then legal killers of the given ply, then the quiet move next to the enemy
+        with the best history score.
+        """
+        game, ai_black, ai_red = new_ai_game(["i5e5", "a4e4", "i8e8", "a6d6"])
+        capture_move = (square_index("i3"), square_index("e3"))
+        killer_move, history_move = (square_index("i1"), square_index("b1")), (square_index("i2"), square_index("b2"))
+        ai_black.record_cutoff(killer_move, 3, 1)
+        ai_black.record_cutoff((square_index("a1"), square_index("b1")), 3, 1)      # RED's move, not legal here
+        ai_black.history[history_move[0] * 81 + history_move[1]] += 100
+        self.assertEqual([capture_move, killer_move, history_move], ai_black.order_available_moves("BLACK", 1)[:3])
+        self.assertEqual([capture_move, history_move], ai_black.order_available_moves("BLACK", 2)[:2])
+
+    def test_first_move(self):
+        """Asserts that a legal first move is generated before anything else, and an illegal one is skipped."""
+        game, ai_black, ai_red = new_ai_game(["i5e5", "a4e4", "i8e8", "a6d6"])
+        first_move = (square_index("i9"), square_index("h9"))
+        self.assertEqual(first_move, next(ai_black.generate_moves("BLACK", 0, first_move)))
+        generated_moves = list(ai_black.generate_moves("BLACK", 0, first_move))
+        self.assertEqual(1, generated_moves.count(first_move))
+        self.assertEqual(ai_black.get_all_valid_moves(), set(generated_moves))
+        illegal_move = (square_index("a1"), square_index("b1"))
+        self.assertNotIn(illegal_move, ai_black.generate_moves("BLACK", 0, illegal_move))
+
+    def test_quiet_moves_near_enemy_first(self):
+        """Asserts that, without history, quiet moves next to an enemy piece come before the rest."""
+        game, ai_black, ai_red = new_ai_game()
+        ordered_moves = ai_black.order_available_moves()
+        near_enemy = [game.get_game_board().get_adjacent_squares_by_color(move[1], "RED") != set()
+                      for move in ordered_moves]
+        self.assertTrue(near_enemy[0])
+        self.assertEqual(sorted(near_enemy, reverse=True), near_enemy)
+
+    def test_killer_slots(self):
+        """Asserts that each ply keeps its two latest distinct killers, newest first."""
+        game, ai_black, ai_red = new_ai_game()
+        for move in [(1, 2), (3, 4), (3, 4), (5, 6)]:
+            ai_black.record_cutoff(move, 2, 0)
+        self.assertEqual([(5, 6), (3, 4)], ai_black.killers[0])
+        self.assertEqual([(), ()], ai_black.killers[1])
+        self.assertEqual(8, ai_black.history[3 * 81 + 4])
+        ai_black.age_history()
+        self.assertEqual(4, ai_black.history[3 * 81 + 4])
+
+
+class TestQuiescence(unittest.TestCase):
+    """Defines tests for the capture-only quiescence search at the leaves."""
+    def test_quiet_position(self):
+        """Asserts that a position without captures is scored by its static evaluation."""
+        game, ai_black, ai_red = new_ai_game(["i5e5"])
+        self.assertEqual(ai_red.get_heuristic("RED"), ai_red.quiescence(-AIPlayer.SCORE_INFINITY,
+                                                                         AIPlayer.SCORE_INFINITY, "RED"))
+        self.assertEqual(1, ai_red.limits.q_nodes)
+
+    def test_resolves_capture(self):
+        """Asserts that a pending capture is played out, and that the game is left as it was."""
+        game, ai_black, ai_red = new_ai_game(["i5e5", "a4e4", "i8e8", "a6d6"])
+        exp_board, exp_key = game.get_game_board().get_board_list(), game.zobrist_key
+        stand_pat = ai_black.get_heuristic("BLACK")
+        score = ai_black.quiescence(-AIPlayer.SCORE_INFINITY, AIPlayer.SCORE_INFINITY, "BLACK")
+        self.assertGreater(score, stand_pat + AIPlayer.H_MATERIAL / 2)
+        self.assertEqual(exp_board, game.get_game_board().get_board_list())
+        self.assertEqual(exp_key, game.zobrist_key)
+
+    def test_stand_pat_cutoff(self):
+        """Asserts that a static evaluation at or above beta returns without trying any capture."""
+        game, ai_black, ai_red = new_ai_game(["i5e5", "a4e4", "i8e8", "a6d6"])
+        stand_pat = ai_black.get_heuristic("BLACK")
+        self.assertEqual(stand_pat, ai_black.quiescence(stand_pat - 2, stand_pat - 1, "BLACK"))
+        self.assertEqual(1, ai_black.limits.q_nodes)
+
+    def test_delta_pruning(self):
+        """
+        Asserts that captures which cannot reach alpha are skipped, failing low at the most they could score rather
+        than at the static evaluation, so the score is still an upper bound of the full quiescence search.
+        """
+        game, ai_black, ai_red = new_ai_game(["i5e5", "a4e4", "i8e8", "a6d6"])
+        stand_pat = ai_black.get_heuristic("BLACK")
+        full_score = ai_black.quiescence(-AIPlayer.SCORE_INFINITY, AIPlayer.SCORE_INFINITY, "BLACK")
+        ai_black.limits = SearchLimits()
+        alpha = stand_pat + AIPlayer.H_MATERIAL + AIPlayer.DELTA_MARGIN
+        score = ai_black.quiescence(alpha, alpha + 1, "BLACK")
+        self.assertEqual(alpha, score)
+        self.assertGreaterEqual(score, full_score)
+        self.assertEqual(1, ai_black.limits.q_nodes)
+
+    def test_table_keeps_scores(self):
+        """Asserts that a full-width search scores random positions the same with a transposition table as without."""
+        rng = random.Random(3)
+        for _ in range(8):
+            chosen = rng.sample(range(81), rng.randint(8, 16))
+            scores = []
+            for tt_size_mb in (0, 4):
+                game = HasamiShogiGame()
+                game.set_position({"BLACK": chosen[::2], "RED": chosen[1::2]}, "BLACK")
+                ai_black = AIPlayer(game, "BLACK", tt_size_mb=tt_size_mb, options=SearchOptions.none())
+                scores.append(ai_black.search(max_depth=3)[1])
+            self.assertEqual(scores[0], scores[1])
+
+
+def new_exchange_game(red_squares):
+    """
+    Returns a game with BLACK to move, where i6e6 captures e5, and its BLACK and RED AIPlayers. Whether RED can take
+    back e6 depends on the given extra RED squares.
+    """
+    game = HasamiShogiGame()
+    black = ["e4", "i6", "i1", "i9"]
+    red = ["e5", "a1", "a9"] + red_squares
+    if "e8" in red_squares:
+        black.append("e7")
+    game.set_position({"BLACK": [square_index(name) for name in black],
+                       "RED": [square_index(name) for name in red]}, "BLACK")
+    return game, AIPlayer(game, "BLACK", tt_size_mb=1), AIPlayer(game, "RED", tt_size_mb=1)
+
+
+class TestStaticExchange(unittest.TestCase):
+    """Defines tests for static exchange evaluation of captures, and its use in ordering and pruning."""
+    capture_move = (square_index("i6"), square_index("e6"))
+
+    def test_clean_capture(self):
+        """Asserts that a capture that cannot be answered wins its pieces."""
+        game, ai_black, ai_red = new_exchange_game(["e7"])
+        self.assertEqual(1, ai_black.static_exchange(self.capture_move))
+
+    def test_trade(self):
+        """Asserts that a capture answered by taking the capturing piece back is even."""
+        game, ai_black, ai_red = new_exchange_game(["e7", "a5"])
+        self.assertEqual(0, ai_black.static_exchange(self.capture_move))
+        game.make_move_by_index(*self.capture_move)
+        self.assertEqual(((square_index("a5"), square_index("e5")), 1), ai_red.find_recapture(self.capture_move[1],
+                                                                                              "RED"))
+
+    def test_losing_capture(self):
+        """Asserts that a capture answered by a bigger recapture loses material, and is ordered after the killers."""
+        game, ai_black, ai_red = new_exchange_game(["e8", "a5"])
+        exp_board, exp_key = game.get_game_board().get_board_list(), game.zobrist_key
+        self.assertEqual(-1, ai_black.static_exchange(self.capture_move))
+        self.assertEqual(exp_board, game.get_game_board().get_board_list())
+        self.assertEqual(exp_key, game.zobrist_key)
+        killer_move = (square_index("i1"), square_index("b1"))
+        ai_black.record_cutoff(killer_move, 3, 1)
+        ordered_moves = ai_black.order_available_moves("BLACK", 1)
+        self.assertEqual(ordered_moves.index(killer_move) + 1, ordered_moves.index(self.capture_move))
+        self.assertTrue(all(ai_black.static_exchange(move) >= 0
+                            for move in ordered_moves[:ordered_moves.index(killer_move)]))
+
+    def test_quiescence_skips_losing_capture(self):
+        """Asserts that quiescence searches fewer nodes when it skips the losing capture, and scores the same."""
+        game, ai_black, ai_red = new_exchange_game(["e8", "a5"])
+        infinity = AIPlayer.SCORE_INFINITY
+        score = ai_black.quiescence(-infinity, infinity, "BLACK")
+        see_pruned_nodes = ai_black.limits.q_nodes
+        ai_black.options = SearchOptions.none()
+        ai_black.limits = SearchLimits()
+        self.assertEqual(score, ai_black.quiescence(-infinity, infinity, "BLACK"))
+        self.assertGreater(ai_black.limits.q_nodes, see_pruned_nodes)
+
+    def test_matches_played_out_exchange(self):
+        """Asserts that the capture tables shortcut agrees with making the capture and finding the recaptures."""
+        rng = random.Random(6)
+        for _ in range(40):
+            game, ai_black, ai_red = new_ai_game()
+            for _ in range(rng.randint(4, 40)):
+                if game.get_game_state() != "UNFINISHED":
+                    break
+                ai = ai_black if game.get_active_player() == "BLACK" else ai_red
+                for move, _ in ai.find_capture_moves():
+                    game.make_move_by_index(*move)
+                    exp_exchange = ai.get_move_gain() - ai.get_recapture_gain()
+                    game.undo_move()
+                    self.assertEqual(exp_exchange, ai.static_exchange(move))
+                game.make_move_by_index(*rng.choice(sorted(ai.get_all_valid_moves())))
+
+
+class NullMoveStop:
+    """
+    Defines a stop event for a game started from the initial position, set once the search has made a move inside a
+    null move line, where the player to move does not match the number of moves made.
+    """
+    def __init__(self, game):
+        self.game = game
+        self.null_move_length = None
+        self.fired = False
+
+    def is_set(self) -> bool:
+        game = self.game
+        if (len(game.move_log) % 2 == 0) == (game.get_active_player() == "BLACK"):
+            return False
+        if self.null_move_length is None:
+            self.null_move_length = len(game.move_log)
+        self.fired = self.fired or len(game.move_log) > self.null_move_length
+        return self.fired
+
+
+class TestSelectiveSearch(unittest.TestCase):
+    """Defines tests for late move reductions, null move pruning and futility pruning."""
+    def test_each_feature_prunes(self):
+        """Asserts that each feature on its own searches fewer nodes than a full-width search and finds a legal move."""
+        moves = ["i5e5", "a5d5", "i4e4", "a6f6", "e5f5", "a7g7"]
+        game, ai_black, ai_red = new_ai_game(moves)
+        ai_black.options = SearchOptions.none()
+        ai_black.search(max_depth=4)
+        full_width_nodes = ai_black.limits.nodes
+        for options in [SearchOptions(null_move_pruning=False, futility_pruning=False, see_pruning=False),
+                        SearchOptions(late_move_reductions=False, futility_pruning=False, see_pruning=False),
+                        SearchOptions(late_move_reductions=False, null_move_pruning=False, see_pruning=False)]:
+            game, ai_black, ai_red = new_ai_game(moves)
+            ai_black.options = options
+            move, _ = ai_black.search(max_depth=4)
+            self.assertIn(move, ai_black.get_all_valid_moves())
+            self.assertLess(ai_black.limits.nodes, full_width_nodes)
+
+    def test_none(self):
+        """Asserts that SearchOptions.none turns every feature off, and that AIPlayer turns them all on by default."""
+        options = SearchOptions.none()
+        self.assertFalse(options.late_move_reductions or options.null_move_pruning or options.futility_pruning
+                         or options.see_pruning)
+        options = new_ai_game()[1].options
+        self.assertTrue(options.late_move_reductions and options.null_move_pruning and options.futility_pruning
+                        and options.see_pruning)
+
+    def assert_game_restored(self, game, exp_board, exp_key, exp_counts, exp_player):
+        self.assertEqual(exp_board, game.get_game_board().get_board_list())
+        self.assertEqual(exp_key, game.zobrist_key)
+        self.assertEqual(exp_counts, game._position_counts)
+        self.assertEqual(exp_player, game.get_active_player())
+
+    def test_abort_restores_side_to_move(self):
+        """Asserts that a search cut off at any point, including inside a null move, leaves the game as it was."""
+        for moves, budgets in [(["i5e5", "a4e4"], range(100, 3000, 97)),
+                               (["i5e5", "a5d5", "i4e4", "a4d4", "i6e6", "a6d6"], [13000])]:
+            game, ai_black, ai_red = new_ai_game(moves)
+            expected = (game.get_game_board().get_board_list(), game.zobrist_key, dict(game._position_counts),
+                        "BLACK")
+            for max_nodes in budgets:
+                ai_black.search(max_nodes=max_nodes)
+                self.assert_game_restored(game, *expected)
+            ai_black.transposition_table.clear()
+            ai_black.search(max_depth=6, stop_event=NullMoveStop(game))
+            self.assertTrue(ai_black.limits.stop_event.fired)
+            self.assert_game_restored(game, *expected)
+
+
+class TestSearch(unittest.TestCase):
+    """Defines tests for the budgeted iterative deepening search."""
+    def assert_game_restored(self, game, exp_board, exp_key, exp_log_length):
+        self.assertEqual(exp_board, game.get_game_board().get_board_list())
+        self.assertEqual(exp_key, game.zobrist_key)
+        self.assertEqual(exp_log_length, len(game.move_log))
+
+    def test_matches_fixed_depth(self):
+        """Asserts that deepening to depth 2 gives the same score as a fixed depth 2 search."""
+        game, ai_black, ai_red = new_ai_game(["i5e5"])
+        exp_score = ai_red.minimax(2)[1]
+        self.assertEqual(exp_score, ai_red.search(max_depth=2)[1])
+        self.assertEqual(2, ai_red.depth_reached)
+
+    def test_node_limit(self):
+        """Asserts that a node limit stops the search mid-iteration and leaves the game as it was."""
+        game, ai_black, ai_red = new_ai_game(["i5e5", "a4e4"])
+        exp_board, exp_key = game.get_game_board().get_board_list(), game.zobrist_key
+        move, _ = ai_black.search(max_nodes=500)
+        self.assertIn(move, ai_black.get_all_valid_moves())
+        self.assertEqual(501, ai_black.limits.nodes)
+        self.assertLess(ai_black.depth_reached, 3)
+        self.assert_game_restored(game, exp_board, exp_key, 2)
+        self.assertEqual("BLACK", game.get_active_player())
+        self.assertIs(ai_red, ai_black.get_opposing_player())
+
+    def test_time_limit(self):
+        """Asserts that the search returns a legal move close to its time budget."""
+        game, ai_black, ai_red = new_ai_game()
+        start = time.perf_counter()
+        move, _ = ai_black.search(time_ms=200)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertIn(move, ai_black.get_all_valid_moves())
+        self.assertGreaterEqual(ai_black.depth_reached, 1)
+
+    def test_stop_event(self):
+        """Asserts that a stop flag set before the search still yields a legal move."""
+        game, ai_black, ai_red = new_ai_game(["i5e5"])
+        stop_event = threading.Event()
+        stop_event.set()
+        move, _ = ai_red.search(stop_event=stop_event)
+        self.assertIn(move, ai_red.get_all_valid_moves())
+        self.assertEqual(0, ai_red.depth_reached)
+
+    def test_stop_event_from_thread(self):
+        """Asserts that another thread can stop an unbounded search."""
+        game, ai_black, ai_red = new_ai_game()
+        exp_board, exp_key = game.get_game_board().get_board_list(), game.zobrist_key
+        stop_event = threading.Event()
+        threading.Timer(0.2, stop_event.set).start()
+        move, _ = ai_black.search(stop_event=stop_event)
+        self.assertIn(move, ai_black.get_all_valid_moves())
+        self.assert_game_restored(game, exp_board, exp_key, 0)
+
+    def test_aspiration_window(self):
+        """Asserts that a root window around a wrong guess is widened to the full-window score."""
+        game, ai_black, ai_red = new_ai_game(["i5e5", "a4e4"])
+        exp_move, exp_score = ai_black.negamax(3, -AIPlayer.SCORE_INFINITY, AIPlayer.SCORE_INFINITY, "BLACK")
+        for guess in [exp_score - 1000, exp_score, exp_score + 1000]:
+            ai_black.transposition_table.clear()
+            self.assertEqual(exp_score, ai_black.aspiration_search(3, guess, ())[1])
+
+    def test_null_window_search(self):
+        """Asserts that principal variation search scores the same as a plain search without the table."""
+        game, ai_black, ai_red = new_ai_game(["i5e5", "a4e4", "i8e8", "a6e6"])
+        plain_ai = AIPlayer(game, "BLACK", tt_size_mb=0)
+        self.assertEqual(plain_ai.minimax(3)[1], ai_black.minimax(3)[1])
+
+    def test_human_opponent(self):
+        """Asserts that the search does not need an AIPlayer for the opponent."""
+        game = HasamiShogiGame()
+        ai_black, human_red = AIPlayer(game, "BLACK", tt_size_mb=1), Player(game, "RED")
+        ai_black.set_opposing_player(human_red)
+        game.make_move("i5", "e5")
+        human_red.make_move("a4", "e4")
+        move, _ = ai_black.search(max_depth=2)
+        self.assertIn(move, ai_black.get_all_valid_moves())
+        self.assertIs(human_red, ai_black.get_opposing_player())
+
+    def test_evaluation_by_color(self):
+        """Asserts that the material and center terms are scored for the given color."""
+        game, ai_black, ai_red = new_ai_game(["i5e5"])
+        self.assertEqual(ai_black.get_heuristic("RED"), ai_red.get_heuristic())
+        self.assertEqual(ai_black.get_center_heuristic("RED"), ai_red.get_center_heuristic())
+        self.assertEqual(ai_red.find_capture_moves("BLACK"), ai_black.find_capture_moves())
+
+    def test_winning_capture(self):
+        """Asserts that a capture that wins the game scores H_WIN less the plies to it, for the winner and the loser."""
+        game, ai_black, ai_red = new_ai_game()
+        game.set_position({"BLACK": [square_index("e5"), square_index("c1"), square_index("b2")],
+                           "RED": [square_index("d5"), square_index("h8")]}, "BLACK")
+        for depth in (1, 3):
+            ai_black.transposition_table.clear()
+            self.assertEqual(((square_index("c1"), square_index("c5")), AIPlayer.H_WIN - 1), ai_black.minimax(depth))
+        game.make_move("c1", "c5")
+        self.assertEqual((AIPlayer.H_WIN - 2, 2 - AIPlayer.H_WIN), (ai_black.get_heuristic(ply=2),
+                                                                   ai_red.get_heuristic(ply=2)))
+
+    def test_finished_game(self):
+        """Asserts that searching a finished game returns no move."""
+        game, ai_black, ai_red = new_ai_game()
+        game.set_game_state("BLACK_WON")
+        self.assertEqual((), ai_black.search(time_ms=100)[0])
+
+
+class TestDrawScores(unittest.TestCase):
+    """Defines tests for the scoring of drawn games and repetitions with contempt."""
+    def test_drawn_game(self):
+        """Asserts that a drawn game scores -contempt for the AIPlayer and contempt for its opponent."""
+        game, ai_black, ai_red = new_ai_game()
+        game.set_game_state("DRAW")
+        self.assertEqual((-25, 25), (ai_black.get_heuristic(), ai_black.get_heuristic("RED")))
+        self.assertEqual(((), -25), ai_black.minimax(2))
+
+    def test_contempt_steers_repetition(self):
+        """Asserts that the search repeats a position if it seeks draws and avoids it if it has contempt for them."""
+        repeating_move = (square_index("b1"), square_index("a1"))
+        for contempt, repeats in [(-1000, True), (1000, False)]:
+            game = HasamiShogiGame()
+            ai_red = AIPlayer(game, "RED", tt_size_mb=0, options=SearchOptions(contempt=contempt))
+            for move in ["i1h1", "a1b1", "h1i1"]:
+                game.make_move(move[:2], move[2:])
+            move, score = ai_red.minimax(2)
+            self.assertEqual(repeats, move == repeating_move)
+            self.assertEqual(repeats, score == -contempt)
+
+
+class TestIncrementalEvaluation(unittest.TestCase):
+    """Defines tests for the material and center terms kept up to date through make and undo."""
+    @staticmethod
+    def from_scratch_heuristic(game, color):
+        """Returns the evaluation of get_heuristic recomputed by visiting every square."""
+        opp_color = {"RED": "BLACK", "BLACK": "RED"}[color]
+        board = game.get_game_board()
+        counts = {"RED": 0, "BLACK": 0, "NONE": 0}
+        centers = {"RED": 0, "BLACK": 0, "NONE": 0}
+        for square in range(81):
+            row, col = divmod(square, 9)
+            counts[board.get_square(square)] += 1
+            centers[board.get_square(square)] += (8 - row) * row * (8 - col) * col
+        if game.get_game_state() != "UNFINISHED":
+            return AIPlayer.H_WIN if game.get_game_state()[:-4] == color else -AIPlayer.H_WIN
+        return (counts[color] - counts[opp_color]) * AIPlayer.H_MATERIAL \
+            + (centers[color] - centers[opp_color]) * AIPlayer.H_CENTER
+
+    def test_random_make_undo(self):
+        """Asserts that the evaluation matches a from-scratch one after random moves, captures, undos and set up
+        positions."""
+        rng = random.Random(4)
+        for _ in range(15):
+            game = HasamiShogiGame()
+            ai_black, ai_red = AIPlayer(game, "BLACK", tt_size_mb=0), AIPlayer(game, "RED", tt_size_mb=0)
+            if rng.random() < 0.3:
+                chosen = rng.sample(range(81), rng.randint(4, 18))
+                half = len(chosen) // 2
+                game.set_position({"BLACK": chosen[:half], "RED": chosen[half:]}, rng.choice(["RED", "BLACK"]))
+            for _ in range(rng.randint(1, 60)):
+                moves = sorted(ai_black.get_all_valid_moves(game.get_active_player()))
+                if game.move_log and rng.random() < 0.3:
+                    game.undo_move()
+                elif game.get_game_state() == "UNFINISHED" and moves:
+                    game.make_move_by_index(*rng.choice(moves))
+                for ai in (ai_black, ai_red):
+                    self.assertEqual(self.from_scratch_heuristic(game, ai.get_color()), ai.get_heuristic())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import threading
+import unittest
+
+from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+from hasami_shogi.src.model.ai_player import AIPlayer
+from hasami_shogi.src.model.eval_cache import EvaluationCache
+
+
+class TestEvaluationCache(unittest.TestCase):
+    """Defines tests for the EvaluationCache class."""
+    def setUp(self):
+        self.cache = EvaluationCache(1)
+
+    def test_size(self):
+        """Asserts that the cache holds the largest power-of-two number of entries that fits."""
+        self.assertEqual(2 ** 16, len(self.cache))
+        self.assertEqual(2 ** 20, self.cache.get_size_bytes())
+        self.assertEqual(2, len(EvaluationCache(0)))
+
+    def test_round_trip(self):
+        """Asserts that stored scores are returned for their key and other keys miss."""
+        for key, score in [(0x1234, 228.0), (0xFFFFFFFFFFFFFFFF, -312.5), (0, 0.0)]:
+            self.cache.store(key, score)
+            self.assertEqual(score, self.cache.probe(key))
+        self.assertIsNone(self.cache.probe(0x4321))
+        self.assertEqual((3, 1, 3), (self.cache.hits, self.cache.misses, self.cache.stores))
+        self.assertEqual(0.75, self.cache.get_stats()["hit_rate"])
+        self.cache.clear()
+        self.assertIsNone(self.cache.probe(0x1234))
+        self.assertEqual((0, 1), (self.cache.hits, self.cache.misses))
+
+    def test_least_recently_used_eviction(self):
+        """Asserts that a store into a full bucket evicts the entry probed or stored least recently."""
+        num_buckets = len(self.cache) // 2
+        first, second, third = 0x55, 0x55 + num_buckets, 0x55 + 2 * num_buckets
+        self.cache.store(first, 1.0)
+        self.cache.store(second, 2.0)
+        self.assertEqual(1.0, self.cache.probe(first))
+        self.cache.store(third, 3.0)
+        self.assertEqual((1.0, None, 3.0), tuple(self.cache.probe(key) for key in (first, second, third)))
+
+    def test_torn_entry(self):
+        """Asserts that an entry whose check word and data word come from different stores is not returned."""
+        key = 0x1234
+        self.cache.store(key, 228.0)
+        index = (key & self.cache.bucket_mask) << 1
+        self.cache.data[index] = self.cache.data[index] + 1
+        self.assertIsNone(self.cache.probe(key))
+
+    def test_threads(self):
+        """Asserts that threads storing and probing one cache only read back the scores stored for their keys."""
+        cache = EvaluationCache(0.001)
+        wrong = []
+
+        def run(offset):
+            for key in range(offset, offset + 20000):
+                cache.store(key, key % 1000)
+                probed = cache.probe(key - 3)
+                if probed is not None and probed != (key - 3) % 1000:
+                    wrong.append(key)
+
+        threads = [threading.Thread(target=run, args=(offset,)) for offset in (0, 7, 13)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], wrong)
+        self.assertGreater(cache.hits, 0)
+
+
+class TestSearchWithCache(unittest.TestCase):
+    """Defines tests for AIPlayers sharing an evaluation cache."""
+    def test_shared_between_colors(self):
+        """Asserts that an evaluation cached by one color's AIPlayer is read by the other's, from its point of view."""
+        game = HasamiShogiGame()
+        cache = EvaluationCache(1)
+        ai_black, ai_red = AIPlayer(game, "BLACK", eval_cache=cache), AIPlayer(game, "RED", eval_cache=cache)
+        ai_black.set_opposing_player(ai_red)
+        for move in ["i5e5", "a4e4", "i8e8"]:
+            game.make_move(move[:2], move[2:])
+        black_score = ai_black.get_heuristic()
+        self.assertEqual((0, 1), (cache.hits, cache.misses))
+        self.assertEqual(-black_score, ai_red.get_heuristic())
+        self.assertEqual(black_score, ai_red.get_heuristic("BLACK"))
+        self.assertEqual((2, 1), (cache.hits, cache.misses))
+        self.assertEqual(black_score, AIPlayer(game, "BLACK").get_heuristic())
+
+    def test_same_search_result(self):
+        """Asserts that searching with a cache gives the same move, score and node count as without."""
+        results = []
+        for cache in (None, EvaluationCache(1)):
+            game = HasamiShogiGame()
+            ai_black, ai_red = AIPlayer(game, "BLACK", eval_cache=cache), AIPlayer(game, "RED", eval_cache=cache)
+            ai_black.set_opposing_player(ai_red)
+            for move in ["i5e5", "a4e4"]:
+                game.make_move(move[:2], move[2:])
+            results.append((ai_black.minimax(3), ai_black.limits.nodes))
+        self.assertEqual(results[0], results[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 from hasami_shogi.src.model.game_board import GameBoard
 import hasami_shogi.src.model.hasami_shogi_utilities as utils
+import hasami_shogi.src.model.board_geometry as geometry
 
 
 class TestInit(unittest.TestCase):
@@ -79,13 +80,13 @@ class TestSquareValues(unittest.TestCase):
     def test_get_square(self):
         """Asserts that the correct square values are retrieved at the correct square strings."""
         new_board = GameBoard()
-        test1 = new_board.get_square("a1")
-        test2 = new_board.get_square("a5")
-        test3 = new_board.get_square("a9")
-        test4 = new_board.get_square("e5")
-        test5 = new_board.get_square("i1")
-        test6 = new_board.get_square("i5")
-        test7 = new_board.get_square("i9")
+        test1 = new_board.get_square(utils.square_index("a1"))
+        test2 = new_board.get_square(utils.square_index("a5"))
+        test3 = new_board.get_square(utils.square_index("a9"))
+        test4 = new_board.get_square(utils.square_index("e5"))
+        test5 = new_board.get_square(utils.square_index("i1"))
+        test6 = new_board.get_square(utils.square_index("i5"))
+        test7 = new_board.get_square(utils.square_index("i9"))
 
         self.assertEqual("RED", test1)
         self.assertEqual("RED", test2)
@@ -98,14 +99,50 @@ class TestSquareValues(unittest.TestCase):
     def test_set_square(self):
         """Asserts that the correct square is set to the correct value."""
         new_board = GameBoard()
-        new_board.set_square("e5", "BLACK")
-        new_board.set_square("a1", "NONE")
-        test1 = new_board.get_square("e5")
-        test2 = new_board.get_square("a1")
+        new_board.set_square(utils.square_index("e5"), "BLACK")
+        new_board.set_square(utils.square_index("a1"), "NONE")
+        test1 = new_board.get_square(utils.square_index("e5"))
+        test2 = new_board.get_square(utils.square_index("a1"))
         self.assertEqual("BLACK", test1)
         self.assertEqual("NONE", test2)
 
 
+class TestPiecesByColor(unittest.TestCase):
+    """Defines tests for the incrementally maintained squares of each color."""
+    def assert_pieces_match_scan(self, board):
+        for color in ["RED", "BLACK", "NONE"]:
+            exp_squares = {square for square in utils.ALL_SQUARES if board.get_square(square) == color}
+            self.assertEqual(exp_squares, set(board.get_squares_by_color(color)))
+            self.assertEqual(len(exp_squares), board.get_num_pieces(color))
+
+    def test_initial_pieces(self):
+        """Asserts that each color starts with its nine pieces, in board order."""
+        new_board = GameBoard()
+        self.assertEqual(list(range(9)), list(new_board.get_squares_by_color("RED")))
+        self.assertEqual(list(range(72, 81)), list(new_board.get_squares_by_color("BLACK")))
+        self.assert_pieces_match_scan(new_board)
+
+    def test_set_square_updates_pieces(self):
+        """Asserts that the views follow set_square, including setting a square to its current value."""
+        new_board = GameBoard()
+        black_pieces = new_board.get_squares_by_color("BLACK")
+        new_board.set_square(utils.square_index("i5"), "NONE")
+        new_board.set_square(utils.square_index("e5"), "BLACK")
+        new_board.set_square(utils.square_index("a1"), "BLACK")
+        new_board.set_square(utils.square_index("a2"), "RED")
+        self.assertIn(utils.square_index("e5"), black_pieces)
+        self.assertNotIn(utils.square_index("i5"), black_pieces)
+        self.assertEqual(10, new_board.get_num_pieces("BLACK"))
+        self.assertEqual(8, new_board.get_num_pieces("RED"))
+        self.assert_pieces_match_scan(new_board)
+
+    def test_views_are_read_only(self):
+        """Asserts that callers cannot modify the pieces through the returned view."""
+        red_pieces = GameBoard().get_squares_by_color("RED")
+        self.assertFalse(hasattr(red_pieces, "add"))
+        self.assertFalse(hasattr(red_pieces, "remove"))
+
+
 class TestBuildSquareStringRange(unittest.TestCase):
     """Defines tests for the build square string range function."""
     def test_horizontal(self):
@@ -189,5 +226,50 @@ class TestBuildSquareStringRange(unittest.TestCase):
         self.assertEqual(["e4"], test)
 
 
+class TestIntegerSquares(unittest.TestCase):
+    """Defines tests for the integer square helpers and their string adapters."""
+    def test_round_trip(self):
+        """Asserts that every square string converts to an integer and back."""
+        for square_string in utils.all_squares_in_order:
+            self.assertEqual(square_string, utils.square_name(utils.square_index(square_string)))
+        self.assertEqual([0, 8, 40, 72, 80], [utils.square_index(sq) for sq in ["a1", "a9", "e5", "i1", "i9"]])
+
+    def test_moves(self):
+        """Asserts that moves convert between (from, to) tuples and 4-character strings."""
+        self.assertEqual((76, 40), utils.string_to_move("i5e5"))
+        self.assertEqual("i5e5", utils.move_to_string((76, 40)))
+
+    def test_build_square_range(self):
+        """Asserts that integer ranges step along rows and columns in either direction."""
+        self.assertEqual([0, 1, 2, 3], utils.build_square_range(0, 3))
+        self.assertEqual([76, 67, 58], utils.build_square_range(76, 58))
+        self.assertIsNone(utils.build_square_range(0, 10))
+
+    def test_next_and_adjacent_squares(self):
+        """Asserts that neighbour helpers stay on the board."""
+        self.assertEqual((1, 9), utils.get_adjacent_squares(0))
+        self.assertEqual((31, 39, 41, 49), utils.get_adjacent_squares(40))
+        self.assertEqual(2, utils.get_next_square(0, 1))
+        self.assertIsNone(utils.get_next_square(1, 0))
+        self.assertIsNone(utils.get_next_square(7, 8))
+        self.assertIsNone(utils.get_next_square(8, 9))
+
+
+class TestBoardGeometry(unittest.TestCase):
+    """Defines tests for the precomputed geometry tables."""
+    def test_rays(self):
+        """Asserts that rays run from the square to the board edge, nearest first."""
+        self.assertEqual((31, 22, 13, 4), geometry.RAYS[40][geometry.UP])
+        self.assertEqual((41, 42, 43, 44), geometry.RAYS[40][geometry.RIGHT])
+        self.assertEqual((), geometry.RAYS[0][geometry.LEFT])
+
+    def test_corner_captures(self):
+        """Asserts that each square next to a corner knows its capture partner."""
+        self.assertEqual((9, 0), geometry.CORNER_CAPTURES[utils.square_index("a2")])
+        self.assertEqual((71, 80), geometry.CORNER_CAPTURES[utils.square_index("i8")])
+        self.assertIsNone(geometry.CORNER_CAPTURES[utils.square_index("b2")])
+        self.assertEqual(72, GameBoard.find_closest_corner(utils.square_index("h2")))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,9 @@
+import random
 import unittest
 from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+from hasami_shogi.src.model.hasami_shogi_utilities import square_index
+import hasami_shogi.src.model.zobrist as zobrist
+import hasami_shogi.src.model.board_geometry as geometry
 
 
 def run_moves(game, move_list):
@@ -7,11 +11,18 @@ def run_moves(game, move_list):
     return [game.make_move(move[:2], move[2:]) for move in move_list]
 
 
+def random_legal_move(game, rng):
+    """Returns a random legal (from, to) move for the active player of the given game."""
+    active_pieces = sorted(game.get_game_board().get_squares_by_color(game.get_active_player()))
+    moves = sorted(move for piece in active_pieces for move in game.return_valid_moves(piece))
+    return rng.choice(moves)
+
+
 def set_board(game, square_val_dict):
     """Takes game object and dict of {COLOR:[square_strings]}."""
     for color in square_val_dict.keys():
         for square_string in square_val_dict[color]:
-            game.set_square_occupant(square_string, color)
+            game.set_square_occupant(square_index(square_string), color)
 
 
 class TestInit(unittest.TestCase):
@@ -58,11 +69,11 @@ class TestInit(unittest.TestCase):
     def test_square_occupant(self):
         """Asserts that the square occupant can be set and retrieved."""
         new_game = HasamiShogiGame()
-        test1_black = new_game.get_square_occupant("i5")
-        test1_none = new_game.get_square_occupant("e5")
-        test1_red = new_game.get_square_occupant("a4")
-        new_game.set_square_occupant("d3", "BLACK")
-        test2 = new_game.get_square_occupant("d3")
+        test1_black = new_game.get_square_occupant(square_index("i5"))
+        test1_none = new_game.get_square_occupant(square_index("e5"))
+        test1_red = new_game.get_square_occupant(square_index("a4"))
+        new_game.set_square_occupant(square_index("d3"), "BLACK")
+        test2 = new_game.get_square_occupant(square_index("d3"))
 
         self.assertEqual("BLACK", test1_black)
         self.assertEqual("NONE", test1_none)
@@ -89,10 +100,10 @@ class TestWrongMakeMove(unittest.TestCase):
     def test_none_to_inactive(self):
         """Asserts that moving NONE to the inactive player returns False."""
         new_game = HasamiShogiGame()
-        new_game.set_square_occupant("c5", "RED")
-        new_game.set_square_occupant("g5", "RED")
-        new_game.set_square_occupant("e2", "RED")
-        new_game.set_square_occupant("e8", "RED")
+        new_game.set_square_occupant(square_index("c5"), "RED")
+        new_game.set_square_occupant(square_index("g5"), "RED")
+        new_game.set_square_occupant(square_index("e2"), "RED")
+        new_game.set_square_occupant(square_index("e8"), "RED")
         exp_board = list(new_game.get_game_board().get_board_list())
         none_to_red_moves = ["e5c5", "e5g5", "e5e2", "e5e8"]
 
@@ -109,10 +120,10 @@ class TestWrongMakeMove(unittest.TestCase):
     def test_none_to_active(self):
         """Asserts that moving NONE to the active player returns False."""
         new_game = HasamiShogiGame()
-        new_game.set_square_occupant("c5", "BLACK")
-        new_game.set_square_occupant("g5", "BLACK")
-        new_game.set_square_occupant("e2", "BLACK")
-        new_game.set_square_occupant("e8", "BLACK")
+        new_game.set_square_occupant(square_index("c5"), "BLACK")
+        new_game.set_square_occupant(square_index("g5"), "BLACK")
+        new_game.set_square_occupant(square_index("e2"), "BLACK")
+        new_game.set_square_occupant(square_index("e8"), "BLACK")
         exp_board = list(new_game.get_game_board().get_board_list())
         none_to_black_moves = ["e5c5", "e5g5", "e5e2", "e5e8"]
 
@@ -261,11 +272,11 @@ class TestNormalGames(unittest.TestCase):
         exp_red_multi = {"NONE": ["i2"], "BLACK": ["g2", "b2"]}
 
         self.template(moves_black_single, [True]*6, exp_black_single, "BLACK", 1, 0, "UNFINISHED")
-        # self.template(moves_red_single, [True]*5, exp_red_single, "RED", 0, 1, "UNFINISHED")
-        # self.template(moves_black_double, [True]*6, exp_black_double, "BLACK", 2, 0, "UNFINISHED")
-        # self.template(moves_red_double, [True]*9, exp_red_double, "RED", 0, 2, "UNFINISHED")
-        # self.template(moves_black_multi, [True]*2, exp_black_multi, "BLACK", 5, 0, "UNFINISHED", setup_black_multi)
-        # self.template(moves_red_multi, [True], exp_red_multi, "RED", 0, 4, "UNFINISHED", setup_red_multi)
+        self.template(moves_red_single, [True]*5, exp_red_single, "RED", 0, 1, "UNFINISHED")
+        self.template(moves_black_double, [True]*6, exp_black_double, "BLACK", 2, 0, "UNFINISHED")
+        self.template(moves_red_double, [True]*9, exp_red_double, "RED", 0, 2, "UNFINISHED")
+        self.template(moves_black_multi, [True]*2, exp_black_multi, "BLACK", 5, 0, "UNFINISHED", setup_black_multi)
+        self.template(moves_red_multi, [True], exp_red_multi, "RED", 0, 4, "UNFINISHED", setup_red_multi)
 
     def test_corner_cap(self):
         """Asserts that corner captures work properly."""
@@ -306,20 +317,20 @@ class TestNormalGames(unittest.TestCase):
 
     def test_double_cap_corner(self):
         """Asserts that a double capture involving a corner behaves as intended."""
-        # board_setup_bot_right = {"RED": ["i8", "h7", "d9"], "BLACK": ["e9", "f8", "g9"]}
-        # moves_bot_right = ["f8f9", "h7h9"]
-        # exp_board_bot_right = {"RED": ["d9", "h9", "i8"], "NONE": ["i9"]}
-        # self.template(moves_bot_right, [True]*2, exp_board_bot_right, "BLACK", 4, 0, "UNFINISHED", board_setup_bot_right)
-
-        # board_setup_top_right = {"RED": ["c9", "d9"], "BLACK": ["a8", "b7", "e9"]}
-        # moves_top_right = ["b7b9"]
-        # exp_board_top_right = {"BLACK": ["a8", "b9", "e9"], "NONE": ["a9"]}
-        # self.template(moves_top_right, [True], exp_board_top_right, "RED", 0, 3, "UNFINISHED", board_setup_top_right)
+        board_setup_bot_right = {"RED": ["i8", "h7", "d9"], "BLACK": ["e9", "f8", "g9"]}
+        moves_bot_right = ["f8f9", "h7h9"]
+        exp_board_bot_right = {"RED": ["d9", "h9", "i8"], "NONE": ["i9"]}
+        self.template(moves_bot_right, [True]*2, exp_board_bot_right, "BLACK", 4, 0, "UNFINISHED", board_setup_bot_right)
+
+        board_setup_top_right = {"RED": ["c9", "d9"], "BLACK": ["a8", "b7", "e9"]}
+        moves_top_right = ["b7b9"]
+        exp_board_top_right = {"BLACK": ["a8", "b9", "e9"], "NONE": ["a9"]}
+        self.template(moves_top_right, [True], exp_board_top_right, "RED", 0, 3, "UNFINISHED", board_setup_top_right)
         #
-        # board_setup_top_left = {"RED": ["b2", "d1"], "BLACK": ["a1", "c2"]}
-        # moves_top_left = ["c2c1", "b2b1"]
-        # exp_board_top_left = {"NONE": ["a1"], "RED": ["b1", "d1"]}
-        # self.template(moves_top_left, [True]*2, exp_board_top_left, "BLACK", 2, 0, "UNFINISHED", board_setup_top_left)
+        board_setup_top_left = {"RED": ["b2", "d1"], "BLACK": ["a1", "c2"]}
+        moves_top_left = ["c2c1", "b2b1"]
+        exp_board_top_left = {"NONE": ["a1"], "RED": ["b1", "d1"]}
+        self.template(moves_top_left, [True]*2, exp_board_top_left, "BLACK", 2, 0, "UNFINISHED", board_setup_top_left)
         #
         board_setup_bot_left = {"RED": ["b1", "c1", "d1", "e1", "f1", "g1", "i1"], "BLACK": ["a1", "h9"]}
         moves_bot_left = ["h9h1"]
@@ -445,5 +456,285 @@ class TestWinCases(TestNormalGames):
         self.template(moves, [True]*3, exp_board, "RED", 0, 9, "BLACK_WON", board_setup)
 
 
+class TestMoveGeneration(unittest.TestCase):
+    """Defines tests for the occupancy-indexed sliding move tables."""
+    def brute_force_reachable(self, game, square):
+        """Walks each ray until it meets a piece."""
+        output = set()
+        for ray in geometry.RAYS[square]:
+            for target in ray:
+                if game.get_square_occupant(target) != "NONE":
+                    break
+                output.add(target)
+        return output
+
+    def test_reachable_squares(self):
+        """Asserts that table lookups match walking the rays, over random games."""
+        rng = random.Random(5)
+        for _ in range(10):
+            game = HasamiShogiGame()
+            for _ in range(30):
+                if game.get_game_state() != "UNFINISHED":
+                    break
+                for square in geometry.SQUARES:
+                    self.assertEqual(self.brute_force_reachable(game, square), set(game.get_reachable_squares(square)))
+                game.make_move_by_index(*random_legal_move(game, rng))
+
+    def test_blocking_squares(self):
+        """Asserts that the pieces able to slide onto a square are found along its row and column."""
+        game = HasamiShogiGame()
+        set_board(game, {"BLACK": ["e2"], "RED": ["b5", "e8"]})
+        exp_blockers = {square_index(square) for square in ["e2", "e8", "b5", "i5"]}
+        self.assertEqual(exp_blockers, set(game.get_blocking_squares(square_index("e5"))))
+
+    def test_path_is_clear(self):
+        """Asserts that pieces cannot slide through or onto other pieces."""
+        game = HasamiShogiGame()
+        set_board(game, {"RED": ["e5"]})
+        self.assertTrue(game.path_is_clear(square_index("i5"), square_index("f5")))
+        self.assertFalse(game.path_is_clear(square_index("i5"), square_index("e5")))
+        self.assertFalse(game.path_is_clear(square_index("i5"), square_index("d5")))
+        self.assertFalse(game.path_is_clear(square_index("i5"), square_index("i6")))
+
+
+class TestCaptureTables(unittest.TestCase):
+    """Defines tests for the line-pattern capture tables, cross-checked against walking rays and against the
+    CaptureCluster implementation."""
+    @staticmethod
+    def brute_force_captures(game, square, color):
+        """Walks each ray from the square, collecting enemy runs closed off by a piece of the given color."""
+        output = set()
+        for ray in geometry.RAYS[square]:
+            run = []
+            for target in ray:
+                occupant = game.get_square_occupant(target)
+                if occupant == "NONE":
+                    break
+                if occupant == color:
+                    output |= set(run)
+                    break
+                run.append(target)
+        return output
+
+    def test_against_clusters(self):
+        """Asserts that every move of random games captures exactly what the cluster collection reports."""
+        rng = random.Random(11)
+        corners = {0, 8, 72, 80}
+        for _ in range(15):
+            game = HasamiShogiGame(track_clusters=True)
+            for _ in range(60):
+                if game.get_game_state() != "UNFINISHED":
+                    break
+                game.make_move_by_index(*random_legal_move(game, rng))
+                linear_captures = set(game.move_log[-1].cap_squares) - corners
+                self.assertEqual(game.clusters.captured_squares, linear_captures)
+
+    def test_against_rays(self):
+        """Asserts that table captures and threats match walking rays, over random games without clusters."""
+        rng = random.Random(12)
+        for _ in range(10):
+            game = HasamiShogiGame(track_clusters=False)
+            for _ in range(40):
+                if game.get_game_state() != "UNFINISHED":
+                    break
+                for color in ["BLACK", "RED"]:
+                    exp_threats = {}
+                    for square in game.get_game_board().get_squares_by_color("NONE"):
+                        num_captured = len(self.brute_force_captures(game, square, color))
+                        if num_captured:
+                            exp_threats[square] = num_captured
+                    self.assertEqual(exp_threats, game.get_capture_threats(color))
+                move = random_legal_move(game, rng)
+                exp_captures = self.brute_force_captures(game, move[1], game.get_active_player())
+                game.make_move_by_index(*move)
+                self.assertEqual(exp_captures, set(game.move_log[-1].cap_squares) - {0, 8, 72, 80})
+
+
+class TestClusterCollection(unittest.TestCase):
+    """Defines tests for the id-keyed CapClusterCollection indexes."""
+    def assert_indexes_consistent(self, collection):
+        """Asserts that every index holds exactly the references implied by all_clusters."""
+        num_member_refs = num_border_refs = 0
+        for cluster_id, cluster in collection.all_clusters.items():
+            self.assertEqual(cluster_id, cluster.cluster_id)
+            self.assertIs(cluster, collection.clusters_by_color[cluster.color][cluster_id])
+            for member in cluster.squares:
+                self.assertIs(cluster, collection.clusters_by_member[member][cluster_id])
+                num_member_refs += 1
+            for border in cluster.get_borders() - {None}:
+                self.assertIs(cluster, collection.clusters_by_border[border][cluster_id])
+                num_border_refs += 1
+        self.assertEqual(num_member_refs, sum(len(clusters) for clusters in collection.clusters_by_member.values()))
+        self.assertEqual(num_border_refs, sum(len(clusters) for clusters in collection.clusters_by_border.values()))
+        for color in ["RED", "BLACK"]:
+            self.assertEqual(set(), collection.vulnerable_clusters[color].keys() - collection.all_clusters.keys())
+
+    def test_indexes_after_random_games(self):
+        """Asserts that the indexes stay consistent and every piece is in one cluster per direction."""
+        rng = random.Random(13)
+        for _ in range(10):
+            game = HasamiShogiGame(track_clusters=True)
+            for _ in range(60):
+                if game.get_game_state() != "UNFINISHED":
+                    break
+                game.make_move_by_index(*random_legal_move(game, rng))
+                self.assert_indexes_consistent(game.clusters)
+            for square in range(81):
+                exp_num_clusters = 0 if game.get_square_occupant(square) == "NONE" else 2
+                self.assertEqual(exp_num_clusters, len(game.clusters.clusters_by_member[square]))
+
+    def test_cluster_ids_unique(self):
+        """Asserts that cluster ids are unique and that clusters hash on their id."""
+        collection = HasamiShogiGame(track_clusters=True).clusters
+        self.assertEqual(20, len(collection.all_clusters))
+        for cluster_id, cluster in collection.all_clusters.items():
+            self.assertEqual(cluster_id, hash(cluster))
+            self.assertFalse(hasattr(cluster, "__dict__"))
+
+
+class TestZobristKey(unittest.TestCase):
+    """Defines tests for the incrementally maintained Zobrist key."""
+    def assert_key_matches(self, game):
+        exp_key = zobrist.compute_hash(game.get_game_board(), game.get_active_player())
+        self.assertEqual(exp_key, game.zobrist_key)
+
+    def test_side_to_move(self):
+        """Asserts that the side to move is part of the key."""
+        game = HasamiShogiGame()
+        black_key = game.zobrist_key
+        game.toggle_active_player()
+        self.assertNotEqual(black_key, game.zobrist_key)
+        self.assert_key_matches(game)
+        game.toggle_active_player()
+        self.assertEqual(black_key, game.zobrist_key)
+
+    def test_set_square_occupant(self):
+        """Asserts that setting squares directly keeps the key in sync."""
+        game = HasamiShogiGame()
+        set_board(game, {"BLACK": ["e5", "a1"], "RED": ["i9", "d4"], "NONE": ["a5", "e5"]})
+        self.assert_key_matches(game)
+
+    def test_transposition(self):
+        """Asserts that the same position reached by different move orders has the same key."""
+        game1, game2 = HasamiShogiGame(), HasamiShogiGame()
+        run_moves(game1, ["i5e5", "a4d4", "i6e6", "a5d5"])
+        run_moves(game2, ["i6e6", "a5d5", "i5e5", "a4d4"])
+        self.assertEqual(game1.zobrist_key, game2.zobrist_key)
+
+    def test_random_make_undo(self):
+        """Asserts that the key matches a from-scratch recomputation after random make/undo sequences, including
+        captures, and returns to its starting value once every move is undone."""
+        rng = random.Random(3)
+        for _ in range(20):
+            game = HasamiShogiGame()
+            start_key = game.zobrist_key
+            for _ in range(rng.randint(1, 40)):
+                if game.move_log and rng.random() < 0.3:
+                    game.undo_move()
+                elif game.get_game_state() == "UNFINISHED":
+                    self.assertTrue(game.make_move_by_index(*random_legal_move(game, rng)))
+                self.assert_key_matches(game)
+            while game.move_log:
+                game.undo_move()
+            self.assertEqual(start_key, game.zobrist_key)
+
+
+class TestMoveHistory(unittest.TestCase):
+    """Defines tests for reading and replaying the moves of a game, as used to keep replicas in step."""
+    def test_set_move_history(self):
+        """Asserts that a replica follows another game through captures and undos, changing only when needed."""
+        rng = random.Random(5)
+        game, replica = HasamiShogiGame(), HasamiShogiGame()
+        for _ in range(60):
+            if game.move_log and rng.random() < 0.3:
+                game.undo_move()
+            elif game.get_game_state() == "UNFINISHED":
+                game.make_move_by_index(*random_legal_move(game, rng))
+            self.assertTrue(replica.set_move_history(game.get_move_history()))
+            self.assertEqual(game.get_game_board().get_board_list(), replica.get_game_board().get_board_list())
+            self.assertEqual(game.zobrist_key, replica.zobrist_key)
+            self.assertFalse(replica.set_move_history(game.get_move_history()))
+
+    def test_set_position(self):
+        """Asserts that a set up position has the captured counts, key and game state of one reached in play."""
+        game = HasamiShogiGame()
+        run_moves(game, ["i5e5", "a4e4"])
+        game.set_position({"BLACK": [square_index("e5"), square_index("b2")], "RED": [square_index("h8")]}, "RED")
+        self.assertEqual([], game.move_log)
+        self.assertEqual("RED", game.get_active_player())
+        self.assertEqual(7, game.get_num_captured_pieces("BLACK"))
+        self.assertEqual(8, game.get_num_captured_pieces("RED"))
+        self.assertEqual("BLACK_WON", game.get_game_state())
+        self.assertEqual(zobrist.compute_hash(game.get_game_board(), "RED"), game.zobrist_key)
+        self.assertEqual({square_index("e5"), square_index("b2")},
+                         set(game.get_game_board().get_squares_by_color("BLACK")))
+
+
+class TestDrawRules(unittest.TestCase):
+    """Defines tests for the repetition rule and the move cap, which draw the game."""
+    SHUFFLE = ["i1h1", "a1b1", "h1i1", "b1a1"]   # Brings the starting position back
+
+    def test_repetition(self):
+        """Asserts that the third occurrence of a position draws the game, and undo restores it."""
+        game = HasamiShogiGame()
+        run_moves(game, self.SHUFFLE)
+        self.assertEqual((2, True, "UNFINISHED"), (game.get_position_count(), game.is_repetition(),
+                                                  game.get_game_state()))
+        run_moves(game, self.SHUFFLE[:3])
+        self.assertEqual("UNFINISHED", game.get_game_state())
+        self.assertEqual([True], run_moves(game, self.SHUFFLE[3:]))
+        self.assertEqual((3, "DRAW"), (game.get_position_count(), game.get_game_state()))
+        self.assertEqual([False], run_moves(game, ["i5e5"]))
+        game.undo_move()
+        self.assertEqual((2, True, "UNFINISHED"), (game.get_position_count(), game.is_repetition(),
+                                                  game.get_game_state()))
+        while game.move_log:
+            game.undo_move()
+        self.assertEqual({game.zobrist_key: 1}, game._position_counts)
+
+    def test_same_squares_other_player(self):
+        """Asserts that the same squares with the other player to move are a different position."""
+        game = HasamiShogiGame()
+        run_moves(game, ["i1h1", "a1b1", "h1g1", "b1a1", "g1i1"])
+        self.assertEqual((1, False), (game.get_position_count(), game.is_repetition()))
+
+    def test_move_cap(self):
+        """Asserts that the game is drawn once max_moves moves have been made."""
+        game = HasamiShogiGame(max_moves=6)
+        run_moves(game, ["i1h1", "a1b1", "h1g1", "b1c1", "g1f1"])
+        self.assertEqual("UNFINISHED", game.get_game_state())
+        run_moves(game, ["c1d1"])
+        self.assertEqual("DRAW", game.get_game_state())
+        game.undo_move()
+        self.assertEqual("UNFINISHED", game.get_game_state())
+
+    def test_rules_off(self):
+        """Asserts that None turns off the repetition rule and the move cap."""
+        game = HasamiShogiGame(repetition_limit=None, max_moves=None)
+        for _ in range(100):
+            run_moves(game, self.SHUFFLE)
+        self.assertEqual((101, False, "UNFINISHED"), (game.get_position_count(), game.is_repetition(),
+                                                     game.get_game_state()))
+
+    def test_win_not_drawn(self):
+        """Asserts that a move that wins the game as it reaches the move cap is a win."""
+        game = HasamiShogiGame(max_moves=1)
+        game.set_position({"BLACK": [square_index("e5"), square_index("c1"), square_index("b2")],
+                           "RED": [square_index("d5"), square_index("h8")]}, "BLACK")
+        run_moves(game, ["c1c2"])
+        self.assertEqual("DRAW", game.get_game_state())
+        game.undo_move()
+        run_moves(game, ["c1c5"])
+        self.assertEqual("BLACK_WON", game.get_game_state())
+
+    def test_set_position_resets_counts(self):
+        """Asserts that setting up a position forgets the positions of the game before it."""
+        game = HasamiShogiGame()
+        run_moves(game, self.SHUFFLE)
+        game.set_position({"RED": list(game.get_game_board().get_squares_by_color("RED")),
+                           "BLACK": list(game.get_game_board().get_squares_by_color("BLACK"))}, "BLACK")
+        self.assertEqual((1, False), (game.get_position_count(), game.is_repetition()))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+from hasami_shogi.src.model.ai_player import AIPlayer
+from hasami_shogi.src.model.transposition_table import TranspositionTable, SharedTranspositionTable
+from test_AIPlayer import new_ai_game
+
+
+class TestLazySMPSearch(unittest.TestCase):
+    """Defines tests for AIPlayer.search with Lazy SMP helper processes."""
+    def test_helpers_share_table(self):
+        """Asserts that helpers search into the shared table and the game is left as it was."""
+        game, ai_black, ai_red = new_ai_game(["i5e5", "a4e4"], workers=2, lazy_smp=True)
+        exp_board, exp_key = game.get_game_board().get_board_list(), game.zobrist_key
+        try:
+            move, _ = ai_black.search(max_depth=4)
+            self.assertIsInstance(ai_black.transposition_table, SharedTranspositionTable)
+            self.assertIn(move, ai_black.get_all_valid_moves())
+            self.assertEqual(4, ai_black.depth_reached)
+            self.assertGreater(ai_black.helper_nodes, 0)
+            self.assertEqual(exp_board, game.get_game_board().get_board_list())
+            self.assertEqual(exp_key, game.zobrist_key)
+        finally:
+            ai_black.close()
+        self.assertIsNone(ai_black.parallel_search)
+        self.assertNotIsInstance(ai_black.transposition_table, SharedTranspositionTable)
+
+    def test_time_limit(self):
+        """Asserts that a timed search stops the helpers and returns a legal move, and can run again after close."""
+        game, ai_black, ai_red = new_ai_game(["i5e5"], workers=2, lazy_smp=True)
+        try:
+            self.assertIn(ai_red.search(time_ms=200)[0], ai_red.get_all_valid_moves())
+            ai_red.close()
+            self.assertIn(ai_red.search(max_depth=2)[0], ai_red.get_all_valid_moves())
+        finally:
+            ai_red.close()
+
+    def test_single_worker(self):
+        """Asserts that one worker searches alone with a private table."""
+        game, ai_black, ai_red = new_ai_game(workers=1, lazy_smp=True)
+        ai_black.search(max_depth=2)
+        self.assertIs(TranspositionTable, type(ai_black.transposition_table))
+        self.assertEqual(0, ai_black.helper_nodes)
+
+    def test_needs_table(self):
+        """Asserts that Lazy SMP without a transposition table is refused."""
+        with self.assertRaises(ValueError):
+            AIPlayer(HasamiShogiGame(), "BLACK", tt_size_mb=0, lazy_smp=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import random
+import tempfile
+import unittest
+from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+from hasami_shogi.src.model.ai_player import AIPlayer
+from hasami_shogi.src.model.opening_book import OpeningBook, write_book, HEADER, RECORD, MAX_WEIGHT
+from hasami_shogi.src.model.symmetry import transform_move
+
+
+class TestOpeningBook(unittest.TestCase):
+    """Defines tests for writing, mapping and probing opening book files."""
+    def setUp(self):
+        book_file, self.path = tempfile.mkstemp(suffix=".bin")
+        os.close(book_file)
+        rng = random.Random(1)
+        self.entries = {rng.getrandbits(64): {(rng.randrange(81), rng.randrange(81)): (rng.randint(1, 9), rng.random())}
+                        for _ in range(200)}
+        self.entries[5] = {(76, 40): (3, 16.0), (77, 41): (7, -2.5), (75, 39): (MAX_WEIGHT + 10, 0.0625)}
+        self.num_records = write_book(self.path, self.entries)
+        self.book = OpeningBook(self.path)
+
+    def tearDown(self):
+        self.book.close()
+        os.remove(self.path)
+
+    def test_format(self):
+        """Asserts the file is a header and one fixed-size record per move, sorted by key."""
+        self.assertEqual(203, self.num_records)
+        self.assertEqual(203, len(self.book))
+        self.assertEqual(16, HEADER.size)
+        self.assertEqual(16, RECORD.size)
+        self.assertEqual(16 + 16 * 203, os.path.getsize(self.path))
+        keys = [self.book.get_key(index) for index in range(len(self.book))]
+        self.assertEqual(sorted(keys), keys)
+
+    def test_probe(self):
+        """Asserts that every position is found with its moves, heaviest first, and unknown positions are not."""
+        for key, moves in self.entries.items():
+            exp_records = sorted(((move, min(weight, MAX_WEIGHT), round(score * 16) / 16)
+                                  for move, (weight, score) in moves.items()), key=lambda record: -record[1])
+            self.assertEqual(exp_records, self.book.probe(key))
+        self.assertEqual([], self.book.probe(6))
+        self.assertEqual([], self.book.probe(2 ** 64 - 1))
+
+    def test_choose_move(self):
+        """Asserts that the heaviest move is chosen by default, and any book move at random."""
+        self.assertEqual(((75, 39), 0.0625), self.book.choose_move(5))
+        self.assertIsNone(self.book.choose_move(6))
+        rng = random.Random(2)
+        self.assertEqual({(76, 40), (77, 41), (75, 39)}, {self.book.choose_move(5, rng)[0] for _ in range(20000)})
+
+    def test_not_a_book(self):
+        """Asserts that other files are refused."""
+        self.book.close()
+        with open(self.path, "wb") as book_file:
+            book_file.write(b"not a book, just some bytes")
+        with self.assertRaises(ValueError):
+            OpeningBook(self.path)
+
+    def test_default_book(self):
+        """Asserts that the book shipped with the game, if built, has a legal move for the starting position."""
+        book = OpeningBook.open_default()
+        if book is None:
+            self.skipTest("no default opening book")
+        game = HasamiShogiGame()
+        key, transform = game.get_symmetric_key()
+        move, _ = book.choose_move(key)
+        self.assertTrue(game.make_move_by_index(*transform_move(move, transform)))
+        book.close()
+
+    def test_ai_plays_book_move(self):
+        """Asserts that an AI with a book plays a legal book move without searching, and searches otherwise."""
+        game = HasamiShogiGame()
+        book_move, path = (76, 40), self.path + ".ai"
+        key, transform = game.get_symmetric_key()
+        write_book(path, {key: {transform_move(book_move, transform): (1, 16.0)}, key ^ 1: {(0, 1): (1, 0.0)}})
+        ai_black = AIPlayer(game, "BLACK", tt_size_mb=1, book=OpeningBook(path))
+        self.assertEqual((book_move, 16.0), ai_black.search(max_depth=2))
+        self.assertEqual(0, ai_black.limits.nodes)
+        game.make_move_by_index(76, 40)
+        game.make_move_by_index(4, 31)
+        ai_black.search(max_depth=1)
+        self.assertGreater(ai_black.limits.nodes, 0)
+        ai_black.book.close()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import contextlib
+import io
+import time
+import unittest
+from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+from hasami_shogi.src.model.ai_player import AIPlayer
+from hasami_shogi.src.model.player import Player
+from hasami_shogi.src.model.ponderer import Ponderer
+from hasami_shogi.src.model.opening_book import OpeningBook
+from hasami_shogi.src.model.symmetry import transform_move
+
+
+def new_pondering_game(book=None):
+    """Returns a game where the BLACK AI has made its first move, and its ponderer, started on RED's time."""
+    game = HasamiShogiGame()
+    ai_black, player_red = AIPlayer(game, "BLACK", tt_size_mb=1, book=book), Player(game, "RED")
+    ai_black.set_opposing_player(player_red)
+    ponderer = Ponderer(ai_black)
+    ai_black.make_move_by_index(*ponderer.search(100)[0])
+    ponderer.start()
+    return game, ai_black, player_red, ponderer
+
+
+class TestPonderer(unittest.TestCase):
+    """Defines tests for thinking on the opponent's time."""
+    def test_hit(self):
+        """Asserts that after pondering longer than the budget, the predicted move is answered at once."""
+        game, ai_black, player_red, ponderer = new_pondering_game()
+        try:
+            self.assertTrue(ponderer.is_pondering())
+            self.assertIn(ponderer.predicted_move, ai_black.get_all_valid_moves("RED"))
+            time.sleep(0.3)
+            player_red.make_move_by_index(*ponderer.predicted_move)
+            start = time.perf_counter()
+            move, _ = ponderer.search(200)
+            self.assertLess(time.perf_counter() - start, 0.1)
+            self.assertIn(move, ai_black.get_all_valid_moves())
+            self.assertEqual((1, 0), (ponderer.hits, ponderer.misses))
+            self.assertGreaterEqual(ai_black.depth_reached, 1)
+        finally:
+            ponderer.stop()
+
+    def test_miss(self):
+        """Asserts that another reply stops pondering, and the AI searches the real position as usual."""
+        game, ai_black, player_red, ponderer = new_pondering_game()
+        try:
+            other_move = next(move for move in sorted(ai_black.get_all_valid_moves("RED"))
+                              if move != ponderer.predicted_move)
+            player_red.make_move_by_index(*other_move)
+            exp_board = game.get_game_board().get_board_list()
+            move, _ = ponderer.search(100)
+            self.assertFalse(ponderer.is_pondering())
+            self.assertIn(move, ai_black.get_all_valid_moves())
+            self.assertEqual((0, 1), (ponderer.hits, ponderer.misses))
+            self.assertEqual(exp_board, game.get_game_board().get_board_list())
+        finally:
+            ponderer.stop()
+
+    def test_quiet_thread(self):
+        """Asserts that the pondering thread prints nothing, and a ponder hit prints its answer once."""
+        game, ai_black, player_red, ponderer = new_pondering_game()
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                time.sleep(0.2)
+                ponderer.stop()
+            self.assertEqual("", output.getvalue())
+            ponderer.start()
+            player_red.make_move_by_index(*ponderer.predicted_move)
+            with contextlib.redirect_stdout(output):
+                ponderer.search(100)
+            self.assertEqual(1, len(output.getvalue().splitlines()))
+        finally:
+            ponderer.stop()
+
+    def test_book_position(self):
+        """Asserts that a ponder hit in a book position is answered with the book move, as the AI would, unsearched."""
+        book = OpeningBook.open_default()
+        game, ai_black, player_red, ponderer = new_pondering_game(book)
+        try:
+            player_red.make_move_by_index(*ponderer.predicted_move)
+            key, transform = game.get_symmetric_key()
+            book_move = book.choose_move(key)
+            self.assertIsNotNone(book_move)
+            self.assertEqual(transform_move(book_move[0], transform), ponderer.search(100)[0])
+            self.assertEqual(0, ai_black.depth_reached)
+        finally:
+            ponderer.stop()
+            book.close()
+
+    def test_game_untouched(self):
+        """Asserts that pondering searches a replica, leaving the real game alone, and only starts on the opponent's
+        turn."""
+        game, ai_black, player_red, ponderer = new_pondering_game()
+        try:
+            exp_board, exp_key = game.get_game_board().get_board_list(), game.zobrist_key
+            time.sleep(0.1)
+            self.assertEqual(exp_board, game.get_game_board().get_board_list())
+            self.assertEqual(exp_key, game.zobrist_key)
+        finally:
+            ponderer.stop()
+        self.assertEqual(game.get_move_history() + [ponderer.predicted_move], ponderer.replica.get_move_history())
+        player_red.make_move_by_index(*ponderer.predicted_move)
+        ponderer.start()
+        self.assertFalse(ponderer.is_pondering())
+
+
+if __name__ == "__main__":
+    unittest.main()
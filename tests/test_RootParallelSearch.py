@@ -0,0 +1,70 @@
+import unittest
+from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+from hasami_shogi.src.model.ai_player import AIPlayer, SearchOptions
+from test_AIPlayer import new_ai_game
+
+FULL_WIDTH = SearchOptions.none()
+
+
+class TestRootParallelSearch(unittest.TestCase):
+    """Defines tests for splitting the root moves of AIPlayer.search across worker processes."""
+    def test_same_score_as_serial(self):
+        """Asserts that a full-width parallel search scores positions exactly as the single-process search does."""
+        game, ai_black, ai_red = new_ai_game(["i5e5", "a4e4"], options=FULL_WIDTH, workers=2)
+        try:
+            for depth in (1, 2, 3):
+                serial_ai = new_ai_game(["i5e5", "a4e4"], options=FULL_WIDTH)[1]
+                move, score = ai_black.search(max_depth=depth)
+                self.assertEqual(serial_ai.search(max_depth=depth)[1], score)
+                self.assertIn(move, ai_black.get_all_valid_moves())
+                self.assertEqual(depth, ai_black.depth_reached)
+        finally:
+            ai_black.close()
+
+    def test_workers_follow_game(self):
+        """Asserts that the workers follow moves made and undone in the game between searches."""
+        game, ai_black, ai_red = new_ai_game(options=FULL_WIDTH, workers=2)
+        try:
+            ai_black.search(max_depth=1)
+            game.make_move("i5", "e5")
+            game.make_move("a4", "e4")
+            move, score = ai_black.search(max_depth=2)
+            self.assertEqual(new_ai_game(["i5e5", "a4e4"], options=FULL_WIDTH)[1].search(max_depth=2)[1], score)
+            game.undo_move()
+            game.undo_move()
+            self.assertIn(ai_black.search(max_depth=1)[0], ai_black.get_all_valid_moves())
+        finally:
+            ai_black.close()
+
+    def test_time_limit(self):
+        """Asserts that a timed parallel search returns a legal move and leaves the game as it was."""
+        game, ai_black, ai_red = new_ai_game(["i5e5"], options=FULL_WIDTH, workers=2)
+        exp_board, exp_key = game.get_game_board().get_board_list(), game.zobrist_key
+        try:
+            move, _ = ai_red.search(time_ms=300)
+            self.assertIn(move, ai_red.get_all_valid_moves())
+            self.assertEqual(exp_board, game.get_game_board().get_board_list())
+            self.assertEqual(exp_key, game.zobrist_key)
+        finally:
+            ai_red.close()
+        self.assertIsNone(ai_red.parallel_search)
+
+    def test_workers_use_game_draw_rules(self):
+        """Asserts that the workers play the game's draw rules, so a game past MAX_MOVES with no cap is not drawn."""
+        scores = []
+        for workers in (1, 2):
+            game = HasamiShogiGame(repetition_limit=None, max_moves=None)
+            ai_black = AIPlayer(game, "BLACK", tt_size_mb=1, options=FULL_WIDTH, workers=workers)
+            for _ in range(HasamiShogiGame.MAX_MOVES // 4 + 1):
+                for move in ["i1h1", "a1b1", "h1i1", "b1a1"]:
+                    game.make_move(move[:2], move[2:])
+            try:
+                scores.append(ai_black.search(max_depth=2)[1])
+            finally:
+                ai_black.close()
+        self.assertEqual(scores[0], scores[1])
+        self.assertLess(abs(scores[0]), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
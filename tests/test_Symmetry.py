@@ -0,0 +1,148 @@
+import random
+import unittest
+from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+from hasami_shogi.src.model.ai_player import AIPlayer, SearchOptions, OPPOSITE_COLOR
+from hasami_shogi.src.model.hasami_shogi_utilities import square_index
+from hasami_shogi.src.model.symmetry import TRANSFORMS, IDENTITY, MIRROR, FLIP, MIRROR_FLIP, SQUARE_MAPS, \
+    transform_move, transform_position, transform_color, drop_mirrored_moves
+import hasami_shogi.src.model.zobrist as zobrist
+
+
+def random_game(seed: int, num_moves: int) -> HasamiShogiGame:
+    """Returns a game after the given number of random legal moves, or fewer if it ends."""
+    rng = random.Random(seed)
+    game = HasamiShogiGame()
+    for _ in range(num_moves):
+        if game.get_game_state() != "UNFINISHED":
+            break
+        color = game.get_active_player()
+        moves = [(square, destination) for square in game.get_game_board().get_squares_by_color(color)
+                 for destination in game.get_reachable_squares(square)]
+        game.make_move_by_index(*rng.choice(moves))
+    return game
+
+
+def image_game(game: HasamiShogiGame, transform: int) -> HasamiShogiGame:
+    """Returns a new game set up with the image of the given game's position under the given transform."""
+    board = game.get_game_board()
+    pieces = {color: board.get_squares_by_color(color) for color in ("RED", "BLACK")}
+    image = HasamiShogiGame()
+    image.set_position(*transform_position(pieces, game.get_active_player(), transform))
+    return image
+
+
+class RootMoveGame(HasamiShogiGame):
+    """Defines a game that records the moves made from its starting position."""
+    def __init__(self):
+        super().__init__()
+        self.root_moves: list[tuple[int, int]] = []
+
+    def make_move_by_index(self, moving_from: int, moving_to: int) -> bool:
+        if not self.move_log:
+            self.root_moves.append((moving_from, moving_to))
+        return super().make_move_by_index(moving_from, moving_to)
+
+
+class TestTransforms(unittest.TestCase):
+    """Defines tests for the symmetry transforms of squares and moves."""
+    def test_square_maps(self):
+        """Asserts that every transform is a permutation that is its own inverse, and composing two is XOR."""
+        self.assertEqual(square_index("a9"), SQUARE_MAPS[MIRROR][square_index("a1")])
+        self.assertEqual(square_index("i1"), SQUARE_MAPS[FLIP][square_index("a1")])
+        self.assertEqual(square_index("e5"), SQUARE_MAPS[MIRROR_FLIP][square_index("e5")])
+        for first in TRANSFORMS:
+            self.assertEqual(list(range(81)), sorted(SQUARE_MAPS[first]))
+            for second in TRANSFORMS:
+                composed = [SQUARE_MAPS[second][SQUARE_MAPS[first][square]] for square in range(81)]
+                self.assertEqual(list(SQUARE_MAPS[first ^ second]), composed)
+        self.assertEqual((), transform_move((), MIRROR))
+
+    def test_drop_mirrored_moves(self):
+        """Asserts that of each pair of mirrored moves only the first is kept, in order."""
+        game = HasamiShogiGame()
+        ai = AIPlayer(game, "BLACK")
+        moves = list(ai.generate_moves("BLACK"))
+        unique = list(drop_mirrored_moves(moves))
+        self.assertEqual([move for move in moves if move in unique], unique)
+        self.assertEqual(set(moves), set(unique) | {transform_move(move, MIRROR) for move in unique})
+        num_self_mirrored = sum(move == transform_move(move, MIRROR) for move in moves)
+        self.assertEqual((len(moves) + num_self_mirrored) // 2, len(unique))
+
+
+class TestSymmetricKey(unittest.TestCase):
+    """Defines tests for the image keys and symmetric keys kept by HasamiShogiGame."""
+    def test_image_keys(self):
+        """Asserts that the symmetric key is the smallest key of the images, through random play and undo."""
+        for seed in range(10):
+            game = random_game(seed, 30)
+            while True:
+                keys = [zobrist.compute_hash(game.get_game_board(), game.get_active_player(), transform)
+                        for transform in TRANSFORMS]
+                key, transform = game.get_symmetric_key()
+                self.assertEqual((min(keys), keys[transform]), (key, key))
+                self.assertEqual(keys[IDENTITY], game.zobrist_key)
+                self.assertEqual(keys[MIRROR] == keys[IDENTITY], game.is_mirror_symmetric())
+                if not game.move_log:
+                    break
+                game.undo_move()
+        self.assertTrue(game.is_mirror_symmetric())
+
+    def test_equivalent_positions(self):
+        """Asserts that the images of a position share its symmetric keys and evaluation, and no other does."""
+        for seed in range(10):
+            game = random_game(seed, 12)
+            key, board_key = game.get_symmetric_key()[0], game.get_symmetric_board_key()[0]
+            score = AIPlayer(game, game.get_active_player()).get_heuristic()
+            for transform in TRANSFORMS:
+                image = image_game(game, transform)
+                self.assertEqual(key, image.get_symmetric_key()[0])
+                self.assertEqual(board_key, image.get_symmetric_board_key()[0])
+                self.assertEqual(score, AIPlayer(image, image.get_active_player()).get_heuristic())
+                image.toggle_active_player()
+                self.assertNotEqual(key, image.get_symmetric_key()[0])
+                self.assertEqual(board_key, image.get_symmetric_board_key()[0])
+
+
+class TestSymmetricSearch(unittest.TestCase):
+    """Defines tests for searches using symmetric keys."""
+    def test_shared_table_entry(self):
+        """Asserts that a table entry stored searching a position gives the image of its best move in every image."""
+        game = HasamiShogiGame()
+        for move in ["i5e5", "a4e4", "i8e8"]:
+            game.make_move(move[:2], move[2:])
+        ai = AIPlayer(game, "RED", tt_size_mb=1, options=SearchOptions(contempt=0))
+        best_move, _ = ai.minimax(3)
+        for transform in TRANSFORMS:
+            image = image_game(game, transform)
+            key, image_transform = image.get_symmetric_key()
+            table_move = transform_move(ai.transposition_table.probe(key)[3], image_transform)
+            self.assertEqual(transform_move(best_move, transform), table_move)
+            self.assertTrue(image.is_move_legal(*table_move))
+
+    def test_contempt_table_keys(self):
+        """Asserts that with contempt, images share a table key only where own color plays the same side."""
+        for seed in range(10):
+            game = random_game(seed, 12)
+            for contempt in (0, 25):
+                options = SearchOptions(contempt=contempt)
+                key = AIPlayer(game, "RED", tt_size_mb=0, options=options).get_table_key()[0]
+                for transform in TRANSFORMS:
+                    image = image_game(game, transform)
+                    image_keys = {color: AIPlayer(image, color, tt_size_mb=0, options=options).get_table_key()[0]
+                                  for color in ("RED", "BLACK")}
+                    image_color = transform_color("RED", transform)
+                    self.assertEqual(key, image_keys[image_color])
+                    self.assertEqual(contempt == 0, key == image_keys[OPPOSITE_COLOR[image_color]])
+
+    def test_root_searches_mirrored_moves_once(self):
+        """Asserts that only one of each pair of mirrored moves is searched at the symmetric starting position."""
+        game = RootMoveGame()
+        ai = AIPlayer(game, "BLACK", tt_size_mb=0, options=SearchOptions.none())
+        moves = set(ai.generate_moves("BLACK"))
+        ai.minimax(1)
+        self.assertEqual(35, len(game.root_moves))
+        self.assertEqual(moves, set(game.root_moves) | {transform_move(move, MIRROR) for move in game.root_moves})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,230 @@
+import os
+import random
+from collections import defaultdict
+import shutil
+import tempfile
+import unittest
+from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+from hasami_shogi.src.model.ai_player import AIPlayer
+from hasami_shogi.src.model.hasami_shogi_utilities import square_index
+from hasami_shogi.src.model.tablebase import Tablebase, write_table, table_file_name, num_positions, \
+    material_classes, position_index, index_position, decode_value, HEADER
+from hasami_shogi.src.model.tablebase_generator import TablebaseGenerator
+from hasami_shogi.src.model.symmetry import transform_position, FLIP
+
+
+def squares(*names):
+    """Returns the sorted square indices of the given square names."""
+    return sorted(square_index(name) for name in names)
+
+
+class GraphGenerator(TablebaseGenerator):
+    """A TablebaseGenerator solving a random move graph instead of a material class, to check the retrograde loop."""
+    def __init__(self, size, seed):
+        super().__init__(2, 2)
+        rng = random.Random(seed)
+        self.size = size
+        self.quiet = [rng.sample(range(size), rng.randint(0, 3)) for _ in range(size)]
+        self.captures = [[rng.choice([("LOSS", 0), ("LOSS", 2), ("WIN", 1), ("WIN", 3), ("DRAW", 0)])
+                          for _ in range(rng.choice([0, 0, 0, 1]))] for _ in range(size)]
+        self.previous = [[] for _ in range(size)]
+        for index, children in enumerate(self.quiet):
+            for child in children:
+                self.previous[child].append(index)
+
+    def scan(self, index):
+        results = self.captures[index]
+        return (len(self.quiet[index]), min((distance + 1 for result, distance in results if result == "LOSS"),
+                                            default=0),
+                max((distance + 1 for result, distance in results if result == "WIN"), default=0),
+                any(result == "DRAW" for result, _ in results))
+
+    def predecessors(self, index):
+        return self.previous[index]
+
+    def solve_by_levels(self):
+        """Returns the (result, distance) of every node, solved level by level straight from the definition."""
+        solved = {}
+        for distance in range(40):
+            for index in range(self.size):
+                if index in solved:
+                    continue
+                outcomes = self.captures[index] + [solved.get(child) for child in self.quiet[index]]
+                if distance % 2 and ("LOSS", distance - 1) in outcomes:
+                    solved[index] = ("WIN", distance)
+                elif not distance % 2 and all(outcome is not None and outcome[0] == "WIN" for outcome in outcomes) \
+                        and max((outcome[1] + 1 for outcome in outcomes), default=0) == distance:
+                    solved[index] = ("LOSS", distance)
+        return [solved.get(index, ("DRAW", 0)) for index in range(self.size)]
+
+
+class TestIndexing(unittest.TestCase):
+    """Defines tests for numbering the positions of a material class."""
+    def test_material_classes(self):
+        """Asserts that classes are listed smallest first with at least 2 pieces a side and no fewer BLACK than RED."""
+        self.assertEqual([(2, 2)], material_classes(4))
+        self.assertEqual([(2, 2), (3, 2)], material_classes(5))
+        self.assertEqual([(2, 2), (3, 2), (3, 3), (4, 2)], material_classes(6))
+        self.assertEqual(3240 * 3081 * 2, num_positions(2, 2))
+
+    def test_round_trip(self):
+        """Asserts that index and position convert into each other and every index is in range."""
+        rng = random.Random(1)
+        for num_black, num_red in ((2, 2), (3, 2), (2, 5), (4, 4)):
+            size = num_positions(num_black, num_red)
+            for index in [0, 1, size - 1] + [rng.randrange(size) for _ in range(300)]:
+                black, red, active_player = index_position(index, num_black, num_red)
+                self.assertEqual((num_black, num_red), (len(black), len(red)))
+                self.assertFalse(set(black) & set(red))
+                self.assertEqual(index, position_index(black, red, active_player))
+            for _ in range(300):
+                chosen = rng.sample(range(81), num_black + num_red)
+                black, red = sorted(chosen[:num_black]), sorted(chosen[num_black:])
+                self.assertLess(position_index(black, red, "RED"), size)
+                self.assertEqual((black, red, "RED"), index_position(position_index(black, red, "RED"), num_black,
+                                                                     num_red))
+
+    def test_decode_value(self):
+        """Asserts that odd distances are wins for the side to move and even ones losses."""
+        self.assertEqual(("DRAW", 0), decode_value(0))
+        self.assertEqual(("LOSS", 0), decode_value(1))
+        self.assertEqual(("WIN", 1), decode_value(2))
+        self.assertEqual(("LOSS", 8), decode_value(9))
+
+
+class TestTablebaseGenerator(unittest.TestCase):
+    """Defines tests for solving material classes by retrograde analysis."""
+    def test_scan(self):
+        """Asserts that a capture leaving the opponent one piece is a win in 1, and quiet moves are counted."""
+        generator = TablebaseGenerator(2, 2)
+        index = position_index(squares("e3", "a5"), squares("e4", "i1"), "BLACK")
+        quiet_moves, win_distance, loss_distance, has_draw = generator.scan(index)
+        self.assertEqual(1, win_distance)
+        self.assertEqual((0, False), (loss_distance, has_draw))
+        num_moves = sum(len(generator.game.get_reachable_squares(square)) for square in squares("e3", "a5"))
+        self.assertEqual(num_moves - 1, quiet_moves)     # a5e5 sandwiches e4
+
+    def test_needs_smaller_tables(self):
+        """Asserts that a capture into a class without a table is reported."""
+        generator = TablebaseGenerator(2, 3)
+        index = position_index(squares("e3", "a5"), squares("e4", "i1", "i2"), "BLACK")
+        self.assertRaises(ValueError, generator.scan, index)
+
+    def test_predecessors(self):
+        """Asserts that every predecessor reaches the position by one quiet move, and every quiet move is found."""
+        rng = random.Random(2)
+        generator = TablebaseGenerator(3, 2)
+        for _ in range(10):
+            index = rng.randrange(generator.size)
+            predecessors = generator.predecessors(index)
+            self.assertEqual(len(predecessors), len(set(predecessors)))
+            for previous in predecessors:
+                self.assertIn(index, self.quiet_children(generator, previous))
+            for child in self.quiet_children(generator, index):
+                self.assertIn(index, generator.predecessors(child))
+
+    @staticmethod
+    def quiet_children(generator, index):
+        """Returns the indices reached from the given one by moves that capture nothing."""
+        generator.set_index(index)
+        game = generator.game
+        children = []
+        for square in list(game.get_game_board().get_squares_by_color(game.get_active_player())):
+            for destination in game.get_reachable_squares(square):
+                game.make_move_by_index(square, destination)
+                if not game.move_log[-1].cap_squares:
+                    children.append(generator.get_index())
+                game.undo_move()
+        return children
+
+    def test_solve_graph(self):
+        """Asserts that the retrograde loop finds the result and distance of every node of random move graphs."""
+        for seed in range(10):
+            generator = GraphGenerator(300, seed)
+            values = generator.solve()
+            self.assertEqual(generator.solve_by_levels(), [decode_value(value) for value in values])
+
+
+class TestTablebase(unittest.TestCase):
+    """Defines tests for mapping and probing tablebase files, and probing them in AIPlayer."""
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.position = (squares("e5", "e7"), squares("a1", "i9"))
+        self.child = (squares("e4", "e7"), squares("a1", "i9"))
+        values = bytearray(num_positions(2, 2))
+        values[position_index(*self.position, "BLACK")] = 1 + 5
+        values[position_index(*self.child, "RED")] = 1 + 4
+        write_table(os.path.join(self.directory, table_file_name(2, 2)), 2, 2, values)
+        self.tablebase = Tablebase(self.directory)
+        self.game = HasamiShogiGame()
+        self.game.set_position({"BLACK": self.position[0], "RED": self.position[1]}, "BLACK")
+
+    def tearDown(self):
+        self.tablebase.close()
+        shutil.rmtree(self.directory)
+
+    def test_probe(self):
+        """Asserts that positions of a mapped class are probed and others are not."""
+        self.assertEqual(4, self.tablebase.max_pieces)
+        self.assertEqual(HEADER.size + num_positions(2, 2),
+                         os.path.getsize(os.path.join(self.directory, table_file_name(2, 2))))
+        self.assertEqual(("WIN", 5), self.tablebase.probe(self.game))
+        self.assertEqual(("LOSS", 4), self.tablebase.probe_position(*self.child, "RED"))
+        self.assertEqual(("DRAW", 0), self.tablebase.probe_position(*self.child, "BLACK"))
+        self.assertIsNone(self.tablebase.probe(HasamiShogiGame()))
+        self.assertIsNone(self.tablebase.probe_position(squares("e5", "e7", "e8"), squares("a1", "i9"), "RED"))
+
+    def test_flipped_probe(self):
+        """Asserts that a position of a class that is not built is probed through the flipped image of its class."""
+        black, red = squares("e5", "e7"), squares("a1", "i9", "c3")
+        image, image_player = transform_position({"BLACK": black, "RED": red}, "BLACK", FLIP)
+        self.assertEqual((squares("i1", "a9", "g3"), squares("e5", "e7"), "RED"),
+                         (image["BLACK"], image["RED"], image_player))
+        image_index = position_index(image["BLACK"], image["RED"], image_player)
+        self.tablebase.tables[3, 2] = defaultdict(int, {HEADER.size + image_index: 1 + 3})
+        try:
+            self.assertEqual(("WIN", 3), self.tablebase.probe_position(black, red, "BLACK"))
+            self.assertEqual(("DRAW", 0), self.tablebase.probe_position(black, red, "RED"))
+        finally:
+            del self.tablebase.tables[3, 2]
+
+    def test_invalid_file(self):
+        """Asserts that a table of the wrong size is rejected."""
+        with open(os.path.join(self.directory, table_file_name(2, 3)), "wb") as table_file:
+            table_file.write(b"HSTBAS" + bytes(40))
+        self.assertRaises(ValueError, Tablebase, self.directory)
+        self.assertRaises(ValueError, write_table, os.path.join(self.directory, "x.bin"), 2, 2, bytes(5))
+
+    def test_root_move(self):
+        """Asserts that AIPlayer plays the tablebase's winning move without searching."""
+        ai_black = AIPlayer(self.game, "BLACK", tablebase=self.tablebase)
+        move, score = ai_black.search(max_depth=3)
+        self.assertEqual((square_index("e5"), square_index("e4")), move)
+        self.assertEqual(AIPlayer.H_WIN - 5, score)
+        self.assertEqual(0, ai_black.limits.nodes)
+        self.assertIsNone(AIPlayer(HasamiShogiGame(), "BLACK", tablebase=self.tablebase).tablebase_move())
+
+    def test_leaf_probe(self):
+        """
+        Asserts that the search scores a position in the tablebase exactly, at a leaf or deeper in the tree, as the
+        finished game the given distance further on, and so the same as the tablebase's root move.
+        """
+        self.game.make_move("e5", "e4")
+        ai_red = AIPlayer(self.game, "RED", tablebase=self.tablebase)
+        infinity = AIPlayer.SCORE_INFINITY
+        self.assertEqual(4 - AIPlayer.H_WIN, ai_red.quiescence(-infinity, infinity, "RED"))
+        self.assertEqual(((), 5 - AIPlayer.H_WIN), ai_red.negamax(2, -infinity, infinity, "RED", ply=1))
+        self.game.undo_move()
+        ai_black = AIPlayer(self.game, "BLACK", tablebase=self.tablebase)
+        self.assertEqual(ai_black.tablebase_move(), ai_black.negamax(1, -infinity, infinity, "BLACK"))
+
+    def test_draw_with_contempt(self):
+        """Asserts that a tablebase draw is scored with the contempt of the probing AIPlayer."""
+        self.game.set_position({"BLACK": self.child[0], "RED": self.child[1]}, "BLACK")
+        ai_black = AIPlayer(self.game, "BLACK", tablebase=self.tablebase)
+        ai_red = AIPlayer(self.game, "RED", tablebase=self.tablebase)
+        self.assertEqual((-25, 25), (ai_black.probe_tablebase(), ai_red.probe_tablebase()))
+
+
+if __name__ == "__main__":
+    unittest.main()
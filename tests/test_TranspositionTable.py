@@ -0,0 +1,132 @@
+import unittest
+from hasami_shogi.src.model.transposition_table import TranspositionTable, SharedTranspositionTable, EXACT, LOWER, \
+    UPPER, encode_move, decode_move
+from hasami_shogi.src.model.hasami_shogi_game import HasamiShogiGame
+from hasami_shogi.src.model.ai_player import AIPlayer
+
+
+class TestEntries(unittest.TestCase):
+    """Defines tests for storing and probing transposition table entries."""
+    def test_size(self):
+        """Asserts that the table holds the largest power of two of 16-byte entries that fits the given size."""
+        table = TranspositionTable(1)
+        self.assertEqual(2 ** 16, len(table))
+        self.assertEqual(2 ** 20, table.get_size_bytes())
+        self.assertEqual(2 ** 16, len(TranspositionTable(1.5)))
+        self.assertEqual(1, len(TranspositionTable(0.00001)))
+
+    def test_round_trip(self):
+        """Asserts that every field comes back as stored, including negative and fractional scores."""
+        table = TranspositionTable(1)
+        for key, depth, score, bound, move in [(0x1234, 3, 228.0, EXACT, (74, 38)),
+                                               (0xFFFFFFFFFFFFFFFF, 12, -9999.0, LOWER, (0, 80)),
+                                               (0xABCDEF0123, 1, 6.4375, UPPER, ())]:
+            table.store(key, depth, score, bound, move)
+            self.assertEqual((depth, score, bound, move), table.probe(key))
+
+    def test_move_encoding(self):
+        """Asserts that every move packs into 13 bits and unpacks unchanged."""
+        codes = {encode_move((square_from, square_to)) for square_from in range(81) for square_to in range(81)}
+        self.assertEqual(81 * 81, len(codes))
+        self.assertLess(max(codes), 2 ** 13)
+        self.assertEqual((80, 0), decode_move(encode_move((80, 0))))
+        self.assertEqual((), decode_move(encode_move(())))
+
+    def test_counters(self):
+        """Asserts that probes are counted as hits, misses or collisions."""
+        table = TranspositionTable(1)
+        table.store(5, 2, 1.0, EXACT, ())
+        table.probe(5)
+        table.probe(6)
+        table.probe(5 + len(table))
+        stats = table.get_stats()
+        self.assertEqual((1, 1, 1, 1), (stats["hits"], stats["misses"], stats["collisions"], stats["stores"]))
+
+    def test_replacement(self):
+        """Asserts that a deeper entry from the current search is kept, but one from an earlier search is replaced."""
+        table = TranspositionTable(1)
+        other_key = 7 + len(table)
+        table.store(7, 5, 1.0, EXACT, ())
+        table.store(other_key, 2, 2.0, EXACT, ())
+        self.assertEqual(5, table.probe(7)[0])
+        self.assertIsNone(table.probe(other_key))
+        table.store(7, 2, 3.0, UPPER, ())
+        self.assertEqual((2, 3.0, UPPER, ()), table.probe(7))
+        table.store(7, 5, 1.0, EXACT, ())
+        table.new_search()
+        table.store(other_key, 2, 2.0, EXACT, ())
+        self.assertEqual(2, table.probe(other_key)[0])
+
+    def test_clear(self):
+        """Asserts that clear empties the table and resets the counters."""
+        table = TranspositionTable(1)
+        table.store(9, 1, 0.0, EXACT, ())
+        table.probe(9)
+        table.clear()
+        self.assertIsNone(table.probe(9))
+        self.assertEqual(0, table.hits)
+
+
+class TestSharedTable(unittest.TestCase):
+    """Defines tests for a transposition table in shared memory."""
+    def setUp(self):
+        self.table = SharedTranspositionTable(1)
+        self.attached = SharedTranspositionTable(1, self.table.get_name())
+
+    def tearDown(self):
+        self.attached.close()
+        self.table.close(unlink=True)
+
+    def test_shared_entries(self):
+        """Asserts that an entry stored through one instance is read through another attached by name."""
+        self.assertEqual(len(self.table), len(self.attached))
+        self.table.store(0x1234, 3, 228.0, EXACT, (74, 38))
+        self.assertEqual((3, 228.0, EXACT, (74, 38)), self.attached.probe(0x1234))
+        self.attached.clear()
+        self.assertIsNone(self.table.probe(0x1234))
+
+    def test_torn_entry(self):
+        """Asserts that an entry whose check word and data word come from different stores is not returned."""
+        key, other_key = 0x1234, 0x1234 + 7 * len(self.table)
+        self.table.store(key, 3, 228.0, EXACT, (74, 38))
+        check_word = self.table.keys[key & self.table.index_mask]
+        self.table.store(other_key, 9, -5.0, LOWER, (1, 2))
+        self.table.keys[key & self.table.index_mask] = check_word
+        self.assertIsNone(self.attached.probe(key))
+        self.assertIsNone(self.attached.probe(other_key))
+        self.assertEqual(2, self.attached.collisions)
+
+
+class TestSearchWithTable(unittest.TestCase):
+    """Defines tests for AIPlayer searches using the transposition table."""
+    @staticmethod
+    def search(tt_size_mb, moves, depth):
+        game = HasamiShogiGame()
+        ai_black, ai_red = AIPlayer(game, "BLACK", tt_size_mb=tt_size_mb), AIPlayer(game, "RED", tt_size_mb=tt_size_mb)
+        ai_black.set_opposing_player(ai_red)
+        for move in moves:
+            game.make_move(move[:2], move[2:])
+        active_ai = ai_black if game.get_active_player() == "BLACK" else ai_red
+        return active_ai.minimax(depth), active_ai
+
+    def test_same_score_as_plain_search(self):
+        """Asserts that the table does not change the result of a search."""
+        for moves, depth in [([], 2), (["i5e5"], 2), (["i5e5", "a4e4"], 3), (["i5e5", "a4e4", "i8e8", "a6e6"], 2)]:
+            plain_result, _ = self.search(0, moves, depth)
+            table_result, ai = self.search(1, moves, depth)
+            self.assertEqual(plain_result[1], table_result[1])
+            self.assertGreater(ai.transposition_table.stores, 0)
+
+    def test_own_table_only(self):
+        """Asserts that a search uses only the searching player's table."""
+        game = HasamiShogiGame()
+        ai_black, ai_red = AIPlayer(game, "BLACK", tt_size_mb=1), AIPlayer(game, "RED", tt_size_mb=1)
+        ai_black.set_opposing_player(ai_red)
+        ai_black.minimax(2)
+        self.assertIs(ai_red, ai_black.get_opposing_player())
+        self.assertGreater(ai_black.transposition_table.hits + ai_black.transposition_table.misses, 0)
+        self.assertEqual(0, ai_red.transposition_table.stores)
+
+
+if __name__ == "__main__":
+    unittest.main()